@@ -403,6 +403,48 @@ def asset_get_duplicated_dir_list(launcher):
 
     return duplicated_name_list
 
+#
+# Index of the files in the asset directories. Looking for the local assets of a ROM checks every
+# asset kind and extension with exists(), which is more than 100 stat() calls per ROM and very
+# slow in network shares. A directory is listed once after it has been searched
+# ASSET_DIR_INDEX_MIN_LOOKUPS times and then files are looked up in memory, so scanning a few new
+# ROMs does not list big asset directories.
+#
+# dir_idx -> { dir_path : { normcase(base_noext) : { normcase(ext) : file_name } } }
+#
+ASSET_DIR_INDEX_MIN_LOOKUPS = 4
+
+class AssetDirIndex:
+    def __init__(self):
+        self.dir_idx     = {}
+        self.num_lookups = {}
+
+    def _list_dir(self, dir_path):
+        file_idx = {}
+        for (entry_name, entry_path, entry_is_dir) in misc_iter_dir(dir_path):
+            if entry_is_dir: continue
+            (base_noext, ext) = os.path.splitext(os.path.normcase(entry_name))
+            file_idx.setdefault(base_noext, {})[ext[1:]] = entry_name
+        log_debug('AssetDirIndex::_list_dir() {0} files in "{1}"', len(file_idx), dir_path)
+
+        return file_idx
+
+    # Same as misc_look_for_file().
+    def look_for_file(self, dir_FN, filename_noext, file_exts):
+        dir_path = dir_FN.getPath()
+        if dir_path not in self.dir_idx:
+            self.num_lookups[dir_path] = self.num_lookups.get(dir_path, 0) + 1
+            if self.num_lookups[dir_path] <= ASSET_DIR_INDEX_MIN_LOOKUPS:
+                return misc_look_for_file(dir_FN, filename_noext, file_exts)
+            self.dir_idx[dir_path] = self._list_dir(dir_path)
+        file_exts_idx = self.dir_idx[dir_path].get(os.path.normcase(filename_noext))
+        if not file_exts_idx: return None
+        for ext in file_exts:
+            file_name = file_exts_idx.get(os.path.normcase(ext))
+            if file_name: return dir_FN.pjoin(file_name)
+
+        return None
+
 #
 # Search for local assets and put found files into a list. List all has assets as defined 
 # in ROM_ASSET_LIST.
@@ -410,23 +452,28 @@ def asset_get_duplicated_dir_list(launcher):
 # launcher               -> launcher dictionary
 # ROMFile                -> FileName object
 # enabled_ROM_asset_list -> list of booleans
+# asset_dir_index        -> AssetDirIndex object or None. Use an index when searching the assets
+#                           of many ROMs.
 #
-def assets_search_local_assets(launcher, ROMFile, enabled_ROM_asset_list):
+def assets_search_local_assets(launcher, ROMFile, enabled_ROM_asset_list, asset_dir_index = None):
     log_verb('assets_search_local_assets() Searching for ROM local assets...')
     local_asset_list = [''] * len(ROM_ASSET_LIST)
     for i, asset_kind in enumerate(ROM_ASSET_LIST):
         AInfo = assets_get_info_scheme(asset_kind)
         if not enabled_ROM_asset_list[i]:
-            log_verb('assets_search_local_assets() Disabled {0:<9}'.format(AInfo.name))
+            log_verb('assets_search_local_assets() Disabled {0:<9}', AInfo.name)
             continue
         asset_path = FileName(launcher[AInfo.path_key])
-        local_asset = misc_look_for_file(asset_path, ROMFile.getBase_noext(), AInfo.exts)
+        if asset_dir_index:
+            local_asset = asset_dir_index.look_for_file(asset_path, ROMFile.getBase_noext(), AInfo.exts)
+        else:
+            local_asset = misc_look_for_file(asset_path, ROMFile.getBase_noext(), AInfo.exts)
 
         if local_asset:
             local_asset_list[i] = local_asset.getOriginalPath()
-            log_verb('assets_search_local_assets() Found    {0:<9} "{1}"'.format(AInfo.name, local_asset_list[i]))
+            log_verb('assets_search_local_assets() Found    {0:<9} "{1}"', AInfo.name, local_asset_list[i])
         else:
             local_asset_list[i] = ''
-            log_verb('assets_search_local_assets() Missing  {0:<9}'.format(AInfo.name))
+            log_verb('assets_search_local_assets() Missing  {0:<9}', AInfo.name)
 
     return local_asset_list
@@ -21,9 +21,21 @@ import io
 import codecs
 import time
 import os
+import stat
 import sys
 import string
 import base64
+import marshal
+import hashlib
+import itertools
+import gc
+from collections import OrderedDict
+
+# --- SQLite is optional. If not available ROMs are always stored in JSON files ---
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
 
 # --- XML stuff ---
 # ~~~ cElementTree sometimes fails to parse XML in Kodi's Python interpreter... I don't know why
@@ -36,6 +48,8 @@ import xml.etree.ElementTree as ET
 from utils import *
 from utils_kodi import *
 from assets import *
+from rom_name import *
+from service_IO import *
 
 # --- AEL ROM storage version format ---
 # >> An integer number incremented whenever there is a change in the ROM storage format.
@@ -47,6 +61,16 @@ AEL_STORAGE_FORMAT = 1
 JSON_indent     = 1
 JSON_separators = (',', ':')
 
+# --- Launcher ROMs storage backend ---
+# >> Set with fs_set_ROMs_storage() when the plugin starts.
+ROMS_STORAGE_JSON    = 0
+ROMS_STORAGE_SQLITE  = 1
+ROMS_STORAGE_COLUMNS = 2
+ROMS_STORAGE_LIST    = [ROMS_STORAGE_JSON, ROMS_STORAGE_SQLITE, ROMS_STORAGE_COLUMNS]
+ROMS_STORAGE_EXT     = {ROMS_STORAGE_JSON : '.json', ROMS_STORAGE_SQLITE : '.db', ROMS_STORAGE_COLUMNS : '.dat'}
+ROMS_STORAGE_NAME    = {ROMS_STORAGE_JSON : 'JSON', ROMS_STORAGE_SQLITE : 'SQLite', ROMS_STORAGE_COLUMNS : 'Columns'}
+fs_ROMs_storage      = ROMS_STORAGE_JSON
+
 # -------------------------------------------------------------------------------------------------
 # Data model used in the plugin
 # Internally all string in the data model are Unicode. They will be encoded to
@@ -379,6 +403,68 @@ def XML_text(tag_name, tag_text):
 def get_fs_encoding():
     return sys.getfilesystemencoding()
 
+# -------------------------------------------------------------------------------------------------
+# Atomic file writes
+# -------------------------------------------------------------------------------------------------
+# Databases are written into a temporary file which is renamed over the old file when the data
+# is safely on disk. If Kodi crashes or the plugin is killed while writing, the old database is
+# still there instead of an empty or truncated file (see Github issue #8).
+#
+# data must be a str object (already encoded). Raises IOError/OSError like open() so the callers
+# can keep their error handling.
+#
+def fs_write_file_atomic(file_path, data):
+    temp_file_path = file_path + '.tmp'
+    with open(temp_file_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    # >> On Windows os.rename() fails if the destination exists. Python 2 has no os.replace().
+    if os.name == 'nt' and os.path.exists(file_path): os.remove(file_path)
+    os.rename(temp_file_path, file_path)
+
+# -------------------------------------------------------------------------------------------------
+# Write-behind queue
+# -------------------------------------------------------------------------------------------------
+# Some commands write the same small database many times, for example _command_check_database()
+# saves categories.xml once per launcher. Between fs_write_behind_begin() and
+# fs_write_behind_flush() the writers of the index databases (categories.xml, Favourites,
+# Collections and virtual category indices) queue the write instead of doing it. Repeated writes
+# to the same file are coalesced and only the last one is done when the queue is flushed.
+#
+# Queued writes keep references to the dictionaries passed to the writer, so the data written
+# is the data at flush time. ROM databases are never queued to keep memory usage low.
+#
+fs_write_behind_enabled = False
+fs_write_behind_queue   = OrderedDict()
+
+def fs_write_behind_begin():
+    global fs_write_behind_enabled
+
+    log_debug('fs_write_behind_begin() Write-behind enabled')
+    fs_write_behind_enabled = True
+
+def fs_write_behind_flush():
+    global fs_write_behind_enabled
+
+    fs_write_behind_enabled = False
+    log_debug('fs_write_behind_flush() Writing {0} queued file/s'.format(len(fs_write_behind_queue)))
+    while fs_write_behind_queue:
+        (file_path, (writer, args)) = fs_write_behind_queue.popitem(last = False)
+        writer(*args)
+
+#
+# Returns True if the write was queued and the writer must return without writing.
+#
+def fs_write_behind(file_path, writer, *args):
+    if not fs_write_behind_enabled: return False
+    if file_path in fs_write_behind_queue:
+        log_debug('fs_write_behind() Coalescing write of "{0}"'.format(file_path))
+        del fs_write_behind_queue[file_path]
+    fs_write_behind_queue[file_path] = (writer, args)
+
+    return True
+
 # -------------------------------------------------------------------------------------------------
 # Categories/Launchers
 # -------------------------------------------------------------------------------------------------
@@ -386,6 +472,8 @@ def get_fs_encoding():
 # Write to disk categories.xml
 #
 def fs_write_catfile(categories_file, categories, launchers, update_timestamp = 0.0):
+    if fs_write_behind(categories_file.getPath(), fs_write_catfile,
+                       categories_file, categories, launchers, update_timestamp): return
     log_verb('fs_write_catfile() Writing {0}'.format(categories_file.getOriginalPath()))
 
     # Original Angelscry method for generating the XML was to grow a string, like this
@@ -496,9 +584,8 @@ def fs_write_catfile(categories_file, categories, launchers, update_timestamp =
         # Strings in the list are Unicode. Encode to UTF-8
         # Join string, and save categories.xml file
         full_string = ''.join(str_list).encode('utf-8')
-        file_obj = open(categories_file.getPath(), 'w')
-        file_obj.write(full_string)
-        file_obj.close()
+        fs_write_file_atomic(categories_file.getPath(), full_string)
+        fs_unlink_catfile_snapshot(categories_file)
     except OSError:
         log_error('(OSError) Cannot write categories.xml file')
         kodi_notify_warn('(OSError) Cannot write categories.xml file')
@@ -507,9 +594,70 @@ def fs_write_catfile(categories_file, categories, launchers, update_timestamp =
         kodi_notify_warn('(IOError) Cannot write categories.xml file')
 
 #
-# Loads categories.xml from disk and fills dictionary self.categories
+# Loads categories.xml. Returns a tuple (update_timestamp, categories, launchers).
+#
+# Parsing categories.xml is the most expensive thing done in every plugin invocation when there
+# are many launchers. A marshal snapshot of the parsed data is stored next to categories.xml
+# (categories.idx) and used instead of the XML if the size and mtime of categories.xml have not
+# changed since the snapshot was created. fs_write_catfile() deletes the snapshot, so it is never
+# used after AEL changes categories.xml, even if the mtime resolution of the filesystem is poor.
+# If the AEL service is running the parsed data is taken from the service memory instead.
 #
+# Snapshot file format: marshal header dictionary followed by the marshaled return tuple.
+# header = {'version' : CATFILE_SNAPSHOT_VERSION, 'xml_size' : int, 'xml_mtime' : float}
+#
+CATFILE_SNAPSHOT_VERSION = 1
+
+def fs_get_catfile_snapshot_path(categories_file):
+    return os.path.splitext(categories_file.getPath())[0] + '.idx'
+
+def fs_unlink_catfile_snapshot(categories_file):
+    snapshot_file = fs_get_catfile_snapshot_path(categories_file)
+    if os.path.isfile(snapshot_file): os.remove(snapshot_file)
+
 def fs_load_catfile(categories_file):
+    cat_data = service_load_catfile(categories_file.getPath())
+    if cat_data is not None: return cat_data
+
+    snapshot_file = fs_get_catfile_snapshot_path(categories_file)
+    try:
+        st = os.stat(categories_file.getPath())
+    except OSError:
+        return fs_load_catfile_XML(categories_file)
+
+    # --- Use snapshot if categories.xml has not changed ---
+    if os.path.isfile(snapshot_file):
+        try:
+            with open(snapshot_file, 'rb') as file:
+                header = marshal.load(file)
+                if header['version'] == CATFILE_SNAPSHOT_VERSION and \
+                   header['xml_size'] == st.st_size and header['xml_mtime'] == st.st_mtime:
+                    log_verb('fs_load_catfile() Loading snapshot {0}'.format(snapshot_file))
+                    return marshal.load(file)
+                log_verb('fs_load_catfile() Snapshot outdated')
+        except (IOError, OSError, EOFError, ValueError, TypeError, KeyError) as e:
+            log_error('fs_load_catfile() Exception loading snapshot "{0}"'.format(snapshot_file))
+            log_error('fs_load_catfile() {0}'.format(unicode(e)))
+
+    # --- Parse XML and create snapshot ---
+    # >> Do not create a snapshot of an empty or unparseable file.
+    cat_data = fs_load_catfile_XML(categories_file)
+    if cat_data[1] or cat_data[2]:
+        header = {'version'   : CATFILE_SNAPSHOT_VERSION,
+                  'xml_size'  : st.st_size,
+                  'xml_mtime' : st.st_mtime}
+        try:
+            fs_write_file_atomic(snapshot_file, marshal.dumps(header) + marshal.dumps(cat_data))
+        except (IOError, OSError) as e:
+            log_error('fs_load_catfile() Exception writing snapshot "{0}"'.format(snapshot_file))
+            log_error('fs_load_catfile() {0}'.format(unicode(e)))
+
+    return cat_data
+
+#
+# Loads categories.xml from disk and fills dictionary self.categories
+#
+def fs_load_catfile_XML(categories_file):
     __debug_xml_parser = 0
     update_timestamp = 0.0
     categories = {}
@@ -517,7 +665,7 @@ def fs_load_catfile(categories_file):
 
     # --- Parse using cElementTree ---
     # If there are issues in the XML file (for example, invalid XML chars) ET.parse will fail
-    log_verb('fs_load_catfile() Loading {0}'.format(categories_file.getOriginalPath()))
+    log_verb('fs_load_catfile_XML() Loading {0}'.format(categories_file.getOriginalPath()))
     try:
         xml_tree = ET.parse(categories_file.getPath())
     except ET.ParseError, e:
@@ -599,11 +747,9 @@ def fs_write_JSON_file(file_dir, file_base_noext, data):
     log_verb('fs_write_JSON_file() JSON {0}'.format(file_base_noext + '.json'))
 
     try:
-        with io.open(json_file.getPath(), 'w', encoding = 'utf-8') as file:
-            json_data = json.dumps(data, ensure_ascii = False, sort_keys = True, 
-                                   indent = JSON_indent, separators = JSON_separators)
-            file.write(unicode(json_data))
-            file.close()
+        json_data = json.dumps(data, ensure_ascii = False, sort_keys = True, 
+                               indent = JSON_indent, separators = JSON_separators)
+        fs_write_file_atomic(json_file.getPath(), unicode(json_data).encode('utf-8'))
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(json_file.getPath()))
     except IOError:
@@ -650,25 +796,155 @@ def fs_get_ROMs_JSON_file_path(roms_dir, roms_base_noext):
 
     return roms_file_path
 
+def fs_get_ROMs_SQLite_file_path(roms_dir, roms_base_noext):
+    roms_file_path = roms_dir.join(roms_base_noext + '.db')
+
+    return roms_file_path
+
+def fs_get_ROMs_columns_file_path(roms_dir, roms_base_noext):
+    roms_file_path = roms_dir.join(roms_base_noext + '.dat')
+
+    return roms_file_path
+
+def fs_get_ROMs_storage_file_path(roms_dir, roms_base_noext, backend):
+    roms_file_path = roms_dir.join(roms_base_noext + ROMS_STORAGE_EXT[backend])
+
+    return roms_file_path
+
+#
+# Returns the storage backend of the launcher ROMs database or None if there is no database.
+# The backend selected by the user is preferred. If its file does not exist the ROMs are in the
+# file of another backend (user changed the setting and the launcher has not been written since).
+#
+def fs_find_ROMs_storage(roms_dir, roms_base_noext):
+    if fs_get_ROMs_storage_file_path(roms_dir, roms_base_noext, fs_ROMs_storage).exists():
+        return fs_ROMs_storage
+    for backend in ROMS_STORAGE_LIST:
+        if backend == ROMS_STORAGE_SQLITE and sqlite3 is None: continue
+        if fs_get_ROMs_storage_file_path(roms_dir, roms_base_noext, backend).exists(): return backend
+
+    return None
+
+#
+# Returns True if the launcher has a ROMs database, no matter the storage backend used.
+#
+def fs_ROMs_database_exists(roms_dir, roms_base_noext):
+    return fs_find_ROMs_storage(roms_dir, roms_base_noext) is not None
+
 def fs_unlink_ROMs_database(roms_dir, roms_base_noext):
     # >> Delete ROMs info XML file
     roms_xml_file = fs_get_ROMs_XML_file_path(roms_dir, roms_base_noext)
     if roms_xml_file.exists():
         log_info('Deleting ROMs XML  "{0}"'.format(roms_xml_file.getOriginalPath()))
         roms_xml_file.unlink()
-    # >> Delete ROMs JSON file
-    roms_json_file = fs_get_ROMs_JSON_file_path(roms_dir, roms_base_noext)
-    if roms_json_file.exists():
-        log_info('Deleting ROMs JSON "{0}"'.format(roms_json_file.getOriginalPath()))
-        roms_json_file.unlink()
-
+    # >> Delete ROMs database file/s
+    for backend in ROMS_STORAGE_LIST:
+        roms_file = fs_get_ROMs_storage_file_path(roms_dir, roms_base_noext, backend)
+        if roms_file.exists():
+            log_info('Deleting ROMs {0} "{1}"'.format(ROMS_STORAGE_NAME[backend], roms_file.getOriginalPath()))
+            roms_file.unlink()
+    # >> Delete ROM scanner manifest and render cache
+    fs_unlink_ROMs_manifest(roms_dir, roms_base_noext)
+    fs_unlink_ROMs_render_cache(roms_dir, roms_base_noext)
+
+def fs_write_ROMs_storage(roms_dir, roms_base_noext, roms, backend):
+    if   backend == ROMS_STORAGE_SQLITE:  fs_write_ROMs_SQLite(roms_dir, roms_base_noext, roms)
+    elif backend == ROMS_STORAGE_COLUMNS: fs_write_ROMs_columns(roms_dir, roms_base_noext, roms)
+    else:                                 fs_write_ROMs_JSON_file(roms_dir, roms_base_noext, roms)
+
+def fs_load_ROMs_storage(roms_dir, roms_base_noext, backend):
+    if   backend == ROMS_STORAGE_SQLITE:  return fs_load_ROMs_SQLite(roms_dir, roms_base_noext)
+    elif backend == ROMS_STORAGE_COLUMNS: return fs_load_ROMs_columns(roms_dir, roms_base_noext)
+    else:                                 return fs_load_ROMs_JSON_file(roms_dir, roms_base_noext)
+
+#
+# Writes the launcher ROMs with the storage backend selected by the user. The name of the function
+# is kept for historical reasons. The database files of the other backends are removed so there
+# is never an outdated copy of the ROMs around.
+#
 def fs_write_ROMs_JSON(roms_dir, roms_base_noext, roms, launcher):
-    # >> Get file names
-    roms_json_file = roms_dir.join(roms_base_noext + '.json')
-    roms_xml_file  = roms_dir.join(roms_base_noext + '.xml')
-    log_verb('fs_write_ROMs_JSON() Dir  {0}'.format(roms_dir.getOriginalPath()))
-    log_verb('fs_write_ROMs_JSON() JSON {0}'.format(roms_base_noext + '.json'))
-    log_verb('fs_write_ROMs_JSON() XML  {0}'.format(roms_base_noext + '.xml'))
+    fs_write_ROMs_info_XML(roms_dir, roms_base_noext, launcher)
+    fs_write_ROMs_storage(roms_dir, roms_base_noext, roms, fs_ROMs_storage)
+    for backend in ROMS_STORAGE_LIST:
+        if backend == fs_ROMs_storage: continue
+        roms_other_file = fs_get_ROMs_storage_file_path(roms_dir, roms_base_noext, backend)
+        if roms_other_file.exists():
+            log_verb('fs_write_ROMs_JSON() Deleting {0}'.format(roms_other_file.getOriginalPath()))
+            roms_other_file.unlink()
+    fs_update_ROM_index(roms_dir, launcher['id'], roms_base_noext, roms)
+
+#
+# Loads the launcher ROMs, no matter the storage backend used.
+#
+def fs_load_ROMs_JSON(roms_dir, roms_base_noext):
+    roms = service_load_ROMs(roms_dir.getPath(), roms_base_noext)
+    if roms is not None: return roms
+
+    backend = fs_find_ROMs_storage(roms_dir, roms_base_noext)
+    if backend is None: return {}
+
+    return fs_load_ROMs_storage(roms_dir, roms_base_noext, backend)
+
+#
+# Loads the launcher ROMs for rendering or searching. With the columnar backend only the fields
+# in the fields list are decoded. With other backends, or if the ROMs come from the AEL service,
+# ROMs have all the fields.
+#
+def fs_load_ROMs_fields(roms_dir, roms_base_noext, fields):
+    roms = service_load_ROMs(roms_dir.getPath(), roms_base_noext)
+    if roms is not None: return roms
+
+    backend = fs_find_ROMs_storage(roms_dir, roms_base_noext)
+    if backend is None: return {}
+    if backend == ROMS_STORAGE_COLUMNS: return fs_load_ROMs_columns(roms_dir, roms_base_noext, fields)
+
+    return fs_load_ROMs_storage(roms_dir, roms_base_noext, backend)
+
+#
+# Loads the ROMs needed to edit or launch ROM romID. With SQLite only ROM romID is read from the
+# database. With other backends all the launcher ROMs are loaded. In both cases the returned
+# dictionary must be passed to fs_write_ROM() when saving the ROM. Returns an empty dictionary
+# if ROM romID is not found.
+#
+def fs_load_ROM(roms_dir, roms_base_noext, romID):
+    if fs_ROMs_storage == ROMS_STORAGE_SQLITE and \
+       fs_find_ROMs_storage(roms_dir, roms_base_noext) == ROMS_STORAGE_SQLITE:
+        return fs_load_ROM_SQLite(roms_dir, roms_base_noext, romID)
+    roms = fs_load_ROMs_JSON(roms_dir, roms_base_noext)
+    if romID not in roms: return {}
+
+    return roms
+
+#
+# Saves ROM romID. roms is the dictionary returned by fs_load_ROM(). With SQLite a single row
+# is updated. Otherwise the whole database is written.
+#
+def fs_write_ROM(roms_dir, roms_base_noext, roms, romID, launcher):
+    if fs_ROMs_storage == ROMS_STORAGE_SQLITE and \
+       fs_find_ROMs_storage(roms_dir, roms_base_noext) == ROMS_STORAGE_SQLITE:
+        fs_update_ROM_SQLite(roms_dir, roms_base_noext, roms[romID])
+    else:
+        fs_write_ROMs_JSON(roms_dir, roms_base_noext, roms, launcher)
+
+#
+# Selects the launcher ROMs storage backend. Falls back to JSON if sqlite3 is not available.
+#
+def fs_set_ROMs_storage(backend):
+    global fs_ROMs_storage
+
+    if backend not in ROMS_STORAGE_LIST:
+        log_warning('fs_set_ROMs_storage() Unknown backend {0}. Using JSON.'.format(backend))
+        backend = ROMS_STORAGE_JSON
+    if backend == ROMS_STORAGE_SQLITE and sqlite3 is None:
+        log_warning('fs_set_ROMs_storage() sqlite3 module not available. Using JSON.')
+        backend = ROMS_STORAGE_JSON
+    fs_ROMs_storage = backend
+    log_debug('fs_set_ROMs_storage() Backend {0}'.format(ROMS_STORAGE_NAME[backend]))
+
+def fs_write_ROMs_info_XML(roms_dir, roms_base_noext, launcher):
+    roms_xml_file = fs_get_ROMs_XML_file_path(roms_dir, roms_base_noext)
+    log_verb('fs_write_ROMs_info_XML() Dir  {0}'.format(roms_dir.getOriginalPath()))
+    log_verb('fs_write_ROMs_info_XML() XML  {0}'.format(roms_base_noext + '.xml'))
 
     # >> JSON files cannot have comments. Write an auxiliar NFO file with same prefix
     # >> to store launcher information for a set of ROMs
@@ -690,38 +966,39 @@ def fs_write_ROMs_JSON(roms_dir, roms_base_noext, roms, launcher):
         str_list.append('</advanced_emulator_launcher_ROMs>\n')
 
         full_string = ''.join(str_list).encode('utf-8')
-        file_obj = open(roms_xml_file.getPath(), 'w')
-        file_obj.write(full_string)
-        file_obj.close()
+        fs_write_file_atomic(roms_xml_file.getPath(), full_string)
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(roms_xml_file.getPath()))
-        log_error('fs_write_ROMs_JSON() (OSerror) Cannot write file "{0}"'.format(roms_xml_file.getPath()))
+        log_error('fs_write_ROMs_info_XML() (OSerror) Cannot write file "{0}"'.format(roms_xml_file.getPath()))
     except IOError:
         kodi_notify_warn('(IOError) Cannot write {0} file'.format(roms_xml_file.getPath()))
-        log_error('fs_write_ROMs_JSON() (IOError) Cannot write file "{0}"'.format(roms_xml_file.getPath()))
+        log_error('fs_write_ROMs_info_XML() (IOError) Cannot write file "{0}"'.format(roms_xml_file.getPath()))
+
+def fs_write_ROMs_JSON_file(roms_dir, roms_base_noext, roms):
+    roms_json_file = fs_get_ROMs_JSON_file_path(roms_dir, roms_base_noext)
+    log_verb('fs_write_ROMs_JSON_file() Dir  {0}'.format(roms_dir.getOriginalPath()))
+    log_verb('fs_write_ROMs_JSON_file() JSON {0}'.format(roms_base_noext + '.json'))
 
     # >> Write ROMs JSON dictionary.
     # >> Do note that there is a bug in the json module where the ensure_ascii=False flag can produce
     # >> a mix of unicode and str objects.
     # >> See http://stackoverflow.com/questions/18337407/saving-utf-8-texts-in-json-dumps-as-utf8-not-as-u-escape-sequence
     try:
-        with io.open(roms_json_file.getPath(), 'w', encoding = 'utf-8') as file:
-            # >> json_unicode is either str or unicode
-            # >> See https://docs.python.org/2.7/library/json.html#json.dumps
-            json_data = json.dumps(roms, ensure_ascii = False, sort_keys = True,
-                                   indent = JSON_indent, separators = JSON_separators)
-            # unicode(json_data) auto-decodes data to unicode if str
-            file.write(unicode(json_data))
-            file.close()
+        # >> json_unicode is either str or unicode
+        # >> See https://docs.python.org/2.7/library/json.html#json.dumps
+        json_data = json.dumps(roms, ensure_ascii = False, sort_keys = True,
+                               indent = JSON_indent, separators = JSON_separators)
+        # unicode(json_data) auto-decodes data to unicode if str
+        fs_write_file_atomic(roms_json_file.getPath(), unicode(json_data).encode('utf-8'))
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(roms_json_file.getPath()))
     except IOError:
         kodi_notify_warn('(IOError) Cannot write {0} file'.format(roms_json_file.getPath()))
 
 #
-# Loads an JSON file containing the Virtual Launcher ROMs
+# Loads an JSON file containing the launcher ROMs
 #
-def fs_load_ROMs_JSON(roms_dir, roms_base_noext):
+def fs_load_ROMs_JSON_file(roms_dir, roms_base_noext):
     roms = {}
 
     # --- If file does not exist return empty dictionary ---
@@ -732,21 +1009,668 @@ def fs_load_ROMs_JSON(roms_dir, roms_base_noext):
     # >> On Github issue #8 a user had an empty JSON file for ROMs. This raises
     #    exception exceptions.ValueError and launcher cannot be deleted. Deal
     #    with this exception so at least launcher can be rescanned.
-    log_verb('fs_load_ROMs_JSON() Dir  {0}'.format(roms_dir.getOriginalPath()))
-    log_verb('fs_load_ROMs_JSON() JSON {0}'.format(roms_base_noext + '.json'))
+    log_verb('fs_load_ROMs_JSON_file() Dir  {0}'.format(roms_dir.getOriginalPath()))
+    log_verb('fs_load_ROMs_JSON_file() JSON {0}'.format(roms_base_noext + '.json'))
     with open(roms_json_file.getPath().decode('utf-8')) as file:
         try:
             roms = json.load(file)
         except ValueError:
             statinfo = roms_json_file.stat()
-            log_error('fs_load_ROMs_JSON() ValueError exception in json.load() function')
-            log_error('fs_load_ROMs_JSON() Dir  {0}'.format(roms_dir.getPath()))
-            log_error('fs_load_ROMs_JSON() File {0}'.format(roms_base_noext + '.json'))
-            log_error('fs_load_ROMs_JSON() Size {0}'.format(statinfo.st_size))
+            log_error('fs_load_ROMs_JSON_file() ValueError exception in json.load() function')
+            log_error('fs_load_ROMs_JSON_file() Dir  {0}'.format(roms_dir.getPath()))
+            log_error('fs_load_ROMs_JSON_file() File {0}'.format(roms_base_noext + '.json'))
+            log_error('fs_load_ROMs_JSON_file() Size {0}'.format(statinfo.st_size))
         file.close()
 
     return roms
 
+# -------------------------------------------------------------------------------------------------
+# Standard ROMs, SQLite storage backend
+# -------------------------------------------------------------------------------------------------
+# Launcher ROMs are stored in table roms of file roms_base_noext.db. Every row has the ROM
+# dictionary serialised as JSON in column data. Some fields are duplicated in indexed columns so
+# ROMs can be searched without decoding all the rows. Launching or editing a ROM reads/writes a
+# single row instead of the whole JSON file, which makes a difference in launchers with many ROMs.
+# The info XML file is written as with the JSON backend.
+#
+ROMS_SQLITE_COLUMNS = ['filename', 'm_name', 'm_year', 'm_genre', 'm_studio', 'nointro_status']
+
+def fs_open_ROMs_SQLite(roms_db_file):
+    conn = sqlite3.connect(roms_db_file.getPath())
+    conn.execute('CREATE TABLE IF NOT EXISTS roms (id TEXT PRIMARY KEY, {0}, data TEXT NOT NULL)'.format(
+        ', '.join(['{0} TEXT'.format(column) for column in ROMS_SQLITE_COLUMNS])))
+    for column in ROMS_SQLITE_COLUMNS:
+        conn.execute('CREATE INDEX IF NOT EXISTS roms_{0} ON roms ({0})'.format(column))
+
+    return conn
+
+def fs_get_ROM_SQLite_row(romID, rom):
+    row = [romID]
+    for column in ROMS_SQLITE_COLUMNS: row.append(rom[column])
+    # >> Non-ASCII characters are escaped. json.dumps() is much faster with ensure_ascii = True.
+    row.append(unicode(json.dumps(rom, separators = JSON_separators)))
+
+    return row
+
+def fs_write_ROMs_SQLite(roms_dir, roms_base_noext, roms):
+    roms_db_file = fs_get_ROMs_SQLite_file_path(roms_dir, roms_base_noext)
+    log_verb('fs_write_ROMs_SQLite() Dir  {0}'.format(roms_dir.getOriginalPath()))
+    log_verb('fs_write_ROMs_SQLite() DB   {0}'.format(roms_base_noext + '.db'))
+    sql = 'INSERT INTO roms VALUES ({0})'.format(', '.join(['?'] * (len(ROMS_SQLITE_COLUMNS) + 2)))
+    try:
+        conn = fs_open_ROMs_SQLite(roms_db_file)
+        # >> The connection context manager commits the transaction or rolls it back on error.
+        with conn:
+            conn.execute('PRAGMA user_version = {0}'.format(AEL_STORAGE_FORMAT))
+            conn.execute('DELETE FROM roms')
+            conn.executemany(sql, (fs_get_ROM_SQLite_row(romID, roms[romID]) for romID in roms))
+        conn.close()
+    except sqlite3.Error as e:
+        kodi_notify_warn('(SQLite) Cannot write {0} file'.format(roms_db_file.getPath()))
+        log_error('fs_write_ROMs_SQLite() (sqlite3.Error) {0}'.format(unicode(e)))
+
+def fs_load_ROMs_SQLite(roms_dir, roms_base_noext):
+    roms = {}
+    roms_db_file = fs_get_ROMs_SQLite_file_path(roms_dir, roms_base_noext)
+    if not roms_db_file.exists(): return roms
+
+    log_verb('fs_load_ROMs_SQLite() Dir  {0}'.format(roms_dir.getOriginalPath()))
+    log_verb('fs_load_ROMs_SQLite() DB   {0}'.format(roms_base_noext + '.db'))
+    try:
+        conn = fs_open_ROMs_SQLite(roms_db_file)
+        for (romID, data) in conn.execute('SELECT id, data FROM roms'):
+            roms[romID] = json.loads(data)
+        conn.close()
+    except (sqlite3.Error, ValueError) as e:
+        log_error('fs_load_ROMs_SQLite() Exception loading {0}'.format(roms_db_file.getPath()))
+        log_error('fs_load_ROMs_SQLite() {0}'.format(unicode(e)))
+
+    return roms
+
+#
+# Returns a dictionary with ROM romID only or an empty dictionary if not found.
+#
+def fs_load_ROM_SQLite(roms_dir, roms_base_noext, romID):
+    roms = {}
+    roms_db_file = fs_get_ROMs_SQLite_file_path(roms_dir, roms_base_noext)
+    log_verb('fs_load_ROM_SQLite() DB   {0}'.format(roms_base_noext + '.db'))
+    log_verb('fs_load_ROM_SQLite() ROM  {0}'.format(romID))
+    try:
+        conn = fs_open_ROMs_SQLite(roms_db_file)
+        row = conn.execute('SELECT data FROM roms WHERE id = ?', (romID,)).fetchone()
+        if row: roms[romID] = json.loads(row[0])
+        conn.close()
+    except (sqlite3.Error, ValueError) as e:
+        log_error('fs_load_ROM_SQLite() Exception loading {0}'.format(roms_db_file.getPath()))
+        log_error('fs_load_ROM_SQLite() {0}'.format(unicode(e)))
+
+    return roms
+
+def fs_update_ROM_SQLite(roms_dir, roms_base_noext, rom):
+    roms_db_file = fs_get_ROMs_SQLite_file_path(roms_dir, roms_base_noext)
+    log_verb('fs_update_ROM_SQLite() DB   {0}'.format(roms_base_noext + '.db'))
+    log_verb('fs_update_ROM_SQLite() ROM  {0}'.format(rom['id']))
+    sql = 'INSERT OR REPLACE INTO roms VALUES ({0})'.format(', '.join(['?'] * (len(ROMS_SQLITE_COLUMNS) + 2)))
+    try:
+        conn = fs_open_ROMs_SQLite(roms_db_file)
+        with conn:
+            conn.execute(sql, fs_get_ROM_SQLite_row(rom['id'], rom))
+        conn.close()
+    except sqlite3.Error as e:
+        kodi_notify_warn('(SQLite) Cannot write {0} file'.format(roms_db_file.getPath()))
+        log_error('fs_update_ROM_SQLite() (sqlite3.Error) {0}'.format(unicode(e)))
+
+# -------------------------------------------------------------------------------------------------
+# Standard ROMs, columnar storage backend
+# -------------------------------------------------------------------------------------------------
+# Compact format that loads much faster than JSON, specially on slow devices. File
+# roms_base_noext.dat has a sequence of marshal objects:
+#
+# header  {'version' : ROMS_COLUMNS_VERSION, 'keys_size' : int,
+#          'columns' : [(field, is_sparse, size), ...] }
+# keys    [romID, romID, ...]
+# column  [value, value, ...] (one value per ROM in the same order as keys)
+# column  {index : value, ...} (sparse column, only when some ROMs do not have the field)
+# ...
+#
+# Field names are stored once instead of once per ROM. Every column can be decoded
+# independently, so the loader only decodes the fields requested.
+#
+# NOTE marshal format depends on the Python version. The JSON backend is the portable format
+#      and ROMs can be exported to JSON from the launcher context menu.
+ROMS_COLUMNS_VERSION = 1
+
+def fs_write_ROMs_columns(roms_dir, roms_base_noext, roms):
+    roms_dat_file = fs_get_ROMs_columns_file_path(roms_dir, roms_base_noext)
+    log_verb('fs_write_ROMs_columns() Dir  {0}'.format(roms_dir.getOriginalPath()))
+    log_verb('fs_write_ROMs_columns() DAT  {0}'.format(roms_base_noext + '.dat'))
+
+    rom_IDs = roms.keys()
+    fields = set()
+    for rom in roms.itervalues(): fields.update(rom)
+    header = {'version' : ROMS_COLUMNS_VERSION, 'columns' : []}
+    keys_str = marshal.dumps(rom_IDs)
+    header['keys_size'] = len(keys_str)
+    column_str_list = []
+    for field in sorted(fields):
+        try:
+            column_str = marshal.dumps([roms[romID][field] for romID in rom_IDs])
+            is_sparse = False
+        except KeyError:
+            column_str = marshal.dumps({idx : roms[romID][field] for (idx, romID) in enumerate(rom_IDs)
+                                        if field in roms[romID]})
+            is_sparse = True
+        header['columns'].append((field, is_sparse, len(column_str)))
+        column_str_list.append(column_str)
+    try:
+        column_str_list.insert(0, keys_str)
+        column_str_list.insert(0, marshal.dumps(header))
+        fs_write_file_atomic(roms_dat_file.getPath(), b''.join(column_str_list))
+    except (IOError, OSError) as e:
+        kodi_notify_warn('Cannot write {0} file'.format(roms_dat_file.getPath()))
+        log_error('fs_write_ROMs_columns() Exception writing "{0}"'.format(roms_dat_file.getPath()))
+        log_error('fs_write_ROMs_columns() {0}'.format(unicode(e)))
+
+#
+# If fields is None all the fields are loaded. Otherwise ROMs only have the fields in the
+# fields list.
+#
+def fs_load_ROMs_columns(roms_dir, roms_base_noext, fields = None):
+    roms = {}
+    roms_dat_file = fs_get_ROMs_columns_file_path(roms_dir, roms_base_noext)
+    if not roms_dat_file.exists(): return roms
+
+    log_verb('fs_load_ROMs_columns() Dir  {0}'.format(roms_dir.getOriginalPath()))
+    log_verb('fs_load_ROMs_columns() DAT  {0}'.format(roms_base_noext + '.dat'))
+    dense_fields  = []
+    dense_columns = []
+    sparse_columns = []
+    try:
+        with open(roms_dat_file.getPath(), 'rb') as file:
+            header = marshal.load(file)
+            if header['version'] != ROMS_COLUMNS_VERSION:
+                log_error('fs_load_ROMs_columns() Unsupported version {0}'.format(header['version']))
+                return roms
+            rom_IDs = marshal.loads(file.read(header['keys_size']))
+            offset = file.tell()
+            for (field, is_sparse, size) in header['columns']:
+                if fields is None or field in fields:
+                    file.seek(offset)
+                    column = marshal.loads(file.read(size))
+                    if is_sparse:
+                        sparse_columns.append((field, column))
+                    else:
+                        dense_fields.append(field)
+                        dense_columns.append(column)
+                offset += size
+    except (IOError, OSError, EOFError, ValueError, TypeError, KeyError) as e:
+        log_error('fs_load_ROMs_columns() Exception loading "{0}"'.format(roms_dat_file.getPath()))
+        log_error('fs_load_ROMs_columns() {0}'.format(unicode(e)))
+        return roms
+
+    # >> Build the ROM dictionaries one row at a time. zip() does most of the work in C.
+    # >> The garbage collector is disabled while creating the dictionaries. Otherwise it runs
+    # >> many times for nothing and building the dictionaries takes twice as long.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if dense_columns:
+            rom_list = [dict(zip(dense_fields, row)) for row in zip(*dense_columns)]
+        else:
+            rom_list = [{} for romID in rom_IDs]
+        for (field, column) in sparse_columns:
+            for (idx, value) in column.iteritems(): rom_list[idx][field] = value
+        roms = dict(itertools.izip(rom_IDs, rom_list))
+    finally:
+        if gc_enabled: gc.enable()
+
+    return roms
+
+# -------------------------------------------------------------------------------------------------
+# Global ROM index
+# -------------------------------------------------------------------------------------------------
+# Maps the ROM ID, filename and basename of the ROMs in all launchers to the launcher they belong
+# to, so a ROM can be found without loading the ROMs of every launcher. fs_write_ROMs_JSON()
+# updates the entry of the launcher every time its ROMs are written.
+#
+# ROMs can also change without fs_write_ROMs_JSON() (single ROM updates with SQLite, databases
+# written by older versions of AEL, ...). Every launcher entry stores the storage backend and stat
+# of the ROMs database. fs_load_ROM_index() reindexes the launchers whose database changed and
+# removes the launchers that do not exist anymore.
+#
+# File format: marshal dictionary.
+# index = {'version' : ROM_INDEX_VERSION,
+#          'launchers' : {launcherID : [roms_base_noext, database_key, [[romID, filename, basename], ...]], ...}}
+#
+ROM_INDEX_VERSION = 1
+
+# >> (stat key, index) of the last index file read or written by this plugin invocation.
+fs_ROM_index_cache = None
+
+def fs_get_ROM_index_file_path(roms_dir):
+    return roms_dir.join('AEL_ROMs_index.dat')
+
+#
+# Returns a key that changes when the ROMs database of a launcher is written. None if the
+# launcher has no ROMs database.
+#
+def fs_get_ROMs_database_key(roms_dir, roms_base_noext):
+    backend = fs_find_ROMs_storage(roms_dir, roms_base_noext)
+    if backend is None: return None
+
+    return [backend, fs_get_file_stat_key(fs_get_ROMs_storage_file_path(roms_dir, roms_base_noext, backend))]
+
+#
+# Returns the index entries of the ROMs of a launcher.
+#
+def fs_get_ROM_index_entries(roms):
+    return [[rom_id, roms[rom_id]['filename'], FileName(roms[rom_id]['filename']).getBase()] for rom_id in roms]
+
+def fs_read_ROM_index_file(roms_dir):
+    global fs_ROM_index_cache
+
+    index_file = fs_get_ROM_index_file_path(roms_dir)
+    stat_key = fs_get_file_stat_key(index_file)
+    if stat_key is None: return {'version' : ROM_INDEX_VERSION, 'launchers' : {}}
+    if fs_ROM_index_cache is not None and fs_ROM_index_cache[0] == stat_key: return fs_ROM_index_cache[1]
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(index_file.getPath(), 'rb') as file:
+            index = marshal.load(file)
+        if index['version'] != ROM_INDEX_VERSION: raise ValueError('Unknown index version')
+        fs_ROM_index_cache = (stat_key, index)
+    except (IOError, OSError, EOFError, ValueError, TypeError, KeyError) as e:
+        log_error('fs_read_ROM_index_file() Exception loading "{0}"'.format(index_file.getPath()))
+        log_error('fs_read_ROM_index_file() {0}'.format(unicode(e)))
+        index = {'version' : ROM_INDEX_VERSION, 'launchers' : {}}
+    finally:
+        if gc_enabled: gc.enable()
+
+    return index
+
+def fs_write_ROM_index_file(roms_dir, index):
+    global fs_ROM_index_cache
+
+    index_file = fs_get_ROM_index_file_path(roms_dir)
+    log_verb('fs_write_ROM_index_file() File {0}'.format(index_file.getOriginalPath()))
+    try:
+        fs_write_file_atomic(index_file.getPath(), marshal.dumps(index))
+    except (IOError, OSError, ValueError) as e:
+        log_error('fs_write_ROM_index_file() Exception writing "{0}"'.format(index_file.getPath()))
+        log_error('fs_write_ROM_index_file() {0}'.format(unicode(e)))
+        fs_ROM_index_cache = None
+        return
+    fs_ROM_index_cache = (fs_get_file_stat_key(index_file), index)
+
+#
+# Called after the ROMs of launcherID have been written.
+#
+def fs_update_ROM_index(roms_dir, launcherID, roms_base_noext, roms):
+    index = fs_read_ROM_index_file(roms_dir)
+    index['launchers'][launcherID] = [roms_base_noext, fs_get_ROMs_database_key(roms_dir, roms_base_noext),
+                                      fs_get_ROM_index_entries(roms)]
+    fs_write_ROM_index_file(roms_dir, index)
+
+#
+# Returns the lookup dictionaries of the ROMs in the launchers dictionary.
+# rom_index = {'romID'    : {romID : launcherID, ...},
+#              'filename' : {filename : [launcherID, romID], ...},
+#              'basename' : {basename : [[launcherID, romID], ...], ...}}
+# If several ROMs have the same filename the first one is indexed. All the ROMs with the same
+# basename are indexed.
+#
+def fs_load_ROM_index(roms_dir, launchers):
+    index = fs_read_ROM_index_file(roms_dir)
+    index_launchers = index['launchers']
+    index_changed = False
+
+    # --- Remove deleted launchers ---
+    for launcher_id in list(index_launchers):
+        if launcher_id not in launchers or launchers[launcher_id]['rompath'] == '':
+            del index_launchers[launcher_id]
+            index_changed = True
+
+    # --- Reindex launchers whose ROMs changed ---
+    for launcher_id in launchers:
+        launcher = launchers[launcher_id]
+        if launcher['rompath'] == '': continue
+        roms_base_noext = launcher['roms_base_noext']
+        database_key = fs_get_ROMs_database_key(roms_dir, roms_base_noext)
+        if launcher_id in index_launchers and index_launchers[launcher_id][0] == roms_base_noext and \
+           index_launchers[launcher_id][1] == database_key: continue
+        log_verb('fs_load_ROM_index() Indexing launcher {0}'.format(launcher_id))
+        roms = fs_load_ROMs_fields(roms_dir, roms_base_noext, ['filename'])
+        index_launchers[launcher_id] = [roms_base_noext, database_key, fs_get_ROM_index_entries(roms)]
+        index_changed = True
+    if index_changed: fs_write_ROM_index_file(roms_dir, index)
+
+    # --- Make lookup dictionaries ---
+    rom_index = {'romID' : {}, 'filename' : {}, 'basename' : {}}
+    romID_dic    = rom_index['romID']
+    filename_dic = rom_index['filename']
+    basename_dic = rom_index['basename']
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    for launcher_id in index_launchers:
+        for (rom_id, filename, basename) in index_launchers[launcher_id][2]:
+            romID_dic[rom_id] = launcher_id
+            if filename not in filename_dic: filename_dic[filename] = [launcher_id, rom_id]
+            if basename in basename_dic: basename_dic[basename].append([launcher_id, rom_id])
+            else:                        basename_dic[basename] = [[launcher_id, rom_id]]
+    if gc_enabled: gc.enable()
+
+    return rom_index
+
+# -------------------------------------------------------------------------------------------------
+# ROMs render cache
+# -------------------------------------------------------------------------------------------------
+# Rendering a launcher computes the label, infolabels, properties, artwork and context menu of
+# every ROM. The render cache stores the rows of a launcher already sorted and formatted, so
+# opening the launcher again only creates the Kodi listitems.
+#
+# The cache key is created by the caller and includes everything the rows depend on (launcher
+# timestamp and default assets, stat of the ROMs and Favourites files, render settings, ...).
+# If the key does not match the one in the cache the cache is not used.
+#
+# Cache file format: marshal header dictionary followed by the marshaled list of rows.
+# header = {'version' : ROMS_RENDER_CACHE_VERSION, 'key' : key}
+#
+ROMS_RENDER_CACHE_VERSION = 1
+
+def fs_get_ROMs_render_cache_path(roms_dir, roms_base_noext):
+    return roms_dir.join(roms_base_noext + '_render.dat')
+
+def fs_unlink_ROMs_render_cache(roms_dir, roms_base_noext):
+    cache_file = fs_get_ROMs_render_cache_path(roms_dir, roms_base_noext)
+    if cache_file.exists(): cache_file.unlink()
+    pages_file = fs_get_ROMs_pages_cache_path(roms_dir, roms_base_noext)
+    if pages_file.exists(): pages_file.unlink()
+
+#
+# Returns a key that changes when file_path is written. None if the file does not exist.
+#
+def fs_get_file_stat_key(file_path):
+    try:
+        st = os.stat(file_path.getPath())
+    except OSError:
+        return None
+
+    return (st.st_ino, st.st_size, st.st_mtime)
+
+def fs_write_ROMs_render_cache(roms_dir, roms_base_noext, key, rows):
+    cache_file = fs_get_ROMs_render_cache_path(roms_dir, roms_base_noext)
+    log_verb('fs_write_ROMs_render_cache() File {0}'.format(cache_file.getOriginalPath()))
+    header = {'version' : ROMS_RENDER_CACHE_VERSION, 'key' : key}
+    try:
+        fs_write_file_atomic(cache_file.getPath(), marshal.dumps(header) + marshal.dumps(rows))
+    except (IOError, OSError, ValueError) as e:
+        log_error('fs_write_ROMs_render_cache() Exception writing "{0}"'.format(cache_file.getPath()))
+        log_error('fs_write_ROMs_render_cache() {0}'.format(unicode(e)))
+
+#
+# Returns the list of cached rows or None if there is no cache or the cache is outdated.
+#
+def fs_load_ROMs_render_cache(roms_dir, roms_base_noext, key):
+    cache_file = fs_get_ROMs_render_cache_path(roms_dir, roms_base_noext)
+    if not cache_file.exists(): return None
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(cache_file.getPath(), 'rb') as file:
+            header = marshal.load(file)
+            if header['version'] != ROMS_RENDER_CACHE_VERSION or header['key'] != key:
+                log_verb('fs_load_ROMs_render_cache() Cache outdated')
+                return None
+            log_verb('fs_load_ROMs_render_cache() File {0}'.format(cache_file.getOriginalPath()))
+            return marshal.load(file)
+    except (IOError, OSError, EOFError, ValueError, TypeError, KeyError) as e:
+        log_error('fs_load_ROMs_render_cache() Exception loading "{0}"'.format(cache_file.getPath()))
+        log_error('fs_load_ROMs_render_cache() {0}'.format(unicode(e)))
+        return None
+    finally:
+        if gc_enabled: gc.enable()
+
+# -------------------------------------------------------------------------------------------------
+# ROMs pages cache
+# -------------------------------------------------------------------------------------------------
+# When ROMs are displayed in pages the rows are stored split in pages. Every page is marshaled
+# separately and the header has the offset and size of every page, so displaying a page reads and
+# decodes the header and that page only. The header also has the A-Z index of the rows.
+#
+# The rows must be sorted by ROM name. The key is the same as in the render cache.
+#
+# Cache file format: marshal header dictionary followed by the marshaled pages.
+# header = {'version' : ROMS_PAGES_CACHE_VERSION, 'key' : key, 'page_size' : int,
+#           'num_rows' : int, 'letters' : [[letter, first_row], ...], 'pages' : [[offset, size], ...]}
+# Page offsets are relative to the end of the header.
+#
+ROMS_PAGES_CACHE_VERSION = 1
+
+def fs_get_ROMs_pages_cache_path(roms_dir, roms_base_noext):
+    return roms_dir.join(roms_base_noext + '_pages.dat')
+
+#
+# Returns the A-Z index of a list of rows sorted by name. Names not starting with a letter are
+# indexed under '#'. For every letter the index has the position of the first row.
+#
+def fs_get_ROMs_letters(rows):
+    letters = []
+    letters_set = set()
+    for i, row in enumerate(rows):
+        letter = row[2][:1].upper()
+        if not 'A' <= letter <= 'Z': letter = '#'
+        if letter in letters_set: continue
+        letters_set.add(letter)
+        letters.append([letter, i])
+
+    return letters
+
+def fs_write_ROMs_pages_cache(roms_dir, roms_base_noext, key, rows, page_size):
+    cache_file = fs_get_ROMs_pages_cache_path(roms_dir, roms_base_noext)
+    log_verb('fs_write_ROMs_pages_cache() File {0}'.format(cache_file.getOriginalPath()))
+    pages_data = []
+    pages = []
+    offset = 0
+    for i in range(0, len(rows), page_size):
+        page_data = marshal.dumps(rows[i:i + page_size])
+        pages_data.append(page_data)
+        pages.append([offset, len(page_data)])
+        offset += len(page_data)
+    header = {'version' : ROMS_PAGES_CACHE_VERSION, 'key' : key, 'page_size' : page_size,
+              'num_rows' : len(rows), 'letters' : fs_get_ROMs_letters(rows), 'pages' : pages}
+    try:
+        fs_write_file_atomic(cache_file.getPath(), marshal.dumps(header) + b''.join(pages_data))
+    except (IOError, OSError, ValueError) as e:
+        log_error('fs_write_ROMs_pages_cache() Exception writing "{0}"'.format(cache_file.getPath()))
+        log_error('fs_write_ROMs_pages_cache() {0}'.format(unicode(e)))
+
+#
+# Returns the tuple (num_rows, letters, page_rows) or None if there is no cache or the cache is
+# outdated. page_rows is an empty list if page does not exist. If page is None only the header
+# is read and page_rows is None.
+#
+def fs_load_ROMs_pages_cache(roms_dir, roms_base_noext, key, page_size, page):
+    cache_file = fs_get_ROMs_pages_cache_path(roms_dir, roms_base_noext)
+    if not cache_file.exists(): return None
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(cache_file.getPath(), 'rb') as file:
+            header = marshal.load(file)
+            if header['version'] != ROMS_PAGES_CACHE_VERSION or header['key'] != key or \
+               header['page_size'] != page_size:
+                log_verb('fs_load_ROMs_pages_cache() Cache outdated')
+                return None
+            log_verb('fs_load_ROMs_pages_cache() File {0} page {1}'.format(cache_file.getOriginalPath(), page))
+            if page is None: return (header['num_rows'], header['letters'], None)
+            if page < 0 or page >= len(header['pages']): return (header['num_rows'], header['letters'], [])
+            (offset, size) = header['pages'][page]
+            file.seek(file.tell() + offset)
+            page_rows = marshal.loads(file.read(size))
+
+            return (header['num_rows'], header['letters'], page_rows)
+    except (IOError, OSError, EOFError, ValueError, TypeError, KeyError) as e:
+        log_error('fs_load_ROMs_pages_cache() Exception loading "{0}"'.format(cache_file.getPath()))
+        log_error('fs_load_ROMs_pages_cache() {0}'.format(unicode(e)))
+        return None
+    finally:
+        if gc_enabled: gc.enable()
+
+# -------------------------------------------------------------------------------------------------
+# ROM scanner manifest
+# -------------------------------------------------------------------------------------------------
+# The manifest stores the state of the ROM path after the last completed scan. Directories whose
+# mtime and inode have not changed are not listed again in a rescan, which makes rescanning
+# launchers in network shares much faster. The manifest is stored next to the ROMs JSON.
+#
+# manifest = {
+#   'version'   : AEL_STORAGE_FORMAT,
+#   'rompath'   : launcher['rompath'],
+#   'romext'    : launcher['romext'],
+#   'recursive' : bool,
+#   'ignore_bios' : bool,
+#   'dirs'      : { dir_path : { 'mtime'   : float,
+#                                'inode'   : int,
+#                                'subdirs' : [ dir_name, ... ],
+#                                'files'   : { file_name : [size, mtime, inode], ... } } }
+# }
+#
+# Only files with the launcher ROM extensions are stored in 'files'. BIOS files skipped by the
+# scanner are stored too, so the manifest is not valid if the scan_ignore_bios setting changes.
+#
+def fs_get_ROMs_manifest_file_path(roms_dir, roms_base_noext):
+    manifest_file_path = roms_dir.join(roms_base_noext + '_manifest.json')
+
+    return manifest_file_path
+
+def fs_unlink_ROMs_manifest(roms_dir, roms_base_noext):
+    manifest_file = fs_get_ROMs_manifest_file_path(roms_dir, roms_base_noext)
+    if manifest_file.exists():
+        log_info('Deleting ROMs manifest "{0}"'.format(manifest_file.getOriginalPath()))
+        manifest_file.unlink()
+
+def fs_new_ROMs_manifest(launcher, recursive, ignore_bios):
+    manifest = {
+        'version'     : AEL_STORAGE_FORMAT,
+        'rompath'     : launcher['rompath'],
+        'romext'      : launcher['romext'],
+        'recursive'   : recursive,
+        'ignore_bios' : ignore_bios,
+        'dirs'        : {}
+    }
+
+    return manifest
+
+#
+# Returns True if the manifest can be used to rescan the launcher ROM path. A manifest created with
+# a different ROM path, ROM extensions, recursive or ignore BIOS setting cannot be used.
+#
+def fs_check_ROMs_manifest(manifest, launcher, recursive, ignore_bios):
+    if not manifest: return False
+    if manifest['version'] != AEL_STORAGE_FORMAT: return False
+    if manifest['rompath'] != launcher['rompath']: return False
+    if manifest['romext'] != launcher['romext']: return False
+    if manifest['recursive'] != recursive: return False
+    if manifest.get('ignore_bios', None) != ignore_bios: return False
+
+    return True
+
+def fs_write_ROMs_manifest(roms_dir, roms_base_noext, manifest):
+    manifest_file = fs_get_ROMs_manifest_file_path(roms_dir, roms_base_noext)
+    log_verb('fs_write_ROMs_manifest() File {0}'.format(manifest_file.getOriginalPath()))
+    try:
+        json_data = json.dumps(manifest, ensure_ascii = False, separators = JSON_separators)
+        fs_write_file_atomic(manifest_file.getPath(), unicode(json_data).encode('utf-8'))
+    except OSError:
+        log_error('fs_write_ROMs_manifest() (OSError) Cannot write file "{0}"'.format(manifest_file.getPath()))
+    except IOError:
+        log_error('fs_write_ROMs_manifest() (IOError) Cannot write file "{0}"'.format(manifest_file.getPath()))
+
+#
+# Returns an empty dictionary if manifest does not exist or cannot be read. In that case the
+# ROM scanner does a full scan.
+#
+def fs_load_ROMs_manifest(roms_dir, roms_base_noext):
+    manifest_file = fs_get_ROMs_manifest_file_path(roms_dir, roms_base_noext)
+    if not manifest_file.exists(): return {}
+
+    log_verb('fs_load_ROMs_manifest() File {0}'.format(manifest_file.getOriginalPath()))
+    with open(manifest_file.getPath()) as file:
+        try:
+            manifest = json.load(file)
+        except ValueError:
+            log_error('fs_load_ROMs_manifest() ValueError exception in json.load() function')
+            log_error('fs_load_ROMs_manifest() File {0}'.format(manifest_file.getPath()))
+            return {}
+
+    return manifest
+
+#
+# Walks the ROM path and fills the directories of manifest, which must be a new manifest created
+# with fs_new_ROMs_manifest(). Directories in old_manifest with unchanged mtime and inode are not
+# listed again and their information is copied from the old manifest. Only files with the launcher
+# ROM extensions are stored in the manifest.
+# This is a generator that yields a FileName object for every file not in old_manifest, or whose
+# size, mtime or inode changed, as soon as it is found, so the ROM scanner can process files while
+# the walk is in progress. Files in directories not listed again are not checked.
+#
+# rompath_FN   -> FileName object
+# old_manifest -> manifest dictionary or {} to do a full scan
+#
+def fs_walk_ROMs_manifest(rompath_FN, launcher, recursive, old_manifest, manifest):
+    old_dirs  = old_manifest['dirs'] if old_manifest else {}
+    new_dirs  = manifest['dirs']
+    ext_set   = set(['.' + ext for ext in launcher['romext'].split('|')])
+    num_listed_dirs = 0
+    dir_stack = [rompath_FN.getPath()]
+    while dir_stack:
+        dir_path = dir_stack.pop()
+        try:
+            dir_stat = os.stat(dir_path)
+        except OSError:
+            log_warning('fs_walk_ROMs_manifest() Cannot stat dir "{0}"'.format(dir_path))
+            continue
+        old_dir = old_dirs.get(dir_path, None)
+        if old_dir and old_dir['mtime'] == dir_stat.st_mtime and old_dir['inode'] == dir_stat.st_ino:
+            new_dirs[dir_path] = old_dir
+        else:
+            num_listed_dirs += 1
+            old_files = old_dir['files'] if old_dir else {}
+            dir_dic = {'mtime' : dir_stat.st_mtime, 'inode' : dir_stat.st_ino, 'subdirs' : [], 'files' : {}}
+            new_dirs[dir_path] = dir_dic
+            for (entry_name, entry_path, entry_is_dir) in sorted(misc_iter_dir(dir_path)):
+                if entry_is_dir:
+                    dir_dic['subdirs'].append(entry_name)
+                    continue
+                if os.path.splitext(entry_name)[1] not in ext_set: continue
+                try:
+                    entry_stat = os.stat(entry_path)
+                except OSError:
+                    continue
+                file_info = [entry_stat.st_size, entry_stat.st_mtime, entry_stat.st_ino]
+                dir_dic['files'][entry_name] = file_info
+                if old_files.get(entry_name, None) != file_info: yield FileName(entry_path)
+        if recursive:
+            for subdir_name in reversed(new_dirs[dir_path]['subdirs']):
+                dir_stack.append(os.path.join(dir_path, subdir_name))
+    log_verb('fs_walk_ROMs_manifest() Dirs {0} / Listed {1}'.format(len(new_dirs), num_listed_dirs))
+
+#
+# Returns a set with the full paths of all files in the manifest.
+#
+def fs_get_ROMs_manifest_file_set(manifest):
+    file_set = set()
+    if not manifest: return file_set
+    for dir_path, dir_dic in manifest['dirs'].iteritems():
+        for file_name in dir_dic['files']:
+            file_set.add(os.path.join(dir_path, file_name))
+
+    return file_set
+
 # -------------------------------------------------------------------------------------------------
 # Favourite ROMs
 # -------------------------------------------------------------------------------------------------
@@ -754,6 +1678,7 @@ def fs_load_ROMs_JSON(roms_dir, roms_base_noext):
 # Save Favourites JSON file
 #
 def fs_write_Favourites_JSON(roms_json_file, roms):
+    if fs_write_behind(roms_json_file.getPath(), fs_write_Favourites_JSON, roms_json_file, roms): return
     log_info('fs_write_Favourites_JSON() File {0}'.format(roms_json_file.getOriginalPath()))
 
     # --- Create JSON data structure, including version number ---
@@ -767,11 +1692,9 @@ def fs_write_Favourites_JSON(roms_json_file, roms):
 
     # --- Write JSON file ---
     try:
-        with io.open(roms_json_file.getPath(), 'w', encoding='utf-8') as file:
-            json_data = json.dumps(raw_data, ensure_ascii = False, sort_keys = True, 
-                                   indent = JSON_indent, separators = JSON_separators)
-            file.write(unicode(json_data))
-            file.close()
+        json_data = json.dumps(raw_data, ensure_ascii = False, sort_keys = True, 
+                               indent = JSON_indent, separators = JSON_separators)
+        fs_write_file_atomic(roms_json_file.getPath(), unicode(json_data).encode('utf-8'))
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(roms_json_file.getPath()))
     except IOError:
@@ -781,6 +1704,9 @@ def fs_write_Favourites_JSON(roms_json_file, roms):
 # Loads an JSON file containing the Favourite ROMs
 #
 def fs_load_Favourites_JSON(roms_json_file):
+    roms = service_load_Favourites(roms_json_file.getPath())
+    if roms is not None: return roms
+
     # --- If file does not exist return empty dictionary ---
     log_verb('fs_load_Favourites_JSON() File {0}'.format(roms_json_file.getOriginalPath()))
     if not roms_json_file.exists(): 
@@ -808,6 +1734,8 @@ def fs_load_Favourites_JSON(roms_json_file):
 # ROM Collections
 # -------------------------------------------------------------------------------------------------
 def fs_write_Collection_index_XML(collections_xml_file, collections):
+    if fs_write_behind(collections_xml_file.getPath(), fs_write_Collection_index_XML,
+                       collections_xml_file, collections): return
     log_info('fs_write_Collection_index_XML() File {0}'.format(collections_xml_file.getOriginalPath()))
     try:
         str_list = []
@@ -842,9 +1770,7 @@ def fs_write_Collection_index_XML(collections_xml_file, collections):
             str_list.append('</Collection>\n')
         str_list.append('</advanced_emulator_launcher_Collection_index>\n')
         full_string = ''.join(str_list).encode('utf-8')
-        file_obj = open(collections_xml_file.getPath(), 'w')
-        file_obj.write(full_string)
-        file_obj.close()
+        fs_write_file_atomic(collections_xml_file.getPath(), full_string)
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(collections_xml_file.getPath()))
     except IOError:
@@ -889,6 +1815,7 @@ def fs_load_Collection_index_XML(collections_xml_file):
     return (collections, update_timestamp)
 
 def fs_write_Collection_ROMs_JSON(roms_json_file, roms):
+    if fs_write_behind(roms_json_file.getPath(), fs_write_Collection_ROMs_JSON, roms_json_file, roms): return
     log_verb('fs_write_Collection_ROMs_JSON() File {0}'.format(roms_json_file.getOriginalPath()))
 
     control_dic = {
@@ -900,11 +1827,9 @@ def fs_write_Collection_ROMs_JSON(roms_json_file, roms):
     raw_data.append(roms)
 
     try:
-        with io.open(roms_json_file.getPath(), 'w', encoding = 'utf-8') as file:
-            json_data = json.dumps(raw_data, ensure_ascii = False, sort_keys = True, 
-                                   indent = JSON_indent, separators = JSON_separators)
-            file.write(unicode(json_data))
-            file.close()
+        json_data = json.dumps(raw_data, ensure_ascii = False, sort_keys = True, 
+                               indent = JSON_indent, separators = JSON_separators)
+        fs_write_file_atomic(roms_json_file.getPath(), unicode(json_data).encode('utf-8'))
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(roms_json_file.getPath()))
     except IOError:
@@ -969,11 +1894,9 @@ def fs_export_ROM_collection(output_filename, collection, collection_rom_list):
 
     # >> Produce nicely formatted JSON when exporting
     try:
-        with io.open(output_filename.getPath(), 'w', encoding = 'utf-8') as file:
-            json_data = json.dumps(raw_data, ensure_ascii = False, sort_keys = True, 
-                                   indent = 2, separators = (', ', ' : '))
-            file.write(unicode(json_data))
-            file.close()
+        json_data = json.dumps(raw_data, ensure_ascii = False, sort_keys = True, 
+                               indent = 2, separators = (', ', ' : '))
+        fs_write_file_atomic(output_filename.getPath(), unicode(json_data).encode('utf-8'))
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(output_filename.getPath()))
     except IOError:
@@ -1055,11 +1978,9 @@ def fs_export_ROM_collection_assets(output_FileName, collection, collection_rom_
 
     # >> Produce nicely formatted JSON when exporting
     try:
-        with io.open(output_FileName.getPath(), 'w', encoding = 'utf-8') as file:
-            json_data = json.dumps(raw_data, ensure_ascii = False, sort_keys = True,
-                                   indent = 2, separators = (', ', ' : '))
-            file.write(unicode(json_data))
-            file.close()
+        json_data = json.dumps(raw_data, ensure_ascii = False, sort_keys = True,
+                               indent = 2, separators = (', ', ' : '))
+        fs_write_file_atomic(output_FileName.getPath(), unicode(json_data).encode('utf-8'))
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(output_FileName.getPath()))
     except IOError:
@@ -1145,7 +2066,15 @@ def fs_collection_ROM_index_by_romID(romID, collection_rom_list):
 # -------------------------------------------------------------------------------------------------
 # Virtual Categories
 # -------------------------------------------------------------------------------------------------
-def fs_write_VCategory_XML(roms_xml_file, roms):
+# launchers_info is a dictionary with key the launcher ID and value a dictionary with the launcher
+# state when the virtual category was updated, {'timestamp_launcher' : str, 'category_name' : str}.
+# The 'launchers' field of the virtual launchers is a comma separated list of the IDs of the
+# launchers that have ROMs in the virtual launcher.
+#
+def fs_write_VCategory_XML(roms_xml_file, roms, launchers_info = None):
+    if launchers_info is None: launchers_info = {}
+    if fs_write_behind(roms_xml_file.getPath(), fs_write_VCategory_XML,
+                       roms_xml_file, roms, launchers_info): return
     log_info('fs_write_VCategory_XML() Saving XML file {0}'.format(roms_xml_file.getOriginalPath()))
     try:
         str_list = []
@@ -1158,6 +2087,15 @@ def fs_write_VCategory_XML(roms_xml_file, roms):
         str_list.append(XML_text('update_timestamp', unicode(_t)))
         str_list.append('</control>\n')
 
+        # --- Launchers state ---
+        for launcher_id in sorted(launchers_info):
+            launcher_info = launchers_info[launcher_id]
+            str_list.append('<Launcher>\n')
+            str_list.append(XML_text('id', launcher_id))
+            str_list.append(XML_text('timestamp_launcher', launcher_info['timestamp_launcher']))
+            str_list.append(XML_text('category_name', launcher_info['category_name']))
+            str_list.append('</Launcher>\n')
+
         # --- Virtual Launchers ---
         for romID in sorted(roms, key = lambda x : roms[x]['name']):
             rom = roms[romID]
@@ -1166,12 +2104,11 @@ def fs_write_VCategory_XML(roms_xml_file, roms):
             str_list.append(XML_text('name', rom['name']))
             str_list.append(XML_text('rom_count', rom['rom_count']))
             str_list.append(XML_text('roms_base_noext', rom['roms_base_noext']))
+            str_list.append(XML_text('launchers', rom['launchers'] if 'launchers' in rom else ''))
             str_list.append('</VLauncher>\n')
         str_list.append('</advanced_emulator_launcher_Virtual_Category_index>\n')
         full_string = ''.join(str_list).encode('utf-8')
-        file_obj = open(roms_xml_file.getPath(), 'w')
-        file_obj.write(full_string)
-        file_obj.close()
+        fs_write_file_atomic(roms_xml_file.getPath(), full_string)
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(roms_xml_file.getPath()))
     except IOError:
@@ -1182,12 +2119,22 @@ def fs_write_VCategory_XML(roms_xml_file, roms):
 # It is basically the same as ROMs, but with some more fields to store launching application data.
 #
 def fs_load_VCategory_XML(roms_xml_file):
+    (update_timestamp, VLaunchers, launchers_info) = fs_load_VCategory_index(roms_xml_file)
+
+    return (update_timestamp, VLaunchers)
+
+#
+# Same as fs_load_VCategory_XML() but also returns the launchers state dictionary.
+# Indices written by older versions have no launchers state, launchers_info is empty.
+#
+def fs_load_VCategory_index(roms_xml_file):
     __debug_xml_parser = 0
     update_timestamp = 0.0
     VLaunchers = {}
+    launchers_info = {}
 
     # --- If file does not exist return empty dictionary ---
-    if not roms_xml_file.exists(): return (update_timestamp, VLaunchers)
+    if not roms_xml_file.exists(): return (update_timestamp, VLaunchers, launchers_info)
 
     # --- Parse using cElementTree ---
     log_verb('fs_load_VCategory_XML() Loading XML file {0}'.format(roms_xml_file.getOriginalPath()))
@@ -1196,7 +2143,7 @@ def fs_load_VCategory_XML(roms_xml_file):
     except ET.ParseError, e:
         log_error('(ParseError) Exception parsing XML categories.xml')
         log_error('(ParseError) {0}'.format(str(e)))
-        return roms
+        return (update_timestamp, VLaunchers, launchers_info)
     xml_root = xml_tree.getroot()
     for root_element in xml_root:
         if __debug_xml_parser: log_debug('Root child {0}'.format(root_element.tag))
@@ -1207,9 +2154,19 @@ def fs_load_VCategory_XML(roms_xml_file):
                     # >> Convert Unicode to float
                     update_timestamp = float(control_child.text)
 
+        elif root_element.tag == 'Launcher':
+            launcher_info = {'timestamp_launcher' : '', 'category_name' : ''}
+            launcher_id = ''
+            for launcher_child in root_element:
+                xml_text = launcher_child.text if launcher_child.text is not None else ''
+                xml_text = text_unescape_XML(xml_text)
+                if launcher_child.tag == 'id': launcher_id = xml_text
+                else:                          launcher_info[launcher_child.tag] = xml_text
+            launchers_info[launcher_id] = launcher_info
+
         elif root_element.tag == 'VLauncher':
             # Default values
-            VLauncher = {'id' : '', 'name' : '', 'rom_count' : '', 'roms_base_noext' : ''}
+            VLauncher = {'id' : '', 'name' : '', 'rom_count' : '', 'roms_base_noext' : '', 'launchers' : ''}
             for rom_child in root_element:
                 # By default read strings
                 xml_text = rom_child.text if rom_child.text is not None else ''
@@ -1219,7 +2176,7 @@ def fs_load_VCategory_XML(roms_xml_file):
                 VLauncher[xml_tag] = xml_text
             VLaunchers[VLauncher['id']] = VLauncher
 
-    return (update_timestamp, VLaunchers)
+    return (update_timestamp, VLaunchers, launchers_info)
 
 #
 # Write virtual category ROMs
@@ -1228,11 +2185,9 @@ def fs_write_VCategory_ROMs_JSON(roms_dir, roms_base_noext, roms):
     roms_json_file = roms_dir.join(roms_base_noext + '.json')
     log_verb('fs_write_VCategory_ROMs_JSON() Saving JSON file {0}'.format(roms_json_file.getOriginalPath()))
     try:
-        with io.open(roms_json_file.getPath(), 'w', encoding = 'utf-8') as file:
-            json_data = json.dumps(roms, ensure_ascii = False, sort_keys = True, 
-                                   indent = JSON_indent, separators = JSON_separators)
-            file.write(unicode(json_data))
-            file.close()
+        json_data = json.dumps(roms, ensure_ascii = False, sort_keys = True, 
+                               indent = JSON_indent, separators = JSON_separators)
+        fs_write_file_atomic(roms_json_file.getPath(), unicode(json_data).encode('utf-8'))
     except OSError:
         kodi_notify_warn('(OSError) Cannot write {0} file'.format(roms_json_file.getPath()))
     except IOError:
@@ -1390,7 +2345,7 @@ def fs_generate_parent_ROMs(roms, roms_pclone_index):
             # >> Clean parent ROM name tags from ROM Name
             p_roms[rom_id] = dict(roms[rom_id])
             p_roms[rom_id]['num_clones_str'] = unicode(len(roms_pclone_index[rom_id]))
-            p_roms[rom_id]['m_name'] = text_format_ROM_title(p_roms[rom_id]['m_name'], True)
+            p_roms[rom_id]['m_name'] = rom_name_format_title(p_roms[rom_id]['m_name'], True)
 
     return p_roms
 
@@ -1413,7 +2368,7 @@ def fs_load_GameInfo_XML(xml_file):
     except ET.ParseError, e:
         log_error('(ParseError) Exception parsing XML categories.xml')
         log_error('(ParseError) {0}'.format(str(e)))
-        return roms
+        return games
     xml_root = xml_tree.getroot()
     for game_element in xml_root:
         if __debug_xml_parser:
@@ -1444,6 +2399,111 @@ def fs_load_GameInfo_XML(xml_file):
 
     return games
 
+# -------------------------------------------------------------------------------------------------
+# Offline scraper pre-parsed index
+# -------------------------------------------------------------------------------------------------
+# Parsing the GameDBInfo XML files with ElementTree takes seconds for the big databases.
+# The parsed games dictionary is stored with marshal in cache_dir, which loads much faster.
+# The index file has two marshal objects: the header and the games dictionary. The header
+# is checked before loading the games dictionary.
+#
+# header = {
+#   'version'  : int,     Index format version. Index is rebuilt if different from current.
+#   'xml_size' : int,     Size of the XML file when the index was built.
+#   'xml_mtime': float,   Modification time of the XML file when the index was built.
+#   'xml_md5'  : str,     MD5 of the XML file. Only checked if size or mtime changed.
+# }
+#
+# If only the mtime changed and the MD5 matches, the header is rewritten with the new mtime so
+# the MD5 is not computed again every time the index is loaded.
+#
+# NOTE marshal format depends on the Python version. If the index cannot be loaded it is rebuilt.
+GAMEINFO_INDEX_VERSION = 1
+
+def fs_get_GameInfo_index_path(xml_file, cache_dir):
+    xml_base_noext = os.path.splitext(os.path.basename(xml_file))[0]
+
+    return os.path.join(cache_dir, xml_base_noext + '.idx')
+
+def fs_get_file_md5(file_path):
+    md5 = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''): md5.update(chunk)
+
+    return md5.hexdigest()
+
+def fs_write_GameInfo_index(index_file, header, games):
+    log_verb('fs_write_GameInfo_index() Writing "{0}"'.format(index_file))
+    try:
+        index_dir = os.path.dirname(index_file)
+        if not os.path.isdir(index_dir): os.makedirs(index_dir)
+        fs_write_file_atomic(index_file, marshal.dumps(header) + marshal.dumps(games))
+    except (IOError, OSError) as e:
+        log_error('fs_write_GameInfo_index() Exception writing index "{0}"'.format(index_file))
+        log_error('fs_write_GameInfo_index() {0}'.format(str(e)))
+
+#
+# Parses the XML and writes the index. Returns the games dictionary.
+#
+def fs_build_GameInfo_index(xml_file, index_file):
+    games = fs_load_GameInfo_XML(xml_file)
+    if not games: return games
+    st = os.stat(xml_file)
+    header = {'version'   : GAMEINFO_INDEX_VERSION,
+              'xml_size'  : st.st_size,
+              'xml_mtime' : st.st_mtime,
+              'xml_md5'   : fs_get_file_md5(xml_file)}
+    fs_write_GameInfo_index(index_file, header, games)
+
+    return games
+
+#
+# Returns the games dictionary or None if the index does not exist or is outdated.
+#
+def fs_load_GameInfo_index(xml_file, index_file):
+    if not os.path.isfile(index_file): return None
+    mtime_changed = False
+    try:
+        with open(index_file, 'rb') as f:
+            header = marshal.load(f)
+            if header['version'] != GAMEINFO_INDEX_VERSION:
+                log_verb('fs_load_GameInfo_index() Index version changed')
+                return None
+            st = os.stat(xml_file)
+            if header['xml_size'] != st.st_size or header['xml_mtime'] != st.st_mtime:
+                # >> mtime changes when the addon is reinstalled/updated. Check file contents.
+                if header['xml_size'] != st.st_size or header['xml_md5'] != fs_get_file_md5(xml_file):
+                    log_verb('fs_load_GameInfo_index() XML file changed')
+                    return None
+                mtime_changed = True
+            games = marshal.load(f)
+    except (IOError, OSError, EOFError, ValueError, TypeError, KeyError) as e:
+        log_error('fs_load_GameInfo_index() Exception loading index "{0}"'.format(index_file))
+        log_error('fs_load_GameInfo_index() {0}'.format(str(e)))
+        return None
+    if mtime_changed:
+        log_verb('fs_load_GameInfo_index() XML mtime changed but MD5 matches. Updating header')
+        header['xml_mtime'] = st.st_mtime
+        fs_write_GameInfo_index(index_file, header, games)
+
+    return games
+
+#
+# Loads offline scraper information using the index in cache_dir. The index is built if
+# it does not exist or the XML file has changed.
+#
+def fs_load_GameInfo_XML_cached(xml_file, cache_dir):
+    if not os.path.isfile(xml_file):
+        log_error("Cannot load file '{0}'".format(xml_file))
+        return {}
+    index_file = fs_get_GameInfo_index_path(xml_file, cache_dir)
+    games = fs_load_GameInfo_index(xml_file, index_file)
+    if games is not None:
+        log_verb('fs_load_GameInfo_XML_cached() Loaded index "{0}"'.format(index_file))
+        return games
+
+    return fs_build_GameInfo_index(xml_file, index_file)
+
 # -------------------------------------------------------------------------------------------------
 # Fixes launchers.xml invalid XML characters, if present.
 # Both argument filenames must be Unicode strings.
@@ -18,21 +18,21 @@
 # --- Python standard library ---
 from __future__ import unicode_literals
 import sys, os, shutil, fnmatch, string, time, traceback
-import re, urllib, urllib2, urlparse, socket, exceptions, hashlib
-import subprocess
+import re, urlparse, socket, exceptions, hashlib
 from collections import OrderedDict
 
 # --- Kodi stuff ---
 import xbmc, xbmcgui, xbmcplugin, xbmcaddon
 
 # --- Modules/packages in this plugin ---
-import subprocess_hack
+# >> Scrapers (scrap*.py), net_IO.py and subprocess_hack.py are imported by the commands that use
+# >> them. See _misc_import_scrapers().
 from disk_IO import *
-from net_IO import *
 from utils import *
 from utils_kodi import *
-from scrap import *
 from assets import *
+from rom_name import *
+from service_IO import *
 
 # --- Addon object (used to access settings) ---
 __addon_obj__     = xbmcaddon.Addon()
@@ -85,6 +85,17 @@ VIRTUAL_CAT_CATEGORY_DIR = PLUGIN_DATA_DIR.join('db_category')
 ROMS_DIR                 = PLUGIN_DATA_DIR.join('db_ROMs')
 COLLECTIONS_DIR          = PLUGIN_DATA_DIR.join('db_Collections')
 REPORTS_DIR              = PLUGIN_DATA_DIR.join('reports')
+SCRAPER_CACHE_DIR        = PLUGIN_DATA_DIR.join('scraper_cache')
+GAMEDBINFO_INDEX_DIR     = PLUGIN_DATA_DIR.join('db_GameDBInfo')
+
+# >> Addon data directories. They are created the first time the plugin runs after installing or
+#    upgrading the addon. The marker file stores the addon version that created them.
+ADDON_DATA_DIR_LIST = [PLUGIN_DATA_DIR, DEFAULT_CAT_ASSET_DIR, DEFAULT_COL_ASSET_DIR, DEFAULT_LAUN_ASSET_DIR,
+                       DEFAULT_FAV_ASSET_DIR, VIRTUAL_CAT_TITLE_DIR, VIRTUAL_CAT_YEARS_DIR, VIRTUAL_CAT_GENRE_DIR,
+                       VIRTUAL_CAT_STUDIO_DIR, VIRTUAL_CAT_NPLAYERS_DIR, VIRTUAL_CAT_ESRB_DIR,
+                       VIRTUAL_CAT_RATING_DIR, VIRTUAL_CAT_CATEGORY_DIR, ROMS_DIR, COLLECTIONS_DIR,
+                       REPORTS_DIR, GAMEDBINFO_INDEX_DIR]
+ADDON_DIRS_MARKER_FILE_PATH = PLUGIN_DATA_DIR.join('dirs_created.txt')
 
 # --- Misc "constants" ---
 KIND_CATEGORY         = 1
@@ -113,6 +124,23 @@ VLAUNCHER_FAVOURITES_ID  = 'vlauncher_favourites'
 VLAUNCHER_RECENT_ID      = 'vcat_recent'
 VLAUNCHER_MOST_PLAYED_ID = 'vcat_most_played'
 
+# >> Virtual categories with a hashed database
+VCATEGORY_DB_ID_LIST = [VCATEGORY_TITLE_ID, VCATEGORY_YEARS_ID, VCATEGORY_GENRE_ID, VCATEGORY_STUDIO_ID,
+                        VCATEGORY_NPLAYERS_ID, VCATEGORY_ESRB_ID, VCATEGORY_RATING_ID, VCATEGORY_CATEGORY_ID]
+
+# >> ROM fields used by _gui_render_rom_row(). The columnar ROMs storage only decodes these fields
+#    when rendering a launcher.
+ROM_RENDER_FIELDS = ['id', 'm_name', 'm_year', 'm_genre', 'm_studio', 'm_nplayers', 'm_esrb', 'm_rating',
+                     'm_plot', 'disks', 'finished', 'nointro_status',
+                     's_title', 's_snap', 's_fanart', 's_banner', 's_clearlogo', 's_boxfront', 's_boxback',
+                     's_cartridge', 's_flyer', 's_map', 's_trailer']
+
+# >> Maximum number of rows added to Kodi with a single xbmcplugin.addDirectoryItems() call.
+RENDER_CHUNK_SIZE = 5000
+
+# --- Basename of the render/pages cache of all ROMs in all launchers (skin command SHOW_ALL_ROMS) ---
+ALL_ROMS_BASE_NOEXT = 'AEL_all_ROMs'
+
 # --- Content type to be used by skins ---
 AEL_CONTENT_WINDOW_ID       = 10001
 AEL_CONTENT_LABEL           = 'AEL_Content'
@@ -145,6 +173,108 @@ AEL_PCLONE_STAT_VALUE_PARENT         = 'PClone_Parent'
 AEL_PCLONE_STAT_VALUE_CLONE          = 'PClone_Clone'
 AEL_PCLONE_STAT_VALUE_NONE           = 'PClone_None'
 
+# --- Addon settings ---
+# >> Settings are read from Kodi the first time they are used and then cached. Every getSetting()
+#    call goes through Kodi and most commands only use a few settings.
+SETTING_BOOL   = 1
+SETTING_INT    = 2
+SETTING_SLIDER = 3
+SETTING_PATH   = 4
+AEL_SETTINGS_TYPE = {
+    # --- ROM Scanner settings ---
+    'scan_recursive'                 : SETTING_BOOL,
+    'scan_ignore_bios'               : SETTING_BOOL,
+    'scan_incremental'               : SETTING_BOOL,
+    'scan_update_vcategories'        : SETTING_BOOL,
+    'scan_metadata_policy'           : SETTING_INT,
+    'scan_asset_policy'              : SETTING_INT,
+    'scan_ignore_scrap_title'        : SETTING_BOOL,
+    'scan_clean_tags'                : SETTING_BOOL,
+
+    # --- ROM scraping ---
+    'metadata_scraper'               : SETTING_INT,
+    'asset_scraper'                  : SETTING_INT,
+
+    'metadata_scraper_mode'          : SETTING_INT,
+    'asset_scraper_mode'             : SETTING_INT,
+    'scraper_threads'                : SETTING_SLIDER,
+    'scraper_connections_per_host'   : SETTING_SLIDER,
+    'scraper_cache_ttl'              : SETTING_SLIDER,
+    'scraper_cache_size'             : SETTING_SLIDER,
+    'scraper_search_cache_size'      : SETTING_SLIDER,
+
+    # --- Scrapers ---
+    'scraper_region'                 : SETTING_INT,
+    'scraper_thumb_size'             : SETTING_INT,
+    'scraper_fanart_size'            : SETTING_INT,
+    'scraper_image_type'             : SETTING_INT,
+    'scraper_fanart_order'           : SETTING_INT,
+
+    # --- Display ---
+    'display_launcher_notify'        : SETTING_BOOL,
+    'display_hide_finished'          : SETTING_BOOL,
+    'display_roms_page_size'         : SETTING_SLIDER,
+    'display_rom_in_fav'             : SETTING_BOOL,
+    'display_nointro_stat'           : SETTING_BOOL,
+    'display_fav_status'             : SETTING_BOOL,
+
+    'display_hide_favs'              : SETTING_BOOL,
+    'display_hide_collections'       : SETTING_BOOL,
+    'display_hide_vlaunchers'        : SETTING_BOOL,
+    'display_hide_recent'            : SETTING_BOOL,
+    'display_hide_mostplayed'        : SETTING_BOOL,
+
+    'display_hide_title'             : SETTING_BOOL,
+    'display_hide_year'              : SETTING_BOOL,
+    'display_hide_genre'             : SETTING_BOOL,
+    'display_hide_studio'            : SETTING_BOOL,
+    'display_hide_nplayers'          : SETTING_BOOL,
+    'display_hide_esrb'              : SETTING_BOOL,
+    'display_hide_rating'            : SETTING_BOOL,
+    'display_hide_category'          : SETTING_BOOL,
+
+    # --- Paths ---
+    'categories_asset_dir'           : SETTING_PATH,
+    'launchers_asset_dir'            : SETTING_PATH,
+    'favourites_asset_dir'           : SETTING_PATH,
+    'collections_asset_dir'          : SETTING_PATH,
+
+    # --- Advanced ---
+    'media_state_action'             : SETTING_INT,
+    'lirc_state'                     : SETTING_BOOL,
+    'delay_tempo'                    : SETTING_SLIDER,
+    'suspend_audio_engine'           : SETTING_BOOL,
+    'escape_romfile'                 : SETTING_BOOL,
+    'log_level'                      : SETTING_INT,
+    'show_batch_window'              : SETTING_BOOL,
+    'roms_storage'                   : SETTING_INT,
+    'service_enabled'                : SETTING_BOOL,
+    'service_port'                   : SETTING_INT
+}
+
+# >> Default artwork paths for categories/launchers used if user did not change them.
+AEL_SETTINGS_DEFAULT_DIR = {
+    'categories_asset_dir'  : DEFAULT_CAT_ASSET_DIR,
+    'launchers_asset_dir'   : DEFAULT_LAUN_ASSET_DIR,
+    'favourites_asset_dir'  : DEFAULT_FAV_ASSET_DIR,
+    'collections_asset_dir' : DEFAULT_COL_ASSET_DIR
+}
+
+class AELSettings(dict):
+    def __missing__(self, key):
+        setting_type = AEL_SETTINGS_TYPE[key]
+        value = __addon_obj__.getSetting(key)
+        if   setting_type == SETTING_BOOL:   value = True if value == 'true' else False
+        elif setting_type == SETTING_INT:    value = int(value)
+        elif setting_type == SETTING_SLIDER: value = int(round(float(value)))
+        elif setting_type == SETTING_PATH:
+            value = value.decode('utf-8')
+            if value == '' and key in AEL_SETTINGS_DEFAULT_DIR:
+                value = AEL_SETTINGS_DEFAULT_DIR[key].getOriginalPath()
+        self[key] = value
+
+        return value
+
 # --- Main code ---
 class Main:
     update_timestamp = 0.0
@@ -154,6 +284,7 @@ class Main:
     roms             = {}
     scraper_metadata = None
     scraper_asset    = None
+    scrapers_ready   = False
 
     #
     # This is the plugin entry point.
@@ -185,22 +316,15 @@ class Main:
         # log_debug('CURRENT_ADDON_DIR "{0}"'.format(CURRENT_ADDON_DIR))
 
         # --- Addon data paths creation ---
-        if not PLUGIN_DATA_DIR.exists():          PLUGIN_DATA_DIR.makedirs()
-        if not DEFAULT_CAT_ASSET_DIR.exists():    DEFAULT_CAT_ASSET_DIR.makedirs()
-        if not DEFAULT_COL_ASSET_DIR.exists():    DEFAULT_COL_ASSET_DIR.makedirs()
-        if not DEFAULT_LAUN_ASSET_DIR.exists():   DEFAULT_LAUN_ASSET_DIR.makedirs()
-        if not DEFAULT_FAV_ASSET_DIR.exists():    DEFAULT_FAV_ASSET_DIR.makedirs()
-        if not VIRTUAL_CAT_TITLE_DIR.exists():    VIRTUAL_CAT_TITLE_DIR.makedirs()
-        if not VIRTUAL_CAT_YEARS_DIR.exists():    VIRTUAL_CAT_YEARS_DIR.makedirs()
-        if not VIRTUAL_CAT_GENRE_DIR.exists():    VIRTUAL_CAT_GENRE_DIR.makedirs()
-        if not VIRTUAL_CAT_STUDIO_DIR.exists():   VIRTUAL_CAT_STUDIO_DIR.makedirs()
-        if not VIRTUAL_CAT_NPLAYERS_DIR.exists(): VIRTUAL_CAT_NPLAYERS_DIR.makedirs()
-        if not VIRTUAL_CAT_ESRB_DIR.exists():     VIRTUAL_CAT_ESRB_DIR.makedirs()
-        if not VIRTUAL_CAT_RATING_DIR.exists():   VIRTUAL_CAT_RATING_DIR.makedirs()
-        if not VIRTUAL_CAT_CATEGORY_DIR.exists(): VIRTUAL_CAT_CATEGORY_DIR.makedirs()
-        if not ROMS_DIR.exists():                 ROMS_DIR.makedirs()
-        if not COLLECTIONS_DIR.exists():          COLLECTIONS_DIR.makedirs()
-        if not REPORTS_DIR.exists():              REPORTS_DIR.makedirs()
+        if not self._misc_addon_dirs_created(): self._misc_create_addon_dirs()
+
+        # --- Launcher ROMs storage backend ---
+        fs_set_ROMs_storage(self.settings['roms_storage'])
+
+        # --- Use databases in the AEL service memory if the service is enabled ---
+        if self.settings['service_enabled']: service_set_client_port(self.settings['service_port'])
+
+        # >> Scrapers and the scraper HTTP cache are initialised in _misc_import_scrapers() when needed.
 
         # ~~~~~ Process URL ~~~~~
         self.base_url     = sys.argv[0]
@@ -268,7 +392,10 @@ class Main:
 
         # --- Show ROMs in launcher/virtual launcher ---
         elif command == 'SHOW_ROMS':
-            self._command_render_roms(args['catID'][0], args['launID'][0])
+            page = int(args['page'][0]) if 'page' in args else 0
+            self._command_render_roms(args['catID'][0], args['launID'][0], page)
+        elif command == 'SHOW_ROMS_INDEX':
+            self._command_render_roms_index(args['catID'][0], args['launID'][0])
         elif command == 'SHOW_VLAUNCHER_ROMS':
             self._command_render_virtual_launcher_roms(args['catID'][0], args['launID'][0])
         elif command == 'SHOW_CLONE_ROMS':
@@ -282,7 +409,10 @@ class Main:
         elif command == 'SHOW_ALL_LAUNCHERS':
             self._command_render_all_launchers()
         elif command == 'SHOW_ALL_ROMS':
-            self._command_render_all_ROMs()
+            page = int(args['page'][0]) if 'page' in args else 0
+            self._command_render_all_ROMs(page)
+        elif command == 'SHOW_ALL_ROMS_INDEX':
+            self._command_render_all_ROMs_index()
 
         # --- ROM management ---
         # >> Add/Edit/Delete ROMs in launcher, Favourites or ROM Collections <<
@@ -350,6 +480,7 @@ class Main:
         elif command == 'IMPORT_LAUNCHERS':    self._command_import_launchers()
         elif command == 'EXPORT_LAUNCHERS':    self._command_export_launchers()
         elif command == 'CHECK_DATABASE':      self._command_check_database()
+        elif command == 'CLEAR_SCRAPER_CACHE': self._command_clear_scraper_cache()
         elif command == 'IMPORT_AL_LAUNCHERS': self._command_import_legacy_AL()
 
         # >> Command to build/fill the menu with categories or launcher using skinshortcuts
@@ -364,80 +495,55 @@ class Main:
     # Get Addon Settings
     #
     def _get_settings(self):
-        # Get the users preference settings
-        self.settings = {}
-
-        # --- ROM Scanner settings ---
-        self.settings['scan_recursive']           = True if __addon_obj__.getSetting('scan_recursive') == 'true' else False
-        self.settings['scan_ignore_bios']         = True if __addon_obj__.getSetting('scan_ignore_bios') == 'true' else False
-        self.settings['scan_metadata_policy']     = int(__addon_obj__.getSetting('scan_metadata_policy'))
-        self.settings['scan_asset_policy']        = int(__addon_obj__.getSetting('scan_asset_policy'))
-        self.settings['scan_ignore_scrap_title']  = True if __addon_obj__.getSetting('scan_ignore_scrap_title') == 'true' else False
-        self.settings['scan_clean_tags']          = True if __addon_obj__.getSetting('scan_clean_tags') == 'true' else False
-
-        # --- ROM scraping ---
-        self.settings['metadata_scraper']         = int(__addon_obj__.getSetting('metadata_scraper'))
-        self.settings['asset_scraper']            = int(__addon_obj__.getSetting('asset_scraper'))
-
-        self.settings['metadata_scraper_mode']    = int(__addon_obj__.getSetting('metadata_scraper_mode'))
-        self.settings['asset_scraper_mode']       = int(__addon_obj__.getSetting('asset_scraper_mode'))
-
-        # --- Scrapers ---
-        self.settings['scraper_region']           = int(__addon_obj__.getSetting('scraper_region'))
-        self.settings['scraper_thumb_size']       = int(__addon_obj__.getSetting('scraper_thumb_size'))
-        self.settings['scraper_fanart_size']      = int(__addon_obj__.getSetting('scraper_fanart_size'))
-        self.settings['scraper_image_type']       = int(__addon_obj__.getSetting('scraper_image_type'))
-        self.settings['scraper_fanart_order']     = int(__addon_obj__.getSetting('scraper_fanart_order'))
-
-        # --- Display ---
-        self.settings['display_launcher_notify']  = True if __addon_obj__.getSetting('display_launcher_notify') == 'true' else False
-        self.settings['display_hide_finished']    = True if __addon_obj__.getSetting('display_hide_finished') == 'true' else False
-        self.settings['display_rom_in_fav']       = True if __addon_obj__.getSetting('display_rom_in_fav') == 'true' else False
-        self.settings['display_nointro_stat']     = True if __addon_obj__.getSetting('display_nointro_stat') == 'true' else False
-        self.settings['display_fav_status']       = True if __addon_obj__.getSetting('display_fav_status') == 'true' else False
-
-        self.settings['display_hide_favs']        = True if __addon_obj__.getSetting('display_hide_favs') == 'true' else False
-        self.settings['display_hide_collections'] = True if __addon_obj__.getSetting('display_hide_collections') == 'true' else False
-        self.settings['display_hide_vlaunchers']  = True if __addon_obj__.getSetting('display_hide_vlaunchers') == 'true' else False
-        self.settings['display_hide_recent']      = True if __addon_obj__.getSetting('display_hide_recent') == 'true' else False
-        self.settings['display_hide_mostplayed']  = True if __addon_obj__.getSetting('display_hide_mostplayed') == 'true' else False
-
-        self.settings['display_hide_title']       = True if __addon_obj__.getSetting('display_hide_title') == 'true' else False
-        self.settings['display_hide_year']        = True if __addon_obj__.getSetting('display_hide_year') == 'true' else False
-        self.settings['display_hide_genre']       = True if __addon_obj__.getSetting('display_hide_genre') == 'true' else False
-        self.settings['display_hide_studio']      = True if __addon_obj__.getSetting('display_hide_studio') == 'true' else False
-        self.settings['display_hide_nplayers']    = True if __addon_obj__.getSetting('display_hide_nplayers') == 'true' else False
-        self.settings['display_hide_esrb']        = True if __addon_obj__.getSetting('display_hide_esrb') == 'true' else False
-        self.settings['display_hide_rating']      = True if __addon_obj__.getSetting('display_hide_rating') == 'true' else False
-        self.settings['display_hide_category']    = True if __addon_obj__.getSetting('display_hide_category') == 'true' else False
-
-        # --- Paths ---
-        self.settings['categories_asset_dir']     = __addon_obj__.getSetting('categories_asset_dir').decode('utf-8')
-        self.settings['launchers_asset_dir']      = __addon_obj__.getSetting('launchers_asset_dir').decode('utf-8')
-        self.settings['favourites_asset_dir']     = __addon_obj__.getSetting('favourites_asset_dir').decode('utf-8')
-        self.settings['collections_asset_dir']    = __addon_obj__.getSetting('collections_asset_dir').decode('utf-8')
-
-        # --- Advanced ---
-        self.settings['media_state_action']       = int(__addon_obj__.getSetting('media_state_action'))
-        self.settings['lirc_state']               = True if __addon_obj__.getSetting('lirc_state') == 'true' else False
-        self.settings['delay_tempo']              = int(round(float(__addon_obj__.getSetting('delay_tempo'))))
-        self.settings['suspend_audio_engine']     = True if __addon_obj__.getSetting('suspend_audio_engine') == 'true' else False
-        self.settings['escape_romfile']           = True if __addon_obj__.getSetting('escape_romfile') == 'true' else False
-        self.settings['log_level']                = int(__addon_obj__.getSetting('log_level'))
-        self.settings['show_batch_window']        = True if __addon_obj__.getSetting('show_batch_window') == 'true' else False
-
-        # >> Check if user changed default artwork paths for categories/launchers. If not, set defaults.
-        if self.settings['categories_asset_dir']  == '': self.settings['categories_asset_dir']  = DEFAULT_CAT_ASSET_DIR.getOriginalPath()
-        if self.settings['launchers_asset_dir']   == '': self.settings['launchers_asset_dir']   = DEFAULT_LAUN_ASSET_DIR.getOriginalPath()
-        if self.settings['favourites_asset_dir']  == '': self.settings['favourites_asset_dir']  = DEFAULT_FAV_ASSET_DIR.getOriginalPath()
-        if self.settings['collections_asset_dir'] == '': self.settings['collections_asset_dir'] = DEFAULT_COL_ASSET_DIR.getOriginalPath()
+        # Get the users preference settings. Settings are read from Kodi on demand.
+        self.settings = AELSettings()
 
         # --- Dump settings for DEBUG ---
         # log_debug('Settings dump BEGIN')
-        # for key in sorted(self.settings):
+        # for key in sorted(AEL_SETTINGS_TYPE):
         #     log_debug('{0} --> {1:10s} {2}'.format(key.rjust(21), str(self.settings[key]), type(self.settings[key])))
         # log_debug('Settings dump END')
 
+    #
+    # Checking the addon data directories one by one on every plugin call is slow, specially on
+    # network filesystems. They are created once and a marker file with the addon version is
+    # written. Upgrading the addon creates the directories again. CHECK_DATABASE recreates them.
+    #
+    def _misc_addon_dirs_created(self):
+        try:
+            with open(ADDON_DIRS_MARKER_FILE_PATH.getPath(), 'r') as file:
+                return file.read().strip().decode('utf-8') == __addon_version__
+        except IOError:
+            return False
+
+    def _misc_create_addon_dirs(self):
+        log_info('_misc_create_addon_dirs() Creating addon data directories')
+        for dir_FN in ADDON_DATA_DIR_LIST:
+            if not dir_FN.exists(): dir_FN.makedirs()
+        try:
+            with open(ADDON_DIRS_MARKER_FILE_PATH.getPath(), 'w') as file:
+                file.write(__addon_version__.encode('utf-8'))
+        except IOError as e:
+            log_error('_misc_create_addon_dirs() Cannot write marker file')
+            log_error('_misc_create_addon_dirs() {0}'.format(unicode(e)))
+
+    #
+    # Scraper modules are imported the first time a scraper is used. Importing them takes a good
+    # part of the plugin startup time and most commands (render a launcher, launch a ROM) never
+    # use them. The scraper HTTP cache is initialised at the same time. Returns the scrap module.
+    # Functions using net_IO.py or scrap_pipeline.py import the names they need after calling this.
+    #
+    def _misc_import_scrapers(self):
+        import scrap
+        from net_IO import net_cache_init
+        if not self.scrapers_ready:
+            net_cache_init(SCRAPER_CACHE_DIR.getPath(), self.settings['scraper_cache_ttl'],
+                           self.settings['scraper_cache_size'])
+            scrap.scraper_search_cache.set_capacity(self.settings['scraper_search_cache_size'])
+            self.scrapers_ready = True
+
+        return scrap
+
     #
     # Load scrapers based on the user settings. This couple of functions are only used in the ROM
     # scanner. Edit Categories/Launchers/ROMs initialise scrapers on demand.
@@ -449,14 +555,15 @@ class Main:
         # Scraper objects are created and inserted into a list. This list order matches
         # exactly the number returned by the settings. If scrapers are changed make sure the
         # list in scrapers.py and in settings.xml have same values!
-        self.scraper_metadata = scrapers_metadata[self.settings['metadata_scraper']]
+        self.scraper_metadata = self._misc_import_scrapers().scrapers_metadata[self.settings['metadata_scraper']]
         log_verb('_load_metadata_scraper() Loaded metadata scraper {0}'.format(self.scraper_metadata.name))
 
         # Initialise metadata scraper plugin installation dir, for offline scrapers
         self.scraper_metadata.set_addon_dir(CURRENT_ADDON_DIR.getPath())
+        self.scraper_metadata.set_cache_dir(GAMEDBINFO_INDEX_DIR.getPath())
 
     def _load_asset_scraper(self):
-        self.scraper_asset = scrapers_asset[self.settings['asset_scraper']]
+        self.scraper_asset = self._misc_import_scrapers().scrapers_asset[self.settings['asset_scraper']]
         log_verb('_load_asset_scraper() Loaded asset scraper {0}'.format(self.scraper_asset.name))
 
         # Initialise options of the thumb scraper
@@ -501,6 +608,29 @@ class Main:
         else:
             log_error('_misc_set_AEL_Content() Invalid AEL_Content_Value "{0}"'.format(AEL_Content_Value))
 
+    #
+    # Adds the (url, listitem, isFolder) tuples returned by the _gui_render_*_row() functions to the
+    # Kodi directory. None items (rows not rendered) are skipped. Crossing the Python/C++ boundary once
+    # per chunk instead of once per row with xbmcplugin.addDirectoryItem() is much faster for big lists.
+    # Returns the number of rows added.
+    #
+    def _gui_add_directory_items(self, items):
+        items = [item for item in items if item is not None]
+        for i in range(0, len(items), RENDER_CHUNK_SIZE):
+            xbmcplugin.addDirectoryItems(handle = self.addon_handle, items = items[i:i + RENDER_CHUNK_SIZE],
+                                         totalItems = len(items))
+
+        return len(items)
+
+    #
+    # DEBUG Data loading/rendering statistics. Use resources/tools/report_render_times.py to
+    # summarise them from the Kodi log.
+    #
+    def _misc_log_render_times(self, func_name, loading_ticks_start, rendering_ticks_start, num_items):
+        rendering_ticks_end = time.time()
+        log_debug('{0}() Loading seconds   {1}'.format(func_name, rendering_ticks_start - loading_ticks_start))
+        log_debug('{0}() Rendering seconds {1} ({2} rows)'.format(func_name, rendering_ticks_end - rendering_ticks_start, num_items))
+
     def _command_add_new_category(self):
         dialog = xbmcgui.Dialog()
         keyboard = xbmc.Keyboard('', 'New Category Name')
@@ -759,7 +889,8 @@ class Main:
         LAUNCHER_ROM         = 2
         LAUNCHER_RETROPLAYER = 3
         LAUNCHER_LNK         = 4
-        
+        from scrap_info import AEL_platform_list, emudata_get_program_extensions, emudata_get_program_arguments
+
         # >> If categoryID not found user is creating a new launcher using the context menu
         # >> of a launcher in addon root.
         if categoryID not in self.categories:
@@ -977,7 +1108,7 @@ class Main:
             # >> Make a list of available metadata scrapers
             scraper_obj_list  = []
             scraper_menu_list = []
-            for scrap_obj in scrapers_metadata:
+            for scrap_obj in self._misc_import_scrapers().scrapers_metadata:
                 scraper_obj_list.append(scrap_obj)
                 scraper_menu_list.append('Scrape metadata from {0}...'.format(scrap_obj.name))
                 log_verb('Added metadata scraper {0}'.format(scrap_obj.name))
@@ -1016,23 +1147,25 @@ class Main:
 
                 # --- Rename ROMs XML/JSON file (if it exists) and change launcher ---
                 old_roms_base_noext          = launcher['roms_base_noext']
-                old_roms_file_json           = ROMS_DIR.join(old_roms_base_noext + '.json')
                 old_roms_file_xml            = ROMS_DIR.join(old_roms_base_noext + '.xml')
                 old_PClone_index_file_json   = ROMS_DIR.join(old_roms_base_noext + '_PClone_index.json')
                 old_PClone_parents_file_json = ROMS_DIR.join(old_roms_base_noext + '_PClone_parents.json')
                 category_name                = self.categories[categoryID]['m_name']
                 new_roms_base_noext          = fs_get_ROMs_basename(category_name, new_launcher_name, launcherID)
-                new_roms_file_json           = ROMS_DIR.join(new_roms_base_noext + '.json')
                 new_roms_file_xml            = ROMS_DIR.join(new_roms_base_noext + '.xml')
                 new_PClone_index_file_json   = ROMS_DIR.join(new_roms_base_noext + '_PClone_index.json')
                 new_PClone_parents_file_json = ROMS_DIR.join(new_roms_base_noext + '_PClone_parents.json')
                 log_debug('_command_edit_launcher() old_roms_base_noext "{0}"'.format(old_roms_base_noext))
                 log_debug('_command_edit_launcher() new_roms_base_noext "{0}"'.format(new_roms_base_noext))
-                # >> Rename ROMS JSON/XML
-                if old_roms_file_json.exists():
-                    old_roms_file_json.rename(new_roms_file_json)
-                    log_debug('_command_edit_launcher() RENAMED {0}'.format(old_roms_file_json.getOriginalPath()))
-                    log_debug('_command_edit_launcher()    into {0}'.format(new_roms_file_json.getOriginalPath()))
+                # >> Rename ROMS database (any storage backend) and XML
+                for backend in ROMS_STORAGE_LIST:
+                    old_roms_file = fs_get_ROMs_storage_file_path(ROMS_DIR, old_roms_base_noext, backend)
+                    new_roms_file = fs_get_ROMs_storage_file_path(ROMS_DIR, new_roms_base_noext, backend)
+                    if not old_roms_file.exists(): continue
+                    old_roms_file.rename(new_roms_file)
+                    log_debug('_command_edit_launcher() RENAMED {0}'.format(old_roms_file.getOriginalPath()))
+                    log_debug('_command_edit_launcher()    into {0}'.format(new_roms_file.getOriginalPath()))
+                fs_unlink_ROMs_render_cache(ROMS_DIR, old_roms_base_noext)
                 if old_roms_file_xml.exists():
                     old_roms_file_xml.rename(new_roms_file_xml)
                     log_debug('_command_edit_launcher() RENAMED {0}'.format(old_roms_file_xml.getOriginalPath()))
@@ -1052,6 +1185,7 @@ class Main:
 
             # --- Selection of the launcher platform from AEL "official" list ---
             elif type2 == 1:
+                from scrap_info import AEL_platform_list
                 dialog = xbmcgui.Dialog()
                 sel_platform = dialog.select('Select the platform', AEL_platform_list)
                 if sel_platform < 0: return
@@ -1144,6 +1278,7 @@ class Main:
 
                 # --- Initialise asset scraper ---
                 scraper_obj.set_addon_dir(CURRENT_ADDON_DIR.getPath())
+                scraper_obj.set_cache_dir(GAMEDBINFO_INDEX_DIR.getPath())
                 log_debug('_command_edit_launcher() Initialised scraper "{0}"'.format(scraper_obj.name))
 
                 # >> If this returns False there were no changes so no need to save categories.xml
@@ -1318,6 +1453,7 @@ class Main:
                                        'Import ROMs metadata from NFO files',
                                        'Export ROMs metadata to NFO files',
                                        'Delete ROMs NFO files',
+                                       'Export ROMs database to JSON file',
                                        'Clear ROMs from launcher' ])
                 if type2 < 0: return # User canceled select dialog
 
@@ -1475,6 +1611,7 @@ class Main:
                     # >> Traverse ROM list and check local asset/artwork
                     roms_base_noext = self.launchers[launcherID]['roms_base_noext']
                     roms = fs_load_ROMs_JSON(ROMS_DIR, roms_base_noext)
+                    asset_dir_index = AssetDirIndex()
                     for rom_id in roms:
                         rom = roms[rom_id]
                         ROMFile = FileName(rom['filename'])
@@ -1484,7 +1621,7 @@ class Main:
                             AInfo = assets_get_info_scheme(asset)
                             if not enabled_asset_list[i]: continue
                             asset_path = FileName(launcher[AInfo.path_key])
-                            local_asset = misc_look_for_file(asset_path, rom_basename_noext, AInfo.exts)
+                            local_asset = asset_dir_index.look_for_file(asset_path, rom_basename_noext, AInfo.exts)
                             if local_asset:
                                 rom[AInfo.key] = local_asset.getOriginalPath()
                                 log_verb('Found   {0:<10} "{1}"'.format(AInfo.name, local_asset.getPath()))
@@ -1569,8 +1706,22 @@ class Main:
                     kodi_notify('Deleted {0} NFO files'.format(len(nfo_scanned_files)))
                     return
 
-                # --- Empty Launcher menu option ---
+                # --- Export ROMs database to JSON (portable format, any storage backend) ---
                 elif type2 == 7:
+                    roms = fs_load_ROMs_JSON(ROMS_DIR, self.launchers[launcherID]['roms_base_noext'])
+                    if not roms:
+                        kodi_dialog_OK('Launcher has no ROMs. Nothing to export.')
+                        return
+                    dialog = xbmcgui.Dialog()
+                    dir_path = dialog.browse(0, 'Select JSON export directory', 'files', '', False, False).decode('utf-8')
+                    if not dir_path: return
+                    export_dir_FN = FileName(dir_path)
+                    fs_write_ROMs_JSON_file(export_dir_FN, self.launchers[launcherID]['roms_base_noext'], roms)
+                    kodi_notify('Exported {0} ROMs to JSON'.format(len(roms)))
+                    return
+
+                # --- Empty Launcher menu option ---
+                elif type2 == 8:
                     roms = fs_load_ROMs_JSON(ROMS_DIR, self.launchers[launcherID]['roms_base_noext'])
                     num_roms = len(roms)
 
@@ -1947,7 +2098,7 @@ class Main:
         else:
             log_debug('_command_edit_rom() Editing ROM in Launcher')
             roms_base_noext = self.launchers[launcherID]['roms_base_noext']
-            roms = fs_load_ROMs_JSON(ROMS_DIR, roms_base_noext)
+            roms = fs_load_ROM(ROMS_DIR, roms_base_noext, romID)
 
         # --- Show a dialog with ROM editing options ---
         rom_name = roms[romID]['m_name']
@@ -1974,7 +2125,7 @@ class Main:
             # >> Make a list of available metadata scrapers
             scraper_obj_list  = []
             scraper_menu_list = []
-            for scrap_obj in scrapers_metadata:
+            for scrap_obj in self._misc_import_scrapers().scrapers_metadata:
                 scraper_obj_list.append(scrap_obj)
                 scraper_menu_list.append('Scrape metadata from {0}...'.format(scrap_obj.name))
                 log_verb('Added metadata scraper {0}'.format(scrap_obj.name))
@@ -2092,6 +2243,7 @@ class Main:
 
                 # --- Initialise asset scraper ---
                 scraper_obj.set_addon_dir(CURRENT_ADDON_DIR.getPath())
+                scraper_obj.set_cache_dir(GAMEDBINFO_INDEX_DIR.getPath())
                 log_debug('_command_edit_rom() Initialised scraper "{0}"'.format(scraper_obj.name))
 
                 # >> If this returns False there were no changes so no need to save ROMs JSON.
@@ -2564,7 +2716,7 @@ class Main:
             # >> Also update changed launcher timestamp
             self.launchers[launcherID]['timestamp_launcher'] = _t = time.time()
             roms_base_noext = self.launchers[launcherID]['roms_base_noext']
-            fs_write_ROMs_JSON(ROMS_DIR, roms_base_noext, roms, self.launchers[launcherID])
+            fs_write_ROM(ROMS_DIR, roms_base_noext, roms, romID, self.launchers[launcherID])
             fs_write_catfile(CATEGORIES_FILE_PATH, self.categories, self.launchers)
 
         # It seems that updating the container does more harm than good... specially when having many ROMs
@@ -2633,6 +2785,8 @@ class Main:
             roms.pop(romID)
             roms_base_noext = launcher['roms_base_noext']
             fs_write_ROMs_JSON(ROMS_DIR, roms_base_noext, roms, launcher)
+            # >> Force a full rescan so the deleted ROM file is found again by the ROM scanner
+            fs_unlink_ROMs_manifest(ROMS_DIR, roms_base_noext)
             # >> Also save categories/launchers to update main timestamp and launcher timestamp
             self.launchers[launcherID]['timestamp_launcher'] = time.time()
             fs_write_catfile(CATEGORIES_FILE_PATH, self.categories, self.launchers)
@@ -2650,8 +2804,10 @@ class Main:
         self._misc_set_AEL_Content(AEL_CONTENT_VALUE_LAUNCHERS)
 
         # --- For every category, add it to the listbox. Order alphabetically by name ---
+        loading_ticks_start = rendering_ticks_start = time.time()
+        items = []
         for key in sorted(self.categories, key = lambda x : self.categories[x]['m_name']):
-            self._gui_render_category_row(self.categories[key], key)
+            items.append(self._gui_render_category_row(self.categories[key], key))
 
         # --- Render categoryless launchers. Order alphabetically by name ---
         catless_launchers = {}
@@ -2659,22 +2815,24 @@ class Main:
             if launcher['categoryID'] == VCATEGORY_ADDONROOT_ID:
                 catless_launchers[launcher_id] = launcher
         for launcher_id in sorted(catless_launchers, key = lambda x : catless_launchers[x]['m_name']):
-            self._gui_render_launcher_row(catless_launchers[launcher_id])
+            items.append(self._gui_render_launcher_row(catless_launchers[launcher_id]))
 
         # --- AEL Favourites special category ---
-        if not self.settings['display_hide_favs']: self._gui_render_category_favourites_row()
+        if not self.settings['display_hide_favs']: items.append(self._gui_render_category_favourites_row())
 
         # --- AEL Collections special category ---
-        if not self.settings['display_hide_collections']: self._gui_render_category_collections_row()
+        if not self.settings['display_hide_collections']: items.append(self._gui_render_category_collections_row())
 
         # --- AEL Virtual Categories ---
-        if not self.settings['display_hide_vlaunchers']: self._gui_render_virtual_category_root_row()
+        if not self.settings['display_hide_vlaunchers']: items.append(self._gui_render_virtual_category_root_row())
 
         # --- Recently played and most played ROMs  ---
-        if not self.settings['display_hide_recent']:     self._gui_render_category_recently_played_row()
-        if not self.settings['display_hide_mostplayed']: self._gui_render_category_most_played_row()
+        if not self.settings['display_hide_recent']:     items.append(self._gui_render_category_recently_played_row())
+        if not self.settings['display_hide_mostplayed']: items.append(self._gui_render_category_most_played_row())
 
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_categories', loading_ticks_start, rendering_ticks_start, num_items)
 
     #
     # Renders all categories without Favourites, Collections, virtual categories, etc.
@@ -2687,13 +2845,15 @@ class Main:
             return
 
         # >> For every category, add it to the listbox. Order alphabetically by name
+        items = []
         for key in sorted(self.categories, key = lambda x : self.categories[x]['m_name']):
-            self._gui_render_category_row(self.categories[key], key)
+            items.append(self._gui_render_category_row(self.categories[key], key))
+        self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
 
     def _gui_render_category_row(self, category_dic, key):
         # --- Do not render row if category finished ---
-        if category_dic['finished'] and self.settings['display_hide_finished']: return
+        if category_dic['finished'] and self.settings['display_hide_finished']: return None
 
         # --- Create listitem row ---
         ICON_OVERLAY = 5 if category_dic['finished'] else 4
@@ -2727,7 +2887,7 @@ class Main:
 
         # --- Add row ---
         url_str = self._misc_url('SHOW_LAUNCHERS', key)
-        xbmcplugin.addDirectoryItem(handle = self.addon_handle, url=url_str, listitem=listitem, isFolder=True)
+        return (url_str, listitem, True)
 
     def _gui_render_category_favourites_row(self):
         # --- Create listitem row ---
@@ -2751,7 +2911,7 @@ class Main:
 
         # --- Add row ---
         url_str = self._misc_url('SHOW_FAVOURITES')
-        xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = True)
+        return (url_str, listitem, True)
 
     def _gui_render_category_collections_row(self):
         collections_name   = '{ROM Collections}'
@@ -2775,7 +2935,7 @@ class Main:
         listitem.addContextMenuItems(commands, replaceItems = True)
 
         url_str = self._misc_url('SHOW_COLLECTIONS')
-        xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = True)
+        return (url_str, listitem, True)
 
     def _gui_render_virtual_category_root_row(self):
         vcategory_name   = '[Browse by ... ]'
@@ -2799,7 +2959,7 @@ class Main:
         listitem.addContextMenuItems(commands, replaceItems = True)
 
         url_str = self._misc_url('SHOW_VCATEGORIES_ROOT')
-        xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = True)
+        return (url_str, listitem, True)
 
     def _gui_render_category_recently_played_row(self):
         fav_name = '[Recently played ROMs]'
@@ -2820,7 +2980,7 @@ class Main:
         listitem.addContextMenuItems(commands, replaceItems = True)
 
         url_str = self._misc_url('SHOW_RECENTLY_PLAYED')
-        xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = True)
+        return (url_str, listitem, True)
 
     def _gui_render_category_most_played_row(self):
         fav_name = '[Most played ROMs]'
@@ -2841,7 +3001,7 @@ class Main:
         listitem.addContextMenuItems(commands, replaceItems = True)
 
         url_str = self._misc_url('SHOW_MOST_PLAYED')
-        xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = True)
+        return (url_str, listitem, True)
 
     # ---------------------------------------------------------------------------------------------
     # Virtual categories/launchers (Browse by...)
@@ -2849,14 +3009,16 @@ class Main:
     def _gui_render_vcategories_root(self):
         self._misc_set_all_sorting_methods()
         self._misc_set_AEL_Content(AEL_CONTENT_VALUE_LAUNCHERS)
-        if not self.settings['display_hide_title']:    self._gui_render_virtual_category_row(VCATEGORY_TITLE_ID)
-        if not self.settings['display_hide_year']:     self._gui_render_virtual_category_row(VCATEGORY_YEARS_ID)
-        if not self.settings['display_hide_genre']:    self._gui_render_virtual_category_row(VCATEGORY_GENRE_ID)
-        if not self.settings['display_hide_studio']:   self._gui_render_virtual_category_row(VCATEGORY_STUDIO_ID)
-        if not self.settings['display_hide_nplayers']: self._gui_render_virtual_category_row(VCATEGORY_NPLAYERS_ID)
-        if not self.settings['display_hide_esrb']:     self._gui_render_virtual_category_row(VCATEGORY_ESRB_ID)
-        if not self.settings['display_hide_rating']:   self._gui_render_virtual_category_row(VCATEGORY_RATING_ID)
-        if not self.settings['display_hide_category']: self._gui_render_virtual_category_row(VCATEGORY_CATEGORY_ID)
+        items = []
+        if not self.settings['display_hide_title']:    items.append(self._gui_render_virtual_category_row(VCATEGORY_TITLE_ID))
+        if not self.settings['display_hide_year']:     items.append(self._gui_render_virtual_category_row(VCATEGORY_YEARS_ID))
+        if not self.settings['display_hide_genre']:    items.append(self._gui_render_virtual_category_row(VCATEGORY_GENRE_ID))
+        if not self.settings['display_hide_studio']:   items.append(self._gui_render_virtual_category_row(VCATEGORY_STUDIO_ID))
+        if not self.settings['display_hide_nplayers']: items.append(self._gui_render_virtual_category_row(VCATEGORY_NPLAYERS_ID))
+        if not self.settings['display_hide_esrb']:     items.append(self._gui_render_virtual_category_row(VCATEGORY_ESRB_ID))
+        if not self.settings['display_hide_rating']:   items.append(self._gui_render_virtual_category_row(VCATEGORY_RATING_ID))
+        if not self.settings['display_hide_category']: items.append(self._gui_render_virtual_category_row(VCATEGORY_CATEGORY_ID))
+        self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
 
     def _gui_render_virtual_category_row(self, virtual_category_kind):
@@ -2919,7 +3081,7 @@ class Main:
         else:
             log_error('_gui_render_virtual_category_row() Wrong virtual_category_kind = {0}'.format(virtual_category_kind))
             kodi_dialog_OK('Wrong virtual_category_kind = {0}'.format(virtual_category_kind))
-            return
+            return None
         listitem = xbmcgui.ListItem(vcategory_name)
         listitem.setInfo('video', {'title': vcategory_name,         'genre'  : 'AEL Virtual Launcher',
                                    'plot' : 'AEL virtual category', 'overlay': 4 } )
@@ -2938,7 +3100,7 @@ class Main:
         listitem.addContextMenuItems(commands, replaceItems = True)
 
         url_str = self._misc_url('SHOW_VIRTUAL_CATEGORY', virtual_category_kind)
-        xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = True)
+        return (url_str, listitem, True)
 
     # ---------------------------------------------------------------------------------------------
     # Launcher LisItem rendering
@@ -2982,10 +3144,14 @@ class Main:
             return
 
         # >> Render launcher rows of this launcher
+        loading_ticks_start = rendering_ticks_start = time.time()
+        items = []
         for key in sorted(self.launchers, key = lambda x : self.launchers[x]['m_name']):
             if self.launchers[key]['categoryID'] == categoryID:
-                self._gui_render_launcher_row(self.launchers[key])
+                items.append(self._gui_render_launcher_row(self.launchers[key]))
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_launchers', loading_ticks_start, rendering_ticks_start, num_items)
 
     #
     # Renders all launchers belonging to all categories.
@@ -2998,14 +3164,16 @@ class Main:
             return
 
         # >> Render all launchers
+        items = []
         for key in sorted(self.launchers, key = lambda x : self.launchers[x]['m_name']):
-            self._gui_render_launcher_row(self.launchers[key])
+            items.append(self._gui_render_launcher_row(self.launchers[key]))
+        self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
 
     def _gui_render_launcher_row(self, launcher_dic):
         # --- Do not render row if launcher finished ---
         if launcher_dic['finished'] and self.settings['display_hide_finished']:
-            return
+            return None
 
         # --- Create listitem row ---
         ICON_OVERLAY = 5 if launcher_dic['finished'] else 4
@@ -3064,7 +3232,7 @@ class Main:
         else:
             url_str = self._misc_url('LAUNCH_STANDALONE', categoryID, launcherID)
             folder_flag = False
-        xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = folder_flag)
+        return (url_str, listitem, folder_flag)
 
     # ---------------------------------------------------------------------------------------------
     # ROM LisItem rendering
@@ -3086,12 +3254,12 @@ class Main:
         selectedLauncher = self.launchers[launcherID]
 
         # --- Load ROMs for this launcher ---
-        roms_file_path = fs_get_ROMs_JSON_file_path(ROMS_DIR, selectedLauncher['roms_base_noext'])
-        if not roms_file_path.exists():
+        loading_ticks_start = time.time()
+        if not fs_ROMs_database_exists(ROMS_DIR, selectedLauncher['roms_base_noext']):
             kodi_notify('Launcher XML/JSON not found. Add ROMs to launcher.')
             xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
             return
-        all_roms = fs_load_ROMs_JSON(ROMS_DIR, selectedLauncher['roms_base_noext'])
+        all_roms = fs_load_ROMs_fields(ROMS_DIR, selectedLauncher['roms_base_noext'], ROM_RENDER_FIELDS)
         if not all_roms:
             kodi_notify('Launcher XML/JSON empty. Add ROMs to launcher.')
             xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
@@ -3126,15 +3294,20 @@ class Main:
         # --- Render ROMs ---
         roms_fav = fs_load_Favourites_JSON(FAV_JSON_FILE_PATH)
         roms_fav_set = set(roms_fav.keys())
+        rendering_ticks_start = time.time()
+        items = []
         for key in sorted(roms, key = lambda x : roms[x]['m_name']):
             if key != romID: roms[key]['isClone'] = True
-            self._gui_render_rom_row(categoryID, launcherID, roms[key], key in roms_fav_set, False)
+            items.append(self._gui_render_rom_row(categoryID, launcherID, roms[key], key in roms_fav_set, False))
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_clone_roms', loading_ticks_start, rendering_ticks_start, num_items)
 
     #
     # Renders the roms listbox for a given launcher
+    # If ROMs are displayed in pages only page page is rendered.
     #
-    def _command_render_roms(self, categoryID, launcherID):
+    def _command_render_roms(self, categoryID, launcherID, page = 0):
         # --- Set content type and sorting methods ---
         self._misc_set_all_sorting_methods()
         self._misc_set_AEL_Content(AEL_CONTENT_VALUE_ROMS)
@@ -3148,43 +3321,62 @@ class Main:
 
         # --- Render in normal mode (all ROMs) or Parent/Clone mode---
         loading_ticks_start = time.time()
-        if selectedLauncher['pclone_launcher']:
+        pclone_launcher = True if selectedLauncher['pclone_launcher'] else False
+        roms_render_key = self._misc_get_ROMs_render_key(launcherID, pclone_launcher)
+        (rows, num_rows) = self._misc_load_ROMs_rows(
+            selectedLauncher['roms_base_noext'], roms_render_key, page,
+            lambda: self._misc_get_ROMs_rows(categoryID, launcherID, pclone_launcher))
+        if rows is None:
+            xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+            return
+
+        # --- Display ROMs ---
+        rendering_ticks_start = time.time()
+        items = [self._gui_get_rom_listitem(row) for row in rows]
+        if num_rows is not None:
+            items.extend(self._gui_render_page_rows('SHOW_ROMS', categoryID, launcherID, page, num_rows))
+        num_items = self._gui_add_directory_items(items)
+        xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+
+        # --- DEBUG Data loading/rendering statistics ---
+        self._misc_log_render_times('_command_render_roms', loading_ticks_start, rendering_ticks_start, num_items)
+
+    #
+    # Loads the launcher ROMs and computes the rows of _command_render_roms() sorted by ROM name.
+    # Returns None and notifies the user if there are no ROMs.
+    #
+    def _misc_get_ROMs_rows(self, categoryID, launcherID, pclone_launcher):
+        selectedLauncher = self.launchers[launcherID]
+        if pclone_launcher:
             # --- Load parent ROMs ---
             parents_roms_base_noext = selectedLauncher['roms_base_noext'] + '_PClone_parents'
             parents_file_path = ROMS_DIR.join(parents_roms_base_noext + '.json')
             if not parents_file_path.exists():
                 kodi_notify('Parent list JSON not found.')
-                xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
-                return
+                return None
             roms = fs_load_JSON_file(ROMS_DIR, parents_roms_base_noext)
             if not roms:
                 kodi_notify('Parent list is empty.')
-                xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
-                return
+                return None
             # --- Load parent/clone index ---
             index_base_noext = selectedLauncher['roms_base_noext'] + '_PClone_index'
             index_file_path = ROMS_DIR.join(index_base_noext + '.json')
             if not index_file_path.exists():
                 kodi_notify('Parent list JSON not found.')
-                xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
-                return
+                return None
             pclone_index = fs_load_JSON_file(ROMS_DIR, index_base_noext)
             if not pclone_index:
                 kodi_notify('Parent list is empty.')
-                xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
-                return
+                return None
         else:
             # --- Load ROMs for this launcher ---
-            roms_file_path = fs_get_ROMs_JSON_file_path(ROMS_DIR, selectedLauncher['roms_base_noext'])
-            if not roms_file_path.exists():
+            if not fs_ROMs_database_exists(ROMS_DIR, selectedLauncher['roms_base_noext']):
                 kodi_notify('Launcher XML/JSON not found. Add ROMs to launcher.')
-                xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
-                return
-            roms = fs_load_ROMs_JSON(ROMS_DIR, selectedLauncher['roms_base_noext'])
+                return None
+            roms = fs_load_ROMs_fields(ROMS_DIR, selectedLauncher['roms_base_noext'], ROM_RENDER_FIELDS)
             if not roms:
                 kodi_notify('Launcher XML/JSON empty. Add ROMs to launcher.')
-                xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
-                return
+                return None
         # log_debug('type(roms) = {0}'.format(type(roms)))
         # log_debug('roms = {0}'.format(roms))
         # for key in roms:
@@ -3196,31 +3388,156 @@ class Main:
         #    when checking if an element exists.
         roms_fav = fs_load_Favourites_JSON(FAV_JSON_FILE_PATH)
         roms_fav_set = set(roms_fav.keys())
-        loading_ticks_end = time.time()
 
-        # --- Display ROMs ---
-        rendering_ticks_start = time.time()
-        if selectedLauncher['pclone_launcher']:
-            for key in sorted(roms, key = lambda x : roms[x]['m_name']):
-                self._gui_render_rom_row(categoryID, launcherID, roms[key], key in roms_fav_set, True)
+        # --- Compute rows ---
+        rows = []
+        for key in sorted(roms, key = lambda x : roms[x]['m_name']):
+            row = self._gui_get_rom_row(categoryID, launcherID, roms[key], key in roms_fav_set, pclone_launcher)
+            if row is not None: rows.append(row)
+
+        return rows
+
+    #
+    # Returns the tuple (rows, num_rows) to be rendered. get_rows() computes all the rows and is
+    # only called if the render/pages cache is outdated.
+    # If ROMs are not displayed in pages rows are all the rows and num_rows is None.
+    # If ROMs are displayed in pages rows are the rows of page page and num_rows is the total
+    # number of rows. Only that page is read from the pages cache.
+    # Returns (None, None) if get_rows() failed.
+    #
+    def _misc_load_ROMs_rows(self, roms_base_noext, roms_render_key, page, get_rows):
+        page_size = self.settings['display_roms_page_size']
+        if page_size:
+            pages = fs_load_ROMs_pages_cache(ROMS_DIR, roms_base_noext, roms_render_key, page_size, page)
+            if pages is not None: return (pages[2], pages[0])
         else:
-            for key in sorted(roms, key = lambda x : roms[x]['m_name']):
-                self._gui_render_rom_row(categoryID, launcherID, roms[key], key in roms_fav_set, False)
+            rows = fs_load_ROMs_render_cache(ROMS_DIR, roms_base_noext, roms_render_key)
+            if rows is not None: return (rows, None)
+
+        # --- Compute rows and store them in the render/pages cache ---
+        rows = get_rows()
+        if rows is None: return (None, None)
+        if page_size:
+            fs_write_ROMs_pages_cache(ROMS_DIR, roms_base_noext, roms_render_key, rows, page_size)
+            return (rows[page * page_size:(page + 1) * page_size], len(rows))
+        fs_write_ROMs_render_cache(ROMS_DIR, roms_base_noext, roms_render_key, rows)
+
+        return (rows, None)
+
+    #
+    # Returns the rows of the A-Z index and next page items added to a page of ROMs.
+    # Kodi always displays them at the top/bottom of the list, whatever the sorting method.
+    #
+    def _gui_render_page_rows(self, command, categoryID, launcherID, page, num_rows):
+        page_size = self.settings['display_roms_page_size']
+        num_pages = (num_rows + page_size - 1) // page_size
+        items = []
+
+        # --- A-Z index ---
+        index_name = '[A-Z index] (page {0} of {1})'.format(page + 1, num_pages)
+        listitem = xbmcgui.ListItem(index_name)
+        listitem.setInfo('video', {'title' : index_name, 'overlay' : 4})
+        listitem.setArt({'thumb' : 'DefaultFolder.png'})
+        listitem.setProperty('SpecialSort', 'top')
+        listitem.addContextMenuItems([], replaceItems = True)
+        url_str = self._misc_url(command + '_INDEX', categoryID, launcherID)
+        items.append((url_str, listitem, True))
+
+        # --- Next page ---
+        if page + 1 < num_pages:
+            next_name = '[Next page] ({0} of {1})'.format(page + 2, num_pages)
+            listitem = xbmcgui.ListItem(next_name)
+            listitem.setInfo('video', {'title' : next_name, 'overlay' : 4})
+            listitem.setArt({'thumb' : 'DefaultFolder.png'})
+            listitem.setProperty('SpecialSort', 'bottom')
+            listitem.addContextMenuItems([], replaceItems = True)
+            url_str = self._misc_url_page(command, page + 1, categoryID, launcherID)
+            items.append((url_str, listitem, True))
+
+        return items
+
+    #
+    # Renders the A-Z index of a launcher displayed in pages. Every letter opens the page where
+    # the first ROM starting with that letter is. Only the header of the pages cache is read.
+    #
+    def _command_render_roms_index(self, categoryID, launcherID):
+        if launcherID not in self.launchers:
+            log_error('_command_render_roms_index() Launcher ID not found in self.launchers')
+            kodi_dialog_OK('_command_render_roms_index(): Launcher ID not found in self.launchers. Report this bug.')
+            return
+        selectedLauncher = self.launchers[launcherID]
+        pclone_launcher = True if selectedLauncher['pclone_launcher'] else False
+        roms_render_key = self._misc_get_ROMs_render_key(launcherID, pclone_launcher)
+        self._gui_render_letters_index('SHOW_ROMS', categoryID, launcherID,
+                                       selectedLauncher['roms_base_noext'], roms_render_key)
+
+    def _gui_render_letters_index(self, command, categoryID, launcherID, roms_base_noext, roms_render_key):
+        page_size = self.settings['display_roms_page_size']
+        pages = fs_load_ROMs_pages_cache(ROMS_DIR, roms_base_noext, roms_render_key, page_size, None) \
+                if page_size else None
+        if pages is None:
+            kodi_notify('ROM list changed. Open the ROM list again.')
+            xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+            return
+        self._misc_set_default_sorting_method()
+        items = []
+        for (letter, first_row) in pages[1]:
+            listitem = xbmcgui.ListItem(letter)
+            listitem.setInfo('video', {'title' : letter, 'overlay' : 4})
+            listitem.setArt({'thumb' : 'DefaultFolder.png'})
+            listitem.addContextMenuItems([], replaceItems = True)
+            url_str = self._misc_url_page(command, first_row // page_size, categoryID, launcherID)
+            items.append((url_str, listitem, True))
+        self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
-        rendering_ticks_end = time.time()
 
-        # --- DEBUG Data loading/rendering statistics ---
-        log_debug('Loading seconds   {0}'.format(loading_ticks_end - loading_ticks_start))
-        log_debug('Rendering seconds {0}'.format(rendering_ticks_end - rendering_ticks_start))
+    #
+    # Returns the key of the launcher ROMs render cache. If anything the rendered rows depend on
+    # changes the key changes and the render cache is not used. ROMs can be edited without
+    # updating timestamp_launcher, so the stat of the ROMs database file is also part of the key.
+    #
+    def _misc_get_ROMs_render_key(self, launcherID, pclone_launcher):
+        launcher = self.launchers[launcherID]
+        roms_base_noext = launcher['roms_base_noext']
+        if pclone_launcher:
+            roms_file_key = [fs_get_file_stat_key(ROMS_DIR.join(roms_base_noext + '_PClone_parents.json'))]
+        else:
+            backend = fs_find_ROMs_storage(ROMS_DIR, roms_base_noext)
+            if backend is None: return None
+            roms_file_key = [backend,
+                             fs_get_file_stat_key(fs_get_ROMs_storage_file_path(ROMS_DIR, roms_base_noext, backend))]
+
+        return [self.base_url, launcherID, pclone_launcher, launcher['timestamp_launcher'],
+                launcher['s_thumb'], launcher['s_fanart'], launcher['platform'],
+                launcher['roms_default_thumb'], launcher['roms_default_fanart'],
+                launcher['roms_default_banner'], launcher['roms_default_poster'],
+                launcher['roms_default_clearlogo'],
+                self.settings['display_hide_finished'], self.settings['display_nointro_stat'],
+                self.settings['display_rom_in_fav'],
+                fs_get_file_stat_key(FAV_JSON_FILE_PATH)] + roms_file_key
 
     #
     # Former  _add_rom()
     # Note that if we are rendering favourites, categoryID = VCATEGORY_FAVOURITES_ID
     # Note that if we are rendering virtual launchers, categoryID = VCATEGORY_*_ID
+    # Returns the tuple (url_str, listitem, folder_flag) or None if the ROM is not rendered.
     #
     def _gui_render_rom_row(self, categoryID, launcherID, rom, rom_in_fav, parent_launcher = False):
+        row = self._gui_get_rom_row(categoryID, launcherID, rom, rom_in_fav, parent_launcher)
+        if row is None: return None
+
+        return self._gui_get_rom_listitem(row)
+
+    #
+    # Computes everything needed to render a ROM row. Rows only contain strings, numbers, lists and
+    # dictionaries so they can be stored in the ROMs render cache. Use _gui_get_rom_listitem() to
+    # create the Kodi listitem. Returns None if the row must not be rendered.
+    #
+    # row = (url_str, folder_flag, rom_name, info_dic, props_dic, art_dic, commands)
+    #
+    def _gui_get_rom_row(self, categoryID, launcherID, rom, rom_in_fav, parent_launcher = False):
         # --- Do not render row if ROM is finished ---
-        if rom['finished'] and self.settings['display_hide_finished']: return
+        if rom['finished'] and self.settings['display_hide_finished']: return None
 
         # --- Default values for flags ---
         AEL_InFav_bool_value     = AEL_INFAV_BOOL_VALUE_FALSE
@@ -3382,7 +3699,6 @@ class Main:
 
         # --- Add ROM to lisitem ---
         ICON_OVERLAY = 5 if rom['finished'] else 4
-        listitem = xbmcgui.ListItem(rom_name)
 
         # Interesting... if text formatting labels are set in xbmcgui.ListItem() do not work. However, if
         # labels are set as Title in setInfo(), then they work but the alphabetical order is lost!
@@ -3391,54 +3707,34 @@ class Main:
         # >> BUG in Jarvis/Krypton skins. If 'year' is set to empty string a 0 is displayed on the
         # >>     skin. If year is not set then the correct icon is shown.
         if rom['m_year']:
-            listitem.setInfo('video', {'title'   : rom_name,         'year'    : rom['m_year'],
-                                       'genre'   : rom['m_genre'],   'plot'    : rom['m_plot'],
-                                       'studio'  : rom['m_studio'],  'rating'  : rom['m_rating'],
-                                       'trailer' : rom['s_trailer'], 'overlay' : ICON_OVERLAY })
+            info_dic = {'title'   : rom_name,         'year'    : rom['m_year'],
+                        'genre'   : rom['m_genre'],   'plot'    : rom['m_plot'],
+                        'studio'  : rom['m_studio'],  'rating'  : rom['m_rating'],
+                        'trailer' : rom['s_trailer'], 'overlay' : ICON_OVERLAY }
         else:
-            listitem.setInfo('video', {'title'   : rom_name,
-                                       'genre'   : rom['m_genre'],   'plot'    : rom['m_plot'],
-                                       'studio'  : rom['m_studio'],  'rating'  : rom['m_rating'],
-                                       'trailer' : rom['s_trailer'], 'overlay' : ICON_OVERLAY })
-        listitem.setProperty('nplayers', rom['m_nplayers'])
-        listitem.setProperty('esrb', rom['m_esrb'])
-        listitem.setProperty('platform', platform)
-
-        # --- Set ROM artwork ---
-        # >> AEL custom artwork fields
-        listitem.setArt({'title'     : rom['s_title'],     'snap'    : rom['s_snap'],
-                         'boxfront'  : rom['s_boxfront'],  'boxback' : rom['s_boxback'], 
-                         'cartridge' : rom['s_cartridge'], 'flyer'   : rom['s_flyer'],
-                         'map'       : rom['s_map'] })
-
-        # >> Kodi official artwork fields
-        listitem.setArt({'icon'   : thumb_path,   'fanart'    : thumb_fanart,
-                         'banner' : thumb_banner, 'clearlogo' : thumb_clearlogo, 'poster' : thumb_poster })
-
-        # --- ROM extrafanart ---
-        # >> Build extrafanart dictionary
-        # extrafanart_dic = {}
-        # listitem.setArt(extrafanart_dic)
-
-        # http://forum.kodi.tv/showthread.php?tid=221690&pid=1960874#pid1960874
-        # This appears to be a common area of confusion with many addon developers, isPlayable doesn't
-        # really mean the item is a playable, it only means Kodi will wait for a call to
-        # xbmcplugin.setResolvedUrl and when this is called it will play the item. If you are going
-        # to play the item using xbmc.Player().play() then as far as Kodi is concerned it isn't playable.
-        #
-        # http://forum.kodi.tv/showthread.php?tid=173986&pid=1519987#pid1519987
-        # Otherwise the plugin is called back with an invalid handle (sys.arg[1]). It took me a lot of time
-        # to figure this out...
-        # if self._content_type == 'video':
-        # listitem.setProperty('IsPlayable', 'false')
-        # log_debug('Item Row IsPlayable false')
+            info_dic = {'title'   : rom_name,
+                        'genre'   : rom['m_genre'],   'plot'    : rom['m_plot'],
+                        'studio'  : rom['m_studio'],  'rating'  : rom['m_rating'],
+                        'trailer' : rom['s_trailer'], 'overlay' : ICON_OVERLAY }
 
         # --- ROM flags (Skins will use these flags to render icons) ---
-        listitem.setProperty(AEL_INFAV_BOOL_LABEL,     AEL_InFav_bool_value)
-        listitem.setProperty(AEL_MULTIDISC_BOOL_LABEL, AEL_MultiDisc_bool_value)
-        listitem.setProperty(AEL_FAV_STAT_LABEL,       AEL_Fav_stat_value)
-        listitem.setProperty(AEL_NOINTRO_STAT_LABEL,   AEL_NoIntro_stat_value)
-        listitem.setProperty(AEL_PCLONE_STAT_LABEL,    AEL_PClone_stat_value)
+        props_dic = {'nplayers'               : rom['m_nplayers'],
+                     'esrb'                   : rom['m_esrb'],
+                     'platform'               : platform,
+                     AEL_INFAV_BOOL_LABEL     : AEL_InFav_bool_value,
+                     AEL_MULTIDISC_BOOL_LABEL : AEL_MultiDisc_bool_value,
+                     AEL_FAV_STAT_LABEL       : AEL_Fav_stat_value,
+                     AEL_NOINTRO_STAT_LABEL   : AEL_NoIntro_stat_value,
+                     AEL_PCLONE_STAT_LABEL    : AEL_PClone_stat_value}
+
+        # --- Set ROM artwork ---
+        # >> AEL custom artwork fields and Kodi official artwork fields
+        art_dic = {'title'     : rom['s_title'],     'snap'    : rom['s_snap'],
+                   'boxfront'  : rom['s_boxfront'],  'boxback' : rom['s_boxback'],
+                   'cartridge' : rom['s_cartridge'], 'flyer'   : rom['s_flyer'],
+                   'map'       : rom['s_map'],
+                   'icon'      : thumb_path,         'fanart'    : thumb_fanart,
+                   'banner'    : thumb_banner,       'clearlogo' : thumb_clearlogo, 'poster' : thumb_poster }
 
         # --- Create context menu ---
         romID = rom['id']
@@ -3474,17 +3770,49 @@ class Main:
             commands.append(('Add ROM to Collection',           self._misc_url_RunPlugin('ADD_TO_COLLECTION', categoryID, launcherID, romID)))
             commands.append(('Search ROMs in Launcher',         self._misc_url_RunPlugin('SEARCH_LAUNCHER',   categoryID, launcherID)))
         commands.append(('Add-on Settings', 'Addon.OpenSettings({0})'.format(__addon_id__), ))
-        listitem.addContextMenuItems(commands, replaceItems = True)
 
-        # --- Add row ---
+        # --- Row URL ---
         # URLs must be different depending on the content type. If not Kodi log will be filled with:
         # WARNING: CreateLoader - unsupported protocol(plugin) in the log. See http://forum.kodi.tv/showthread.php?tid=187954
         if parent_launcher:
             url_str = self._misc_url('SHOW_CLONE_ROMS', categoryID, launcherID, romID)
-            xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = True)
         else:
             url_str = self._misc_url('LAUNCH_ROM', categoryID, launcherID, romID)
-            xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = False)
+
+        return (url_str, parent_launcher, rom_name, info_dic, props_dic, art_dic, commands)
+
+    #
+    # Creates the Kodi listitem of a row returned by _gui_get_rom_row().
+    # Returns the tuple (url_str, listitem, folder_flag) used by xbmcplugin.addDirectoryItems()
+    #
+    def _gui_get_rom_listitem(self, row):
+        (url_str, folder_flag, rom_name, info_dic, props_dic, art_dic, commands) = row
+        listitem = xbmcgui.ListItem(rom_name)
+        listitem.setInfo('video', info_dic)
+        for prop_name in props_dic: listitem.setProperty(prop_name, props_dic[prop_name])
+        listitem.setArt(art_dic)
+
+        # --- ROM extrafanart ---
+        # >> Build extrafanart dictionary
+        # extrafanart_dic = {}
+        # listitem.setArt(extrafanart_dic)
+
+        # http://forum.kodi.tv/showthread.php?tid=221690&pid=1960874#pid1960874
+        # This appears to be a common area of confusion with many addon developers, isPlayable doesn't
+        # really mean the item is a playable, it only means Kodi will wait for a call to
+        # xbmcplugin.setResolvedUrl and when this is called it will play the item. If you are going
+        # to play the item using xbmc.Player().play() then as far as Kodi is concerned it isn't playable.
+        #
+        # http://forum.kodi.tv/showthread.php?tid=173986&pid=1519987#pid1519987
+        # Otherwise the plugin is called back with an invalid handle (sys.arg[1]). It took me a lot of time
+        # to figure this out...
+        # if self._content_type == 'video':
+        # listitem.setProperty('IsPlayable', 'false')
+        # log_debug('Item Row IsPlayable false')
+
+        listitem.addContextMenuItems(commands, replaceItems = True)
+
+        return (url_str, listitem, folder_flag)
 
     #
     # Renders the special category favourites, which is actually very similar to a ROM launcher
@@ -3510,6 +3838,7 @@ class Main:
         self._misc_set_AEL_Content(AEL_CONTENT_VALUE_ROMS)
 
         # --- Load Favourite ROMs ---
+        loading_ticks_start = time.time()
         roms = fs_load_Favourites_JSON(FAV_JSON_FILE_PATH)
         if not roms:
             kodi_notify('Favourites is empty. Add ROMs to Favourites first.')
@@ -3517,9 +3846,13 @@ class Main:
             return
 
         # --- Display Favourites ---
+        rendering_ticks_start = time.time()
+        items = []
         for key in sorted(roms, key= lambda x : roms[x]['m_name']):
-            self._gui_render_rom_row(VCATEGORY_FAVOURITES_ID, VLAUNCHER_FAVOURITES_ID, roms[key], False)
+            items.append(self._gui_render_rom_row(VCATEGORY_FAVOURITES_ID, VLAUNCHER_FAVOURITES_ID, roms[key], False))
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_favourites', loading_ticks_start, rendering_ticks_start, num_items)
 
     # ---------------------------------------------------------------------------------------------
     # Virtual Launcher LisItem rendering
@@ -3574,13 +3907,21 @@ class Main:
             return
 
         # --- Load Virtual launchers XML file ---
-        (VLauncher_timestamp, vcategory_launchers) = fs_load_VCategory_XML(vcategory_db_filename)
+        loading_ticks_start = time.time()
+        (VLauncher_timestamp, vcategory_launchers, launchers_info) = fs_load_VCategory_index(vcategory_db_filename)
 
-        # --- Check timestamps and warn user if database should be regenerated ---
-        if VLauncher_timestamp < self.update_timestamp:
+        # --- Check launchers state and warn user if database should be updated ---
+        # >> Databases of older versions have no launchers state, use the timestamps.
+        if launchers_info:
+            vcategory_outdated = self._vcategory_get_changed_launchers(launchers_info, self._vcategory_get_launchers_info())
+        else:
+            vcategory_outdated = VLauncher_timestamp < self.update_timestamp
+        if vcategory_outdated:
             kodi_dialog_OK('Categories/Launchers/ROMs were modified. Virtual category database should be updated!')
 
         # --- Render virtual launchers rows ---
+        rendering_ticks_start = time.time()
+        items = []
         for vlauncher_id in vcategory_launchers:
             vlauncher = vcategory_launchers[vlauncher_id]
             vlauncher_name = vlauncher['name'] + '  ({0} ROM/s)'.format(vlauncher['rom_count'])
@@ -3602,8 +3943,10 @@ class Main:
             listitem.addContextMenuItems(commands, replaceItems = True)
 
             url_str = self._misc_url('SHOW_VLAUNCHER_ROMS', virtual_categoryID, vlauncher_id)
-            xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = True)
+            items.append((url_str, listitem, True))
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_virtual_category', loading_ticks_start, rendering_ticks_start, num_items)
 
     #
     # Renders ROMs in a virtual launcher.
@@ -3629,6 +3972,7 @@ class Main:
             return
 
         # --- Load Virtual Launcher DB ---
+        loading_ticks_start = time.time()
         hashed_db_filename = vcategory_db_dir.join(virtual_launcherID + '.json')
         if not hashed_db_filename.exists():
             kodi_dialog_OK('Virtual launcher XML/JSON file not found.')
@@ -3645,9 +3989,13 @@ class Main:
         roms_fav_set = set(roms_fav.keys())
 
         # --- Display Favourites ---
+        rendering_ticks_start = time.time()
+        items = []
         for key in sorted(roms, key= lambda x : roms[x]['m_name']):
-            self._gui_render_rom_row(virtual_categoryID, virtual_launcherID, roms[key], key in roms_fav_set)
+            items.append(self._gui_render_rom_row(virtual_categoryID, virtual_launcherID, roms[key], key in roms_fav_set))
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_virtual_launcher_roms', loading_ticks_start, rendering_ticks_start, num_items)
 
     #
     # Render the Recently played and Most Played virtual launchers.
@@ -3658,6 +4006,7 @@ class Main:
         self._misc_set_AEL_Content(AEL_CONTENT_VALUE_ROMS)
 
         # --- Load Recently Played favourite ROM list and create and OrderedDict ---
+        loading_ticks_start = time.time()
         rom_list = fs_load_Collection_ROMs_JSON(RECENT_PLAYED_FILE_PATH)
         if not rom_list:
             kodi_notify('Recently played list is empty. Play some ROMs first!')
@@ -3665,9 +4014,13 @@ class Main:
             return
 
         # --- Display recently player ROM list ---
+        rendering_ticks_start = time.time()
+        items = []
         for rom in rom_list:
-            self._gui_render_rom_row(VCATEGORY_RECENT_ID, VLAUNCHER_RECENT_ID, rom, False)
+            items.append(self._gui_render_rom_row(VCATEGORY_RECENT_ID, VLAUNCHER_RECENT_ID, rom, False))
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_recently_played', loading_ticks_start, rendering_ticks_start, num_items)
 
     def _command_render_most_played(self):
         # >> Content type and sorting method
@@ -3675,6 +4028,7 @@ class Main:
         self._misc_set_AEL_Content(AEL_CONTENT_VALUE_ROMS)
 
         # --- Load Most Played favourite ROMs ---
+        loading_ticks_start = time.time()
         roms = fs_load_Favourites_JSON(MOST_PLAYED_FILE_PATH)
         if not roms:
             kodi_notify('Most played ROMs list  is empty. Play some ROMs first!.')
@@ -3682,43 +4036,77 @@ class Main:
             return
 
         # --- Display most played ROMs, order by number of launchs ---
+        rendering_ticks_start = time.time()
+        items = []
         for key in sorted(roms, key = lambda x : roms[x]['launch_count'], reverse = True):
-            self._gui_render_rom_row(VCATEGORY_MOST_PLAYED_ID, VLAUNCHER_MOST_PLAYED_ID, roms[key], False)
+            items.append(self._gui_render_rom_row(VCATEGORY_MOST_PLAYED_ID, VLAUNCHER_MOST_PLAYED_ID, roms[key], False))
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_most_played', loading_ticks_start, rendering_ticks_start, num_items)
 
     #
     # Render all ROMs
-    # This command is called by skins. Not advisable to use it if there are many ROMs...
+    # This command is called by skins. Not advisable to use it if there are many ROMs, unless
+    # ROMs are displayed in pages.
     #
-    def _command_render_all_ROMs(self):
-        # --- Make a dictionary having all ROMs in all Launchers ---
+    def _command_render_all_ROMs(self, page = 0):
         log_debug('_command_render_all_ROMs() Creating list of all ROMs in all Launchers')
-        all_roms = {}
+        loading_ticks_start = time.time()
+        (rows, num_rows) = self._misc_load_ROMs_rows(ALL_ROMS_BASE_NOEXT, self._misc_get_all_ROMs_render_key(),
+                                                     page, self._misc_get_all_ROMs_rows)
+
+        # --- Set content type and sorting methods ---
+        self._misc_set_default_sorting_method()
+
+        # --- Render ROMs ---
+        rendering_ticks_start = time.time()
+        items = [self._gui_get_rom_listitem(row) for row in rows]
+        if num_rows is not None:
+            items.extend(self._gui_render_page_rows('SHOW_ALL_ROMS', None, None, page, num_rows))
+        num_items = self._gui_add_directory_items(items)
+        xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_all_ROMs', loading_ticks_start, rendering_ticks_start, num_items)
+
+    def _command_render_all_ROMs_index(self):
+        self._gui_render_letters_index('SHOW_ALL_ROMS', None, None, ALL_ROMS_BASE_NOEXT,
+                                       self._misc_get_all_ROMs_render_key())
+
+    #
+    # Rows of all ROMs in all launchers sorted by ROM name. ROMs are not copied, the category and
+    # launcher of every ROM are kept in the list that is sorted.
+    #
+    def _misc_get_all_ROMs_rows(self):
+        all_roms = []
         for launcher_id in self.launchers:
             launcher = self.launchers[launcher_id]
             # If launcher is standalone skip
             if launcher['rompath'] == '': continue
-            roms = fs_load_ROMs_JSON(ROMS_DIR, launcher['roms_base_noext'])
-            temp_roms = {}
+            roms = fs_load_ROMs_fields(ROMS_DIR, launcher['roms_base_noext'], ROM_RENDER_FIELDS)
             for rom_id in roms:
-                temp_rom                = roms[rom_id].copy()
-                temp_rom['launcher_id'] = launcher_id
-                temp_rom['category_id'] = launcher['categoryID']
-                temp_roms[rom_id] = temp_rom
-            all_roms.update(temp_roms)
+                all_roms.append((roms[rom_id]['m_name'], rom_id, launcher['categoryID'], launcher_id, roms[rom_id]))
+        all_roms.sort(key = lambda x : x[0])
 
         # --- Load favourites ---
         roms_fav = fs_load_Favourites_JSON(FAV_JSON_FILE_PATH)
         roms_fav_set = set(roms_fav.keys())
 
-        # --- Set content type and sorting methods ---
-        self._misc_set_default_sorting_method()
+        rows = []
+        for (m_name, rom_id, category_id, launcher_id, rom) in all_roms:
+            row = self._gui_get_rom_row(category_id, launcher_id, rom, rom_id in roms_fav_set, False)
+            if row is not None: rows.append(row)
 
-        # --- Render ROMs ---
-        for rom_id in sorted(all_roms, key = lambda x : all_roms[x]['m_name']):
-            self._gui_render_rom_row(all_roms[rom_id]['category_id'], all_roms[rom_id]['launcher_id'],
-                                     all_roms[rom_id], rom_id in roms_fav_set, False)
-        xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        return rows
+
+    #
+    # The all ROMs cache depends on the ROMs of every launcher.
+    #
+    def _misc_get_all_ROMs_render_key(self):
+        key = []
+        for launcher_id in sorted(self.launchers):
+            if self.launchers[launcher_id]['rompath'] == '': continue
+            key.append(self._misc_get_ROMs_render_key(launcher_id, False))
+
+        return key
 
     #
     # Adds ROM to favourites
@@ -3847,9 +4235,9 @@ class Main:
         # type == 2 --> Repair by ROM basename match
         elif type == 1 or type == 2:
             # 1) Traverse list of Favourites.
-            # 2) For each favourite traverse all Launchers.
-            # 3) Search for a ROM with same filename or same rom_base.
-            #    If found, then replace romID in Favourites with romID of found ROM. Do not copy
+            # 2) For each favourite search the global ROM index for a ROM with same filename or
+            #    same rom_base.
+            # 3) If found, then replace romID in Favourites with romID of found ROM. Do not copy
             #    any metadata because user maybe customised the Favourite ROM.
             log_info('Repairing Unlinked Launcher/Broken ROMs (type = {0}...'.format(type))
 
@@ -3864,11 +4252,15 @@ class Main:
             log_verb('_command_manage_favourites() Repair mode {0}'.format(repair_mode))
 
             # >> Refreshing Favourite status will locate Unlinked/Broken ROMs.
-            self._fav_check_favourites(roms_fav)
+            rom_index = fs_load_ROM_index(ROMS_DIR, self.launchers)
+            self._fav_check_favourites(roms_fav, rom_index)
 
             # >> Repair Unlinked Launcher/Broken ROMs, Step 1
             # NOTE Dictionaries cannot change size when iterating them. Make a list of found ROMs
             #      and repair broken Favourites on a second pass
+            # >> The ROMs of every launcher are loaded once, no matter how many Favourites are
+            # >> relinked to it.
+            launchers_roms = {}
             pDialog = xbmcgui.DialogProgress()
             xbmc.sleep(100)
             num_progress_items = len(roms_fav)
@@ -3892,31 +4284,26 @@ class Main:
                 log_info('_command_manage_favourites() Repairing Fav ROM "{0}"'.format(fav_name))
                 log_info('_command_manage_favourites() Fav ROM status "{0}"'.format(roms_fav[rom_fav_ID]['fav_status']))
 
-                # >> Traverse all launchers and find rom by filename or base name
-                ROM_FN_FAV = FileName(roms_fav[rom_fav_ID]['filename'])
+                # >> Find ROM by filename or base name in the global ROM index
                 filename_found = False
-                for launcher_id in self.launchers:
-                    # >> Load launcher ROMs
-                    roms = fs_load_ROMs_JSON(ROMS_DIR, self.launchers[launcher_id]['roms_base_noext'])
-                    for rom_id in roms:
-                        ROM_FN = FileName(roms[rom_id]['filename'])
-                        fav_name = roms_fav[rom_fav_ID]['m_name']
-                        if type == 1 and roms_fav[rom_fav_ID]['filename'] == roms[rom_id]['filename']:
-                            log_info('_command_manage_favourites() Favourite {0} matched by filename!'.format(fav_name))
-                            log_info('_command_manage_favourites() Launcher {0}'.format(launcher_id))
-                            log_info('_command_manage_favourites() ROM {0}'.format(rom_id))
-                        elif type == 2 and ROM_FN_FAV.getBase() == ROM_FN.getBase():
-                            log_info('_command_manage_favourites() Favourite {0} matched by basename!'.format(fav_name))
-                            log_info('_command_manage_favourites() Launcher {0}'.format(launcher_id))
-                            log_info('_command_manage_favourites() ROM {0}'.format(rom_id))
-                        else:
-                            continue
-                        # >> Match found. Break all for loops inmediately.
+                if type == 1:
+                    match = rom_index['filename'].get(roms_fav[rom_fav_ID]['filename'])
+                    if match: log_info('_command_manage_favourites() Favourite {0} matched by filename!'.format(fav_name))
+                else:
+                    matches = rom_index['basename'].get(FileName(roms_fav[rom_fav_ID]['filename']).getBase())
+                    match = matches[0] if matches else None
+                    if match: log_info('_command_manage_favourites() Favourite {0} matched by basename!'.format(fav_name))
+                if match:
+                    (launcher_id, rom_id) = match
+                    log_info('_command_manage_favourites() Launcher {0}'.format(launcher_id))
+                    log_info('_command_manage_favourites() ROM {0}'.format(rom_id))
+                    if launcher_id not in launchers_roms:
+                        launchers_roms[launcher_id] = fs_load_ROMs_JSON(ROMS_DIR, self.launchers[launcher_id]['roms_base_noext'])
+                    roms = launchers_roms[launcher_id]
+                    if rom_id in roms:
                         filename_found      = True
                         new_fav_rom_ID      = rom_id
                         new_fav_rom_laun_ID = launcher_id
-                        break
-                    if filename_found: break
 
                 # >> Add ROM to the list of ROMs to be repaired.
                 if filename_found:
@@ -3986,9 +4373,11 @@ class Main:
             log_verb('_command_manage_favourites() Repair mode {0}'.format(repair_mode))
 
             # >> Refreshing Favourite status will locate Unlinked ROMs.
-            self._fav_check_favourites(roms_fav)
+            rom_index = fs_load_ROM_index(ROMS_DIR, self.launchers)
+            self._fav_check_favourites(roms_fav, rom_index)
 
             # >> Repair Unlinked ROMs
+            launchers_roms = {}
             pDialog = xbmcgui.DialogProgress()
             num_progress_items = len(roms_fav)
             i = 0
@@ -4007,19 +4396,19 @@ class Main:
                 log_info('_command_manage_favourites() Repairing Fav ROM "{0}"'.format(fav_name))
                 log_info('_command_manage_favourites() Fav ROM status "{0}"'.format(rom_fav['fav_status']))
 
-                # >> Get ROMs of launcher
-                launcher_id   = rom_fav['launcherID']
-                launcher_roms = fs_load_ROMs_JSON(ROMS_DIR, self.launchers[launcher_id]['roms_base_noext'])
-
-                # >> Is there a ROM with same basename (including extension) as the Favourite ROM?
+                # >> Is there a ROM in the launcher with same basename (including extension) as
+                # >> the Favourite ROM? ROMs of the launcher are only loaded if there is a match.
+                launcher_id = rom_fav['launcherID']
                 filename_found = False
-                ROM_FAV_FN = FileName(rom_fav['filename'])
-                for rom_id in launcher_roms:
-                    ROM_FN = FileName(launcher_roms[rom_id]['filename'])
-                    if ROM_FAV_FN.getBase() == ROM_FN.getBase():
-                        filename_found = True
-                        new_fav_rom_ID = rom_id
-                        break
+                for (match_launcher_id, rom_id) in rom_index['basename'].get(FileName(rom_fav['filename']).getBase(), []):
+                    if match_launcher_id != launcher_id: continue
+                    if launcher_id not in launchers_roms:
+                        launchers_roms[launcher_id] = fs_load_ROMs_JSON(ROMS_DIR, self.launchers[launcher_id]['roms_base_noext'])
+                    launcher_roms = launchers_roms[launcher_id]
+                    if rom_id not in launcher_roms: continue
+                    filename_found = True
+                    new_fav_rom_ID = rom_id
+                    break
 
                 # >> Add ROM to the list of ROMs to be repaired. A dictionary cannot change when
                 # >> it's being iterated! An Excepcion will be raised if so.
@@ -4082,87 +4471,65 @@ class Main:
     #
     # Check ROMs in favourites and set fav_status field.
     # roms_fav edited by passing by assigment, dictionaries are mutable.
+    # Favourites are grouped by launcher in a single pass and ROM IDs are looked up in the global
+    # ROM index, so launcher ROMs are not loaded. Files are checked in parallel, see
+    # misc_check_files_exist(). rom_index is loaded if not given.
     #
-    def _fav_check_favourites(self, roms_fav):
+    def _fav_check_favourites(self, roms_fav, rom_index = None):
         # --- Statistics ---
         self.num_fav_roms = len(roms_fav)
         self.num_fav_ulauncher = 0
         self.num_fav_urom      = 0
         self.num_fav_broken    = 0
 
-        # --- Reset fav_status filed for all favourites ---
-        log_debug('_fav_check_favourites() STEP 0: Reset status')
-        for rom_fav_ID in roms_fav:
-            roms_fav[rom_fav_ID]['fav_status'] = 'OK'
-
         # --- Progress dialog ---
         # >> Important to avoid multithread execution of the plugin and race conditions
         pDialog = xbmcgui.DialogProgress()
 
-        # STEP 1: Find Favourites with missing launchers
-        log_debug('_fav_check_favourites() STEP 1: Search unlinked Launchers')
-        num_progress_items = len(roms_fav)
-        i = 0
-        pDialog.create('Advanced Emulator Launcher', 'Checking Favourite ROMs. Step 1 of 3...')
+        # STEP 1: Reset fav_status and group Favourites by launcher
+        log_debug('_fav_check_favourites() STEP 1: Search unlinked Launchers/ROMs')
+        pDialog.create('Advanced Emulator Launcher', 'Checking Favourite ROMs. Step 1 of 2...')
+        if rom_index is None: rom_index = fs_load_ROM_index(ROMS_DIR, self.launchers)
+        launchers_fav = {}
         for rom_fav_ID in roms_fav:
-            pDialog.update(i * 100 / num_progress_items)
-            i += 1
-            if roms_fav[rom_fav_ID]['launcherID'] not in self.launchers:
-                log_verb('Fav ROM "{0}" Unlinked Launcher because launcherID not in self.launchers'.format(roms_fav[rom_fav_ID]['m_name']))
-                roms_fav[rom_fav_ID]['fav_status'] = 'Unlinked Launcher'
-                self.num_fav_ulauncher += 1
-        pDialog.update(i * 100 / num_progress_items)
-        pDialog.close()
-
-        # STEP 2: Find missing ROM ID
-        # >> Get a list of launchers Favourite ROMs belong
-        log_debug('_fav_check_favourites() STEP 2: Search unlinked ROMs')
-        launchers_fav = set()
-        for rom_fav_ID in roms_fav: launchers_fav.add(roms_fav[rom_fav_ID]['launcherID'])
+            roms_fav[rom_fav_ID]['fav_status'] = 'OK'
+            launchers_fav.setdefault(roms_fav[rom_fav_ID]['launcherID'], []).append(rom_fav_ID)
 
-        # >> Traverse list of launchers. For each launcher, load ROMs it and check all favourite ROMs
-        # >> that belong to that launcher.
+        # >> Check the Favourites of every launcher.
+        romID_index = rom_index['romID']
         num_progress_items = len(launchers_fav)
         i = 0
-        pDialog.create('Advanced Emulator Launcher', 'Checking Favourite ROMs. Step 2 of 3...')
         for launcher_id in launchers_fav:
             pDialog.update(i * 100 / num_progress_items)
             i += 1
+            if launcher_id not in self.launchers:
+                for rom_fav_ID in launchers_fav[launcher_id]:
+                    log_verb('Fav ROM "{0}" Unlinked Launcher because launcherID not in self.launchers'.format(roms_fav[rom_fav_ID]['m_name']))
+                    roms_fav[rom_fav_ID]['fav_status'] = 'Unlinked Launcher'
+                    self.num_fav_ulauncher += 1
+                continue
+            for rom_fav_ID in launchers_fav[launcher_id]:
+                if romID_index.get(roms_fav[rom_fav_ID]['id']) != launcher_id:
+                    log_verb('Fav ROM "{0}" Unlinked ROM because romID not in launcher ROMs'.format(roms_fav[rom_fav_ID]['m_name']))
+                    roms_fav[rom_fav_ID]['fav_status'] = 'Unlinked ROM'
+                    self.num_fav_urom += 1
+        pDialog.update(100)
 
-            # >> If Favourite does not have launcher skip it. It has been marked as 'Unlinked Launcher'
-            # >> in step 1.
-            if launcher_id not in self.launchers: continue
-
-            # >> Load launcher ROMs
-            roms = fs_load_ROMs_JSON(ROMS_DIR, self.launchers[launcher_id]['roms_base_noext'])
-
-            # Traverse all favourites and check them if belong to this launcher.
-            # This should be efficient because traversing favourites is cheap but loading ROMs is expensive.
-            for rom_fav_ID in roms_fav:
-                if roms_fav[rom_fav_ID]['launcherID'] == launcher_id:
-                    # Check if ROM ID exists
-                    if roms_fav[rom_fav_ID]['id'] not in roms:
-                        log_verb('Fav ROM "{0}" Unlinked ROM because romID not in launcher ROMs'.format(roms_fav[rom_fav_ID]['m_name']))
-                        roms_fav[rom_fav_ID]['fav_status'] = 'Unlinked ROM'
-                        self.num_fav_urom += 1
-        pDialog.update(i * 100 / num_progress_items)
-        pDialog.close()
-
-        # STEP 3: Check if file exists. Even if the ROM ID is not there because user
+        # STEP 2: Check if file exists. Even if the ROM ID is not there because user
         # deleted ROM or launcher, the file may still be there.
-        log_debug('_fav_check_favourites() STEP 3: Search broken ROMs')
-        num_progress_items = len(launchers_fav)
-        i = 0
-        pDialog.create('Advanced Emulator Launcher', 'Checking Favourite ROMs. Step 3 of 3...')
+        log_debug('_fav_check_favourites() STEP 2: Search broken ROMs')
+        pDialog.update(0, 'Checking Favourite ROMs. Step 2 of 2...')
+        fav_paths = {}
         for rom_fav_ID in roms_fav:
-            pDialog.update(i * 100 / num_progress_items)
-            i += 1
-            romFile = FileName(roms_fav[rom_fav_ID]['filename'])
-            if not romFile.exists():
+            fav_paths[rom_fav_ID] = FileName(roms_fav[rom_fav_ID]['filename']).getPath()
+        existing_files = misc_check_files_exist(
+            fav_paths.values(), progress_cb = lambda done, total: pDialog.update(done * 100 / total))
+        for rom_fav_ID in roms_fav:
+            if fav_paths[rom_fav_ID] not in existing_files:
                 log_verb('Fav ROM "{0}" broken because filename does not exist'.format(roms_fav[rom_fav_ID]['m_name']))
                 roms_fav[rom_fav_ID]['fav_status'] = 'Broken'
                 self.num_fav_broken += 1
-        pDialog.update(i * 100 / num_progress_items)
+        pDialog.update(100)
         pDialog.close()
 
     #
@@ -4175,6 +4542,7 @@ class Main:
         self._misc_set_AEL_Content(AEL_CONTENT_VALUE_LAUNCHERS)
 
         # --- Load collection index ---
+        loading_ticks_start = time.time()
         (collections, update_timestamp) = fs_load_Collection_index_XML(COLLECTIONS_FILE_PATH)
 
         # --- If the virtual category has no launchers then render nothing ---
@@ -4184,6 +4552,8 @@ class Main:
             return
 
         # --- Render collections as categories ---
+        rendering_ticks_start = time.time()
+        items = []
         for collection_id in collections:
             # --- Create listitem ---
             collection = collections[collection_id]
@@ -4237,14 +4607,17 @@ class Main:
 
             # >> Use ROMs renderer to display collection ROMs
             url_str = self._misc_url('SHOW_COLLECTION_ROMS', VCATEGORY_COLLECTIONS_ID, collection_id)
-            xbmcplugin.addDirectoryItem(handle = self.addon_handle, url = url_str, listitem = listitem, isFolder = True)
+            items.append((url_str, listitem, True))
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_collections', loading_ticks_start, rendering_ticks_start, num_items)
 
     def _command_render_collection_ROMs(self, categoryID, launcherID):
         self._misc_set_default_sorting_method()
         self._misc_set_AEL_Content(AEL_CONTENT_VALUE_ROMS)
 
         # --- Load Collection index and ROMs ---
+        loading_ticks_start = time.time()
         (collections, update_timestamp) = fs_load_Collection_index_XML(COLLECTIONS_FILE_PATH)
         collection = collections[launcherID]
         roms_json_file = COLLECTIONS_DIR.join(collection['roms_base_noext'] + '.json')
@@ -4255,9 +4628,13 @@ class Main:
             return
 
         # --- Display Collection ---
+        rendering_ticks_start = time.time()
+        items = []
         for rom in collection_rom_list:
-            self._gui_render_rom_row(categoryID, launcherID, rom, False)
+            items.append(self._gui_render_rom_row(categoryID, launcherID, rom, False))
+        num_items = self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
+        self._misc_log_render_times('_command_render_collection_ROMs', loading_ticks_start, rendering_ticks_start, num_items)
 
     #
     # Adds a new collection
@@ -4914,9 +5291,7 @@ class Main:
         elif categoryID == VCATEGORY_CATEGORY_ID:
             roms = fs_load_VCategory_ROMs_JSON(VIRTUAL_CAT_CATEGORY_DIR, launcherID)
         else:
-            rom_file_path = ROMS_DIR.join(self.launchers[launcherID]['roms_base_noext'] + '.json')
-            log_debug('_command_search_launcher() rom_file_path "{0}"'.format(rom_file_path.getOriginalPath()))
-            if not rom_file_path.exists():
+            if not fs_ROMs_database_exists(ROMS_DIR, self.launchers[launcherID]['roms_base_noext']):
                 kodi_notify('Launcher JSON not found. Add ROMs to Launcher')
                 return
             roms = fs_load_ROMs_JSON(ROMS_DIR, self.launchers[launcherID]['roms_base_noext'])
@@ -5040,8 +5415,7 @@ class Main:
         elif categoryID == VCATEGORY_CATEGORY_ID:
             roms = fs_load_VCategory_ROMs_JSON(VIRTUAL_CAT_CATEGORY_DIR, launcherID)
         else:
-            rom_file_path = ROMS_DIR.join(self.launchers[launcherID]['roms_base_noext'] + '.json')
-            if not rom_file_path.exists():
+            if not fs_ROMs_database_exists(ROMS_DIR, self.launchers[launcherID]['roms_base_noext']):
                 kodi_notify('Launcher JSON not found. Add ROMs to Launcher')
                 return
             roms = fs_load_ROMs_JSON(ROMS_DIR, self.launchers[launcherID]['roms_base_noext'])
@@ -5071,8 +5445,10 @@ class Main:
         self._misc_set_all_sorting_methods()
         if not rl:
             kodi_dialog_OK('Search returned no results')
+        items = []
         for key in sorted(rl.iterkeys()):
-            self._gui_render_rom_row(categoryID, launcherID, rl[key], False, False)
+            items.append(self._gui_render_rom_row(categoryID, launcherID, rl[key], False, False))
+        self._gui_add_directory_items(items)
         xbmcplugin.endOfDirectory(handle = self.addon_handle, succeeded = True, cacheToDisc = False)
 
     #
@@ -5553,6 +5929,8 @@ class Main:
 
     #
     # Updated all virtual categories DB
+    # Only the ROMs of launchers changed since the last update are processed. Virtual categories
+    # without a database are built from scratch, loading the ROMs of all launchers only once.
     #
     def _command_update_virtual_category_db_all(self):
         # --- Sanity checks ---
@@ -5560,15 +5938,11 @@ class Main:
             kodi_dialog_OK('You do not have any ROM Launcher. Add a ROM Launcher first.')
             return
 
-        # --- Update all virtual launchers ---
-        self._command_update_virtual_category_db(VCATEGORY_TITLE_ID)
-        self._command_update_virtual_category_db(VCATEGORY_YEARS_ID)
-        self._command_update_virtual_category_db(VCATEGORY_GENRE_ID)
-        self._command_update_virtual_category_db(VCATEGORY_STUDIO_ID)        
-        self._command_update_virtual_category_db(VCATEGORY_NPLAYERS_ID)
-        self._command_update_virtual_category_db(VCATEGORY_ESRB_ID)
-        self._command_update_virtual_category_db(VCATEGORY_RATING_ID)
-        self._command_update_virtual_category_db(VCATEGORY_CATEGORY_ID)
+        pDialog = xbmcgui.DialogProgress()
+        vcategory_info_list = [self._vcategory_get_info(vcat_id) for vcat_id in VCATEGORY_DB_ID_LIST]
+        full_rebuild_list = self._vcategory_update_incremental(vcategory_info_list, pDialog)
+        if full_rebuild_list is None: return
+        if full_rebuild_list and not self._vcategory_update_full(full_rebuild_list, pDialog): return
         kodi_notify('All virtual categories updated')
 
     #
@@ -5576,109 +5950,200 @@ class Main:
     #
     def _command_update_virtual_category_db(self, virtual_categoryID):
         # --- Customise function depending on virtual category ---
-        if virtual_categoryID == VCATEGORY_TITLE_ID:
-            log_info('_command_update_virtual_category_db() Updating Titles DB')
-            vcategory_db_directory = VIRTUAL_CAT_TITLE_DIR
-            vcategory_db_filename  = VCAT_TITLE_FILE_PATH
-            vcategory_field_name   = 'm_name'
-            vcategory_name         = 'Titles'
-        elif virtual_categoryID == VCATEGORY_YEARS_ID:
-            log_info('_command_update_virtual_category_db() Updating Years DB')
-            vcategory_db_directory = VIRTUAL_CAT_YEARS_DIR
-            vcategory_db_filename  = VCAT_YEARS_FILE_PATH
-            vcategory_field_name   = 'm_year'
-            vcategory_name         = 'Years'
-        elif virtual_categoryID == VCATEGORY_GENRE_ID:
-            log_info('_command_update_virtual_category_db() Updating Genres DB')
-            vcategory_db_directory = VIRTUAL_CAT_GENRE_DIR
-            vcategory_db_filename  = VCAT_GENRE_FILE_PATH
-            vcategory_field_name   = 'm_genre'
-            vcategory_name         = 'Genres'
-        elif virtual_categoryID == VCATEGORY_STUDIO_ID:
-            log_info('_command_update_virtual_category_db() Updating Studios DB')
-            vcategory_db_directory = VIRTUAL_CAT_STUDIO_DIR
-            vcategory_db_filename  = VCAT_STUDIO_FILE_PATH
-            vcategory_field_name   = 'm_studio'
-            vcategory_name         = 'Studios'
-        elif virtual_categoryID == VCATEGORY_NPLAYERS_ID:
-            log_info('_command_update_virtual_category_db() Updating NPlayers DB')
-            vcategory_db_directory = VIRTUAL_CAT_NPLAYERS_DIR
-            vcategory_db_filename  = VCAT_NPLAYERS_FILE_PATH
-            vcategory_field_name   = 'm_nplayers'
-            vcategory_name         = 'NPlayers'
-        elif virtual_categoryID == VCATEGORY_ESRB_ID:
-            log_info('_command_update_virtual_category_db() Updating ESRB DB')
-            vcategory_db_directory = VIRTUAL_CAT_ESRB_DIR
-            vcategory_db_filename  = VCAT_ESRB_FILE_PATH
-            vcategory_field_name   = 'm_esrb'
-            vcategory_name         = 'ESRB'
-        elif virtual_categoryID == VCATEGORY_RATING_ID:
-            log_info('_command_update_virtual_category_db() Updating Rating DB')
-            vcategory_db_directory = VIRTUAL_CAT_RATING_DIR
-            vcategory_db_filename  = VCAT_RATING_FILE_PATH
-            vcategory_field_name   = 'm_rating'
-            vcategory_name         = 'Rating'
-        elif virtual_categoryID == VCATEGORY_CATEGORY_ID:
-            log_info('_command_update_virtual_category_db() Updating Categories DB')
-            vcategory_db_directory = VIRTUAL_CAT_CATEGORY_DIR
-            vcategory_db_filename  = VCAT_CATEGORY_FILE_PATH
-            vcategory_field_name   = ''
-            vcategory_name         = 'Categories'
-        else:
+        vcategory_info = self._vcategory_get_info(virtual_categoryID)
+        if vcategory_info is None:
             log_error('_command_update_virtual_category_db() Wrong virtual_category_kind = {0}'.format(virtual_categoryID))
             kodi_dialog_OK('Wrong virtual_category_kind = {0}'.format(virtual_categoryID))
             return
+        log_info('_command_update_virtual_category_db() Updating {0} DB'.format(vcategory_info['name']))
 
         # --- Sanity checks ---
         if len(self.launchers) == 0:
             kodi_dialog_OK('You do not have any ROM Launcher. Add a ROM Launcher first.')
             return
 
-        # --- Delete previous hashed database XMLs ---
-        log_info('_command_update_virtual_category_db() Cleaning hashed database old XMLs')
-        for the_file in vcategory_db_directory.scanFilesInPathAsPaths('*.*'):
-            file_extension = the_file.getExt()
-            if file_extension.lower() != '.xml' and file_extension.lower() != '.json':
-                # >> There should be only XMLs or JSON in this directory
-                log_error('_command_update_virtual_category_db() Non XML/JSON file "{0}"'.format(the_file.getPath()))
-                log_error('_command_update_virtual_category_db() Skipping it from deletion')
-                continue
-            log_verb('_command_update_virtual_category_db() Deleting "{0}"'.format(the_file.getPath()))
-            try:
-                if the_file.exists():
-                    the_file.unlink()
-            except Exception as e:
-                log_error('_command_update_virtual_category_db() Excepcion deleting hashed DB XMLs')
-                log_error('_command_update_virtual_category_db() {0}'.format(e))
-                return
-
         # --- Progress dialog ---
         # >> Important to avoid multithread execution of the plugin and race conditions
         pDialog = xbmcgui.DialogProgress()
-        pDialog_canceled = False
+        full_rebuild_list = self._vcategory_update_incremental([vcategory_info], pDialog)
+        if full_rebuild_list: self._vcategory_update_full(full_rebuild_list, pDialog)
 
+    #
+    # Builds the databases of the virtual categories in vcategory_info_list from scratch.
+    # ROMs of all launchers are loaded once and all the virtual categories are computed in
+    # the same pass over the ROMs. Returns True if success, False otherwise.
+    #
+    def _vcategory_update_full(self, vcategory_info_list, pDialog):
         # --- Make a big dictionary will all the ROMs ---
-        log_verb('_command_update_virtual_category_db() Creating list of all ROMs in all Launchers')
+        all_roms = self._vcategory_load_all_ROMs(pDialog)
+        if all_roms is None: return False
+
+        # --- Create the hashed databases of all virtual categories in one pass ---
+        log_verb('_vcategory_update_full() Creating hashed databases')
+        vcategory_vlaunchers = self._vcategory_make_hashed_DBs(vcategory_info_list, all_roms)
+
+        # --- Write hashed distributed database JSON files ---
+        launchers_info = self._vcategory_get_launchers_info()
+        for i, vcategory_info in enumerate(vcategory_info_list):
+            if not self._vcategory_write_hashed_DB(vcategory_info, vcategory_vlaunchers[i],
+                                                   launchers_info, pDialog): return False
+
+        return True
+
+    #
+    # Updates the databases of the virtual categories in vcategory_info_list. Only the ROMs of
+    # launchers added, changed or deleted since the last update are loaded, and only the virtual
+    # launchers containing ROMs of those launchers are written.
+    # Returns the list of virtual categories that need a full rebuild (no database or database
+    # created by an older AEL version without launchers state) or None if error.
+    #
+    def _vcategory_update_incremental(self, vcategory_info_list, pDialog):
+        launchers_info = self._vcategory_get_launchers_info()
+        full_rebuild_list = []
+        update_list = []
+        changed_launchers = set()
+        for vcategory_info in vcategory_info_list:
+            (update_timestamp, vlaunchers, old_launchers_info) = fs_load_VCategory_index(vcategory_info['db_file'])
+            if not vcategory_info['db_file'].exists() or (vlaunchers and not old_launchers_info):
+                log_verb('_vcategory_update_incremental() {0} needs full rebuild'.format(vcategory_info['name']))
+                full_rebuild_list.append(vcategory_info)
+                continue
+            changed = self._vcategory_get_changed_launchers(old_launchers_info, launchers_info)
+            log_verb('_vcategory_update_incremental() {0} has {1} changed launchers'.format(
+                vcategory_info['name'], len(changed)))
+            if not changed: continue
+            update_list.append((vcategory_info, vlaunchers, changed))
+            changed_launchers.update(changed)
+        if not update_list: return full_rebuild_list
+
+        # --- Load ROMs of changed launchers. Deleted launchers have no ROMs ---
+        changed_roms = self._vcategory_load_all_ROMs(pDialog, changed_launchers)
+        if changed_roms is None: return None
+
+        # --- Patch the hashed databases ---
+        for (vcategory_info, vlaunchers, changed) in update_list:
+            self._vcategory_patch_hashed_DB(vcategory_info, vlaunchers, changed, changed_roms,
+                                            launchers_info, pDialog)
+
+        return full_rebuild_list
+
+    #
+    # Called after the ROM scanner. Updates the virtual categories already built, if any.
+    #
+    def _vcategory_update_after_scan(self):
+        vcategory_info_list = [self._vcategory_get_info(vcat_id) for vcat_id in VCATEGORY_DB_ID_LIST]
+        vcategory_info_list = [v for v in vcategory_info_list if v['db_file'].exists()]
+        if not vcategory_info_list: return
+        log_info('_vcategory_update_after_scan() Updating virtual categories')
+        pDialog = xbmcgui.DialogProgress()
+        full_rebuild_list = self._vcategory_update_incremental(vcategory_info_list, pDialog)
+        # >> Databases of older AEL versions are not rebuilt here because it takes a long time.
+        for vcategory_info in full_rebuild_list or []:
+            log_info('_vcategory_update_after_scan() {0} DB must be updated manually'.format(vcategory_info['name']))
+
+    #
+    # Returns a dictionary with the paths and ROM field of a virtual category or None if
+    # virtual_categoryID is wrong. For the Title and Category virtual categories field is ''.
+    #
+    def _vcategory_get_info(self, virtual_categoryID):
+        if virtual_categoryID == VCATEGORY_TITLE_ID:
+            vcategory_info = {'db_dir' : VIRTUAL_CAT_TITLE_DIR, 'db_file' : VCAT_TITLE_FILE_PATH,
+                              'field' : '', 'name' : 'Titles'}
+        elif virtual_categoryID == VCATEGORY_YEARS_ID:
+            vcategory_info = {'db_dir' : VIRTUAL_CAT_YEARS_DIR, 'db_file' : VCAT_YEARS_FILE_PATH,
+                              'field' : 'm_year', 'name' : 'Years'}
+        elif virtual_categoryID == VCATEGORY_GENRE_ID:
+            vcategory_info = {'db_dir' : VIRTUAL_CAT_GENRE_DIR, 'db_file' : VCAT_GENRE_FILE_PATH,
+                              'field' : 'm_genre', 'name' : 'Genres'}
+        elif virtual_categoryID == VCATEGORY_STUDIO_ID:
+            vcategory_info = {'db_dir' : VIRTUAL_CAT_STUDIO_DIR, 'db_file' : VCAT_STUDIO_FILE_PATH,
+                              'field' : 'm_studio', 'name' : 'Studios'}
+        elif virtual_categoryID == VCATEGORY_NPLAYERS_ID:
+            vcategory_info = {'db_dir' : VIRTUAL_CAT_NPLAYERS_DIR, 'db_file' : VCAT_NPLAYERS_FILE_PATH,
+                              'field' : 'm_nplayers', 'name' : 'NPlayers'}
+        elif virtual_categoryID == VCATEGORY_ESRB_ID:
+            vcategory_info = {'db_dir' : VIRTUAL_CAT_ESRB_DIR, 'db_file' : VCAT_ESRB_FILE_PATH,
+                              'field' : 'm_esrb', 'name' : 'ESRB'}
+        elif virtual_categoryID == VCATEGORY_RATING_ID:
+            vcategory_info = {'db_dir' : VIRTUAL_CAT_RATING_DIR, 'db_file' : VCAT_RATING_FILE_PATH,
+                              'field' : 'm_rating', 'name' : 'Rating'}
+        elif virtual_categoryID == VCATEGORY_CATEGORY_ID:
+            vcategory_info = {'db_dir' : VIRTUAL_CAT_CATEGORY_DIR, 'db_file' : VCAT_CATEGORY_FILE_PATH,
+                              'field' : '', 'name' : 'Categories'}
+        else:
+            return None
+        vcategory_info['id'] = virtual_categoryID
+
+        return vcategory_info
+
+    #
+    # Returns the category name of a launcher or None if the launcher categoryID is wrong.
+    #
+    def _vcategory_get_category_name(self, launcher):
+        categoryID = launcher['categoryID']
+        if categoryID in self.categories:
+            return self.categories[categoryID]['m_name']
+        elif categoryID == VCATEGORY_ADDONROOT_ID:
+            return 'Root category'
+
+        return None
+
+    #
+    # Returns the state of the ROM launchers stored in the virtual category databases.
+    # If the state of a launcher changes its ROMs in the virtual categories are outdated.
+    #
+    def _vcategory_get_launchers_info(self):
+        launchers_info = {}
+        for launcher_id in self.launchers:
+            launcher = self.launchers[launcher_id]
+            if launcher['rompath'] == '': continue
+            category_name = self._vcategory_get_category_name(launcher)
+            launchers_info[launcher_id] = {'timestamp_launcher' : unicode(launcher['timestamp_launcher']),
+                                           'category_name'      : category_name if category_name else ''}
+
+        return launchers_info
+
+    #
+    # Returns the set of launcher IDs added, changed or deleted.
+    #
+    def _vcategory_get_changed_launchers(self, old_launchers_info, launchers_info):
+        changed_launchers = set()
+        for launcher_id in launchers_info:
+            if launcher_id not in old_launchers_info or \
+               old_launchers_info[launcher_id] != launchers_info[launcher_id]:
+                changed_launchers.add(launcher_id)
+        for launcher_id in old_launchers_info:
+            if launcher_id not in launchers_info: changed_launchers.add(launcher_id)
+
+        return changed_launchers
+
+    #
+    # Loads the ROMs of all launchers and converts them to Favourite ROMs. If launcher_IDs is
+    # not None only the ROMs of those launchers are loaded.
+    # Returns a dictionary with all the ROMs or None if error.
+    #
+    def _vcategory_load_all_ROMs(self, pDialog, launcher_IDs = None):
+        log_verb('_vcategory_load_all_ROMs() Creating list of all ROMs in all Launchers')
         all_roms = {}
-        num_launchers = len(self.launchers)
+        if launcher_IDs is None: launcher_IDs = self.launchers.keys()
+        launcher_IDs = [x for x in launcher_IDs if x in self.launchers]
+        num_launchers = len(launcher_IDs)
         i = 0
         pDialog.create('Advanced Emulator Launcher', 'Making ROM list...')
-        for launcher_id in self.launchers:
+        for launcher_id in launcher_IDs:
             # >> Update dialog
             pDialog.update(i * 100 / num_launchers)
             i += 1
 
             # >> Get current launcher
             launcher = self.launchers[launcher_id]
-            categoryID = launcher['categoryID']
-            if categoryID in self.categories:
-                category_name = self.categories[categoryID]['m_name']
-            elif categoryID == VCATEGORY_ADDONROOT_ID:
-                category_name = 'Root category'
-            else:
-                log_error('_command_update_virtual_category_db() Wrong categoryID = {0}'.format(categoryID))
+            category_name = self._vcategory_get_category_name(launcher)
+            if category_name is None:
+                categoryID = launcher['categoryID']
+                log_error('_vcategory_load_all_ROMs() Wrong categoryID = {0}'.format(categoryID))
+                pDialog.close()
                 kodi_dialog_OK('Wrong categoryID = {0}. Report this bug please.'.format(categoryID))
-                return
+                return None
 
             # >> If launcher is standalone skip
             if launcher['rompath'] == '': continue
@@ -5688,42 +6153,71 @@ class Main:
 
             # >> Add additional fields to ROM to make a Favourites ROM
             # >> Virtual categories/launchers are like Favourite ROMs that cannot be edited.
-            # >> NOTE roms is updated by assigment, dictionaries are mutable
-            fav_roms = {}
             for rom_id in roms:
                 fav_rom = fs_get_Favourite_from_ROM(roms[rom_id], launcher)
                 # >> Add the category this ROM belongs to.
                 fav_rom['category_name'] = category_name
-                fav_roms[rom_id] = fav_rom
-
-            # >> Update dictionary
-            all_roms.update(fav_roms)
+                all_roms[rom_id] = fav_rom
         pDialog.update(100)
         pDialog.close()
 
-        # --- Create a dictionary that with key the virtual category and value a dictionay of roms
-        #     belonging to that virtual category ---
-        # TODO It would be nice to have a progress dialog here...
-        log_verb('_command_update_virtual_category_db() Creating hashed database')
-        virtual_launchers = {}
+        return all_roms
+
+    #
+    # Groups all_roms by every virtual category in vcategory_info_list in a single pass.
+    # Returns a list with one dictionary per virtual category, in the same order, with key the
+    # virtual launcher name and value a dictionary of the ROMs belonging to that virtual launcher.
+    # ROM dictionaries are shared between virtual categories, they are not modified.
+    #
+    def _vcategory_make_hashed_DBs(self, vcategory_info_list, all_roms):
+        vcategory_vlaunchers = [{} for vcategory_info in vcategory_info_list]
         for rom_id in all_roms:
             rom = all_roms[rom_id]
-            if virtual_categoryID == VCATEGORY_TITLE_ID:
-                vcategory_key = rom['m_name'][0].upper()
-            elif virtual_categoryID == VCATEGORY_CATEGORY_ID:
-                vcategory_key = rom['category_name']
-            else:
-                vcategory_key = rom[vcategory_field_name]
-            # >> '' is a special case
-            if vcategory_key == '': vcategory_key = '[ Not set ]'
-            if vcategory_key in virtual_launchers:
-                virtual_launchers[vcategory_key][rom['id']] = rom
-            else:
-                virtual_launchers[vcategory_key] = {rom['id'] : rom}
+            for i, vcategory_info in enumerate(vcategory_info_list):
+                if vcategory_info['id'] == VCATEGORY_TITLE_ID:
+                    vcategory_key = rom['m_name'][0].upper() if rom['m_name'] else ''
+                elif vcategory_info['id'] == VCATEGORY_CATEGORY_ID:
+                    vcategory_key = rom['category_name']
+                else:
+                    vcategory_key = rom[vcategory_info['field']]
+                # >> '' is a special case
+                if vcategory_key == '': vcategory_key = '[ Not set ]'
+                virtual_launchers = vcategory_vlaunchers[i]
+                if vcategory_key in virtual_launchers:
+                    virtual_launchers[vcategory_key][rom['id']] = rom
+                else:
+                    virtual_launchers[vcategory_key] = {rom['id'] : rom}
+
+        return vcategory_vlaunchers
+
+    #
+    # Deletes the old hashed database of a virtual category and writes the new one.
+    # Returns True if success, False otherwise.
+    #
+    def _vcategory_write_hashed_DB(self, vcategory_info, virtual_launchers, launchers_info, pDialog):
+        vcategory_db_directory = vcategory_info['db_dir']
+        vcategory_name         = vcategory_info['name']
+
+        # --- Delete previous hashed database XMLs ---
+        log_info('_vcategory_write_hashed_DB() Cleaning {0} hashed database old XMLs'.format(vcategory_name))
+        for the_file in vcategory_db_directory.scanFilesInPathAsPaths('*.*'):
+            file_extension = the_file.getExt()
+            if file_extension.lower() != '.xml' and file_extension.lower() != '.json':
+                # >> There should be only XMLs or JSON in this directory
+                log_error('_vcategory_write_hashed_DB() Non XML/JSON file "{0}"'.format(the_file.getPath()))
+                log_error('_vcategory_write_hashed_DB() Skipping it from deletion')
+                continue
+            log_verb('_vcategory_write_hashed_DB() Deleting "{0}"'.format(the_file.getPath()))
+            try:
+                if the_file.exists():
+                    the_file.unlink()
+            except Exception as e:
+                log_error('_vcategory_write_hashed_DB() Excepcion deleting hashed DB XMLs')
+                log_error('_vcategory_write_hashed_DB() {0}'.format(e))
+                return False
 
-        # --- Write hashed distributed database XML files ---
-        # TODO It would be nice to have a progress dialog here...
-        log_verb('_command_update_virtual_category_db() Writing hashed database JSON files')
+        # --- Write hashed distributed database JSON files ---
+        log_verb('_vcategory_write_hashed_DB() Writing {0} hashed database JSON files'.format(vcategory_name))
         vcategory_launchers = {}
         num_vlaunchers = len(virtual_launchers)
         i = 0
@@ -5736,27 +6230,89 @@ class Main:
             # >> Create VLauncher UUID
             vlauncher_id_md5   = hashlib.md5(vlauncher_id.encode('utf-8'))
             hashed_db_UUID     = vlauncher_id_md5.hexdigest()
-            log_debug('_command_update_virtual_category_db() vlauncher_id       "{0}"'.format(vlauncher_id))
-            log_debug('_command_update_virtual_category_db() hashed_db_UUID     "{0}"'.format(hashed_db_UUID))
+            log_debug('_vcategory_write_hashed_DB() vlauncher_id       "{0}"'.format(vlauncher_id))
+            log_debug('_vcategory_write_hashed_DB() hashed_db_UUID     "{0}"'.format(hashed_db_UUID))
 
             # >> Virtual launcher ROMs are like Favourite ROMs. They contain all required fields to launch
             # >> the ROM, and also share filesystem I/O functions with Favourite ROMs.
             vlauncher_roms = virtual_launchers[vlauncher_id]
-            log_debug('_command_update_virtual_category_db() Number of ROMs = {0}'.format(len(vlauncher_roms)))
+            log_debug('_vcategory_write_hashed_DB() Number of ROMs = {0}'.format(len(vlauncher_roms)))
             fs_write_VCategory_ROMs_JSON(vcategory_db_directory, hashed_db_UUID, vlauncher_roms)
 
             # >> Create virtual launcher
-            vcategory_launchers[hashed_db_UUID] = {'id'              : hashed_db_UUID,
-                                                   'name'            : vlauncher_id,
-                                                   'rom_count'       : str(len(vlauncher_roms)),
-                                                   'roms_base_noext' : hashed_db_UUID }
+            vcategory_launchers[hashed_db_UUID] = self._vcategory_new_vlauncher(vlauncher_id, vlauncher_roms)
         pDialog.update(100)
         pDialog.close()
 
         # --- Write virtual launchers XML file ---
         # >> This file is small, no progress dialog
-        log_verb('_command_update_virtual_category_db() Writing virtual category XML index')
-        fs_write_VCategory_XML(vcategory_db_filename, vcategory_launchers)
+        log_verb('_vcategory_write_hashed_DB() Writing virtual category XML index')
+        fs_write_VCategory_XML(vcategory_info['db_file'], vcategory_launchers, launchers_info)
+
+        return True
+
+    #
+    # Patches the database of a virtual category. vlaunchers is the current virtual launchers index.
+    # ROMs of launchers in changed_launchers are removed from the virtual launchers and the ROMs in
+    # changed_roms of those launchers are added again. Empty virtual launchers are deleted.
+    #
+    def _vcategory_patch_hashed_DB(self, vcategory_info, vlaunchers, changed_launchers, changed_roms,
+                                   launchers_info, pDialog):
+        vcategory_db_directory = vcategory_info['db_dir']
+        log_info('_vcategory_patch_hashed_DB() Patching {0} hashed database'.format(vcategory_info['name']))
+        roms = {}
+        for rom_id in changed_roms:
+            if changed_roms[rom_id]['launcherID'] in changed_launchers: roms[rom_id] = changed_roms[rom_id]
+        new_vlaunchers = self._vcategory_make_hashed_DBs([vcategory_info], roms)[0]
+
+        # --- Load virtual launchers with ROMs of changed launchers and remove those ROMs ---
+        patched_vlaunchers = {}
+        for vlauncher_id in vlaunchers:
+            vlauncher = vlaunchers[vlauncher_id]
+            vlauncher_launchers = set(vlauncher['launchers'].split(',')) if vlauncher['launchers'] else set()
+            if vlauncher['name'] not in new_vlaunchers and not (vlauncher_launchers & changed_launchers):
+                continue
+            vlauncher_roms = fs_load_VCategory_ROMs_JSON(vcategory_db_directory, vlauncher['roms_base_noext'])
+            patched_vlaunchers[vlauncher['name']] = {}
+            for rom_id in vlauncher_roms:
+                if vlauncher_roms[rom_id]['launcherID'] not in changed_launchers:
+                    patched_vlaunchers[vlauncher['name']][rom_id] = vlauncher_roms[rom_id]
+
+        # --- Add ROMs of changed launchers ---
+        for vlauncher_name in new_vlaunchers:
+            if vlauncher_name not in patched_vlaunchers: patched_vlaunchers[vlauncher_name] = {}
+            patched_vlaunchers[vlauncher_name].update(new_vlaunchers[vlauncher_name])
+
+        # --- Write patched virtual launchers ---
+        num_vlaunchers = len(patched_vlaunchers)
+        i = 0
+        pDialog.create('Advanced Emulator Launcher', 'Updating {0} hashed database...'.format(vcategory_info['name']))
+        for vlauncher_name in patched_vlaunchers:
+            pDialog.update(i * 100 / num_vlaunchers)
+            i += 1
+            hashed_db_UUID = hashlib.md5(vlauncher_name.encode('utf-8')).hexdigest()
+            vlauncher_roms = patched_vlaunchers[vlauncher_name]
+            if vlauncher_roms:
+                fs_write_VCategory_ROMs_JSON(vcategory_db_directory, hashed_db_UUID, vlauncher_roms)
+                vlaunchers[hashed_db_UUID] = self._vcategory_new_vlauncher(vlauncher_name, vlauncher_roms)
+            else:
+                log_verb('_vcategory_patch_hashed_DB() Deleting empty virtual launcher "{0}"'.format(vlauncher_name))
+                json_FN = vcategory_db_directory.pjoin(hashed_db_UUID + '.json')
+                if json_FN.exists(): json_FN.unlink()
+                vlaunchers.pop(hashed_db_UUID, None)
+        pDialog.update(100)
+        pDialog.close()
+        fs_write_VCategory_XML(vcategory_info['db_file'], vlaunchers, launchers_info)
+
+    def _vcategory_new_vlauncher(self, vlauncher_name, vlauncher_roms):
+        hashed_db_UUID = hashlib.md5(vlauncher_name.encode('utf-8')).hexdigest()
+        vlauncher_launchers = set([vlauncher_roms[rom_id]['launcherID'] for rom_id in vlauncher_roms])
+
+        return {'id'              : hashed_db_UUID,
+                'name'            : vlauncher_name,
+                'rom_count'       : str(len(vlauncher_roms)),
+                'roms_base_noext' : hashed_db_UUID,
+                'launchers'       : ','.join(sorted(vlauncher_launchers)) }
 
     #
     # Import legacy Advanced Launcher launchers.xml
@@ -6022,7 +6578,7 @@ class Main:
                 kodi_dialog_OK('launcherID not found in self.launchers')
                 return
             launcher = self.launchers[launcherID]
-            roms = fs_load_ROMs_JSON(ROMS_DIR, launcher['roms_base_noext'])
+            roms = fs_load_ROM(ROMS_DIR, launcher['roms_base_noext'], romID)
             # --- Check ROM is in XML data just read ---
             if romID not in roms:
                 kodi_dialog_OK('romID not in roms dictionary')
@@ -6205,6 +6761,7 @@ class Main:
                 log_debug('_run_process() (Windows) Launching LNK ROM')
                 os.system('start "AEL" /b "{0}"'.format(arguments).encode('utf-8'))
             else:
+                import subprocess_hack
                 info = None
                 # >> cwd = apppath.encode('utf-8') fails if application path has Unicode on Windows
                 # >> Workaraound is to use cwd = apppath.encode(sys.getfilesystemencoding()) --> DOES NOT WORK
@@ -6229,6 +6786,7 @@ class Main:
             os.system('"{0}" {1}'.format(application, arguments).encode('utf-8'))
 
             # >> New way of launching, uses subproces module. Also, save child process stdout.
+            # import subprocess
             # if arguments:
             #     if arguments[0] == '"' and arguments[-1] == '"': arguments = arguments[1:-1]
             #     with open(LAUNCH_LOG_FILE_PATH, 'w') as f:
@@ -6673,7 +7231,7 @@ class Main:
         # --- Format title ---
         scan_clean_tags = self.settings['scan_clean_tags']
         ROMFile = FileName(romfile)
-        rom_name = text_format_ROM_title(ROMFile.getBase_noext(), scan_clean_tags)
+        rom_name = rom_name_format_title(ROMFile.getBase_noext(), scan_clean_tags)
 
         # ~~~ Check asset dirs and disable scanning for unset dirs ~~~
         # >> Do not warn about unconfigured dirs here
@@ -6730,6 +7288,8 @@ class Main:
     # Note that actually this command is "Add/Update" ROMs.
     #
     def _roms_import_roms(self, launcherID):
+        from net_IO import net_set_max_connections_per_host, net_cache_log_stats
+        from scrap_pipeline import ScraperPipeline
         log_debug('========== _roms_import_roms() BEGIN ==================================================')
 
         # --- Get information from launcher ---
@@ -6770,65 +7330,62 @@ class Main:
             return
         else:
             log_info('No duplicated asset dirs found')
+        # >> Asset directories are listed once instead of looking for every asset of every ROM.
+        self.asset_dir_index = AssetDirIndex()
 
         # --- Progress dialog ---
         # Put in in object variables so it can be access in helper functions.
         self.pDialog = xbmcgui.DialogProgress()
         self.pDialog_canceled = False
 
-        # ~~~~~ Remove dead entries ~~~~~
-        num_removed_roms = 0
-        log_info('Launcher ROM database contain {0} items'.format(len(roms)))
-        if num_roms > 0:
-            log_debug('Starting dead items scan')
-            i = 0
-            self.pDialog.create('Advanced Emulator Launcher',
-                                'Checking for dead entries...', "Path '{0}'".format(launcher_path))
-            for key in sorted(roms.iterkeys()):
-                log_debug('Searching {0}'.format(roms[key]['filename']))
-                self.pDialog.update(i * 100 / num_roms)
-                i += 1
-                fileName = FileName(roms[key]['filename'])
-                if not fileName.exists():
-                    log_debug('Not found')
-                    log_debug('Deleting from DB {0}'.format(roms[key]['filename']))
-                    del roms[key]
-                    num_removed_roms += 1
-            self.pDialog.update(i * 100 / num_roms)
-            self.pDialog.close()
-            if num_removed_roms > 0:
-                kodi_notify('{0} dead ROMs removed successfully'.format(num_removed_roms))
-                log_info('{0} dead ROMs removed successfully'.format(num_removed_roms))
-            else:
-                log_info('No dead ROMs found')
-        else:
-            log_info('Launcher is empty. No dead ROM check.')
-
-        # ~~~ Scan for new files (*.*) and put them in a list ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        kodi_busydialog_ON()
-        files = []
+        # ~~~ Scan ROM path and process new files ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # >> The scan manifest stores the directories and files found in the last completed scan.
+        # >> Unchanged directories are not listed again and only new files are processed.
+        # >> If the launcher is empty do a full scan (user may have deleted the ROMs).
+        # >> Files are processed as soon as the walker finds them. The total number of files is
+        # >> not known until the walk finishes so progress is estimated with the last scan.
+        scan_recursive = self.settings['scan_recursive']
+        scan_ignore_bios = self.settings['scan_ignore_bios']
         log_info('Scanning files in {0}'.format(launcher_path.getPath()))
-        if self.settings['scan_recursive']:
-            log_info('Recursive scan activated')
-            files = launcher_path.recursiveScanFilesInPath('*.*')
-        else:
-            log_info('Recursive scan not activated')
-            files = launcher_path.scanFilesInPath('*.*')
-        kodi_busydialog_OFF()
-        num_files = len(files)
-        log_info('Found {0} files'.format(num_files))
+        log_info('Recursive scan {0}'.format('activated' if scan_recursive else 'not activated'))
+        old_manifest = {}
+        if self.settings['scan_incremental'] and num_roms > 0:
+            old_manifest = fs_load_ROMs_manifest(ROMS_DIR, launcher['roms_base_noext'])
+            if not fs_check_ROMs_manifest(old_manifest, launcher, scan_recursive, scan_ignore_bios):
+                old_manifest = {}
+        log_info('Incremental scan {0}'.format('activated' if old_manifest else 'not activated'))
+        old_files_set = fs_get_ROMs_manifest_file_set(old_manifest)
+        num_files_estimated = len(old_files_set) if old_manifest else num_roms
+        manifest = fs_new_ROMs_manifest(launcher, scan_recursive, scan_ignore_bios)
+
+        # ~~~ Build ROM hash index once so duplicate and multidisc checks are O(1) ~~~~~~~~~~~~~~~~~
+        roms_idx = ROMScannerIndex(roms)
+        old_rom_ids = sorted(roms.iterkeys())
+
+        # ~~~ Start scraping pipeline if automatic scraping is used ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # >> Semi-automatic scraping is done serially in the main thread.
+        # >> scan_metadata_policy values="None|NFO Files|NFO Files + Scrapers|Scrapers only"
+        # >> scan_asset_policy values="Local Images|Local Images + Scrapers|Scrapers only"
+        self.scraper_pipeline = None
+        auto_metadata = self.settings['scan_metadata_policy'] >= 2 and self.settings['metadata_scraper_mode'] == 1
+        auto_asset    = self.settings['scan_asset_policy'] >= 1 and self.settings['asset_scraper_mode'] == 1
+        if self.settings['scraper_threads'] > 1 and (auto_metadata or auto_asset):
+            log_info('Scraping pipeline activated ({0} threads)'.format(self.settings['scraper_threads']))
+            net_set_max_connections_per_host(self.settings['scraper_connections_per_host'])
+            self.scraper_pipeline = ScraperPipeline(self.scraper_metadata, self.scraper_asset,
+                                                    self.settings['scraper_threads'])
 
         # ~~~ Now go processing file by file ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.pDialog.create('Advanced Emulator Launcher', 'Scanning {0}'.format(launcher_path))
         log_debug('==================== Processing ROMs ====================')
         num_new_roms = 0
         num_files_checked = 0
-        for f_path in files:
+        for ROM in fs_walk_ROMs_manifest(launcher_path, launcher, scan_recursive, old_manifest, manifest):
             # --- Get all file name combinations ---
-            ROM = FileName(f_path)
+            f_path = ROM.getPath()
             log_debug('========== Processing File ==========')
-            log_debug('ROM.getPath()         "{0}"'.format(ROM.getPath()))
-            log_debug('ROM.getOriginalPath() "{0}"'.format(ROM.getOriginalPath()))
+            log_debug('ROM.getPath()         "{0}"', ROM.getPath())
+            log_debug('ROM.getOriginalPath() "{0}"', ROM.getOriginalPath())
             # log_debug('ROM.getPath_noext()   "{0}"'.format(ROM.getPath_noext()))
             # log_debug('ROM.getDir()          "{0}"'.format(ROM.getDir()))
             # log_debug('ROM.getBase()         "{0}"'.format(ROM.getBase()))
@@ -6836,25 +7393,21 @@ class Main:
             # log_debug('ROM.getExt()          "{0}"'.format(ROM.getExt()))
 
             # ~~~ Update progress dialog ~~~
-            self.progress_number = num_files_checked * 100 / num_files
+            if num_files_estimated > 0:
+                self.progress_number = min(num_files_checked * 100 / num_files_estimated, 100)
+            else:
+                self.progress_number = 0
             self.file_text       = 'ROM {0}'.format(ROM.getBase())
-            activity_text        = 'Checking if has ROM extension...'
+            activity_text        = 'Files checked {0}'.format(num_files_checked)
             self.pDialog.update(self.progress_number, self.file_text, activity_text)
             num_files_checked += 1
 
-            # --- Check if filename matchs ROM extensions ---
-            # The recursive scan has scanned all files. Check if this file matches some of 
-            # the ROM extensions. If this file isn't a ROM skip it and go for next one in the list.
-            processROM = False
-            for ext in launcher_exts.split("|"):
-                if ROM.getExt() == '.' + ext:
-                    log_debug("Expected '{0}' extension detected".format(ext))
-                    processROM = True
-            if not processROM: continue
+            # >> The walker only returns files with the launcher ROM extensions.
+            log_debug("Expected '{0}' extension detected", ROM.getExt())
 
             # --- Check if ROM belongs to a multidisc set ---
             MultiDiscInROMs = False
-            MDSet = text_get_multidisc_info(ROM)
+            MDSet = rom_name_get_multidisc_info(ROM)
             if MDSet.isMultiDisc:
                 log_info('ROM belongs to a multidisc set.')
                 log_info('isMultiDisc "{0}"'.format(MDSet.isMultiDisc))
@@ -6864,13 +7417,8 @@ class Main:
                 log_info('order       "{0}"'.format(MDSet.order))
                 
                 # >> Check if the set is already in launcher ROMs.
-                MultiDisc_rom_id = None
-                for rom_id, rom_dic in roms.iteritems():
-                    temp_FN = FileName(rom_dic['filename'])
-                    if temp_FN.getBase() == MDSet.setName:
-                        MultiDiscInROMs  = True
-                        MultiDisc_rom_id = rom_id
-                        break
+                MultiDisc_rom_id = roms_idx.get_multidisc_romID(os.path.join(ROM.getDir(), MDSet.setName))
+                MultiDiscInROMs  = MultiDisc_rom_id is not None
                 log_info('MultiDiscInROMs is {0}'.format(MultiDiscInROMs))
 
                 # >> If the set is not in the ROMs then this ROM is the first of the set.
@@ -6886,7 +7434,8 @@ class Main:
                 # >> If set already in ROMs, just add this disk into the set disks field.
                 else:
                     log_info('Adding additional disk "{0}"'.format(MDSet.discName))
-                    roms[MultiDisc_rom_id]['disks'].append(MDSet.discName)
+                    if MDSet.discName not in roms[MultiDisc_rom_id]['disks']:
+                        roms[MultiDisc_rom_id]['disks'].append(MDSet.discName)
                     # >> Reorder disks like Disk 1, Disk 2, ...
                     
                     # >> Process next file
@@ -6897,10 +7446,7 @@ class Main:
 
             # --- Check that ROM is not already in the list of ROMs ---
             # >> If file already in ROM list skip it
-            repeatedROM = False
-            for rom_id in roms:
-                if roms[rom_id]['filename'] == f_path: repeatedROM = True
-            if repeatedROM:
+            if roms_idx.has_filename(f_path):
                 log_debug('File already into launcher list')
                 continue
             else:
@@ -6918,25 +7464,88 @@ class Main:
             romdata     = self._roms_process_scanned_ROM(launcherID, ROM)
             romID       = romdata['id']
             roms[romID] = romdata
+            roms_idx.add_ROM(romID, romdata)
             num_new_roms += 1
 
             # --- This was the first ROM in a multidisc set ---
             if MDSet.isMultiDisc and not MultiDiscInROMs:
                 log_info('Adding first disk "{0}"'.format(MDSet.discName))
                 roms[romID]['disks'].append(MDSet.discName)
+
+            # ~~~ Merge ROMs already scraped by the pipeline ~~~
+            if self.scraper_pipeline:
+                self._roms_merge_scraper_jobs(self.scraper_pipeline.get_finished_jobs())
             
             # ~~~ Check if user pressed the cancel button ~~~
             if self.pDialog.iscanceled() or self.pDialog_canceled:
+                if self.scraper_pipeline: self.scraper_pipeline.stop()
                 self.pDialog.close()
                 kodi_dialog_OK('Stopping ROM scanning. No changes have been made.')
                 log_info('User pressed Cancel button when scanning ROMs')
                 log_info('ROM scanning stopped')
                 return
+
+        # ~~~ Wait until the scraping pipeline finishes ~~~
+        if self.scraper_pipeline:
+            num_jobs = self.scraper_pipeline.num_pending_jobs()
+            while self.scraper_pipeline.num_pending_jobs() > 0:
+                num_remaining = self.scraper_pipeline.num_pending_jobs()
+                self.pDialog.update((num_jobs - num_remaining) * 100 / num_jobs,
+                                    'Scraping ROMs', '{0} ROMs remaining'.format(num_remaining))
+                self._roms_merge_scraper_jobs(self.scraper_pipeline.get_finished_jobs(0.25))
+                if self.pDialog.iscanceled():
+                    self.scraper_pipeline.stop()
+                    self.pDialog.close()
+                    kodi_dialog_OK('Stopping ROM scanning. No changes have been made.')
+                    log_info('User pressed Cancel button when scraping ROMs')
+                    log_info('ROM scanning stopped')
+                    return
+            self.scraper_pipeline.close()
         self.pDialog.close()
+        files_set = fs_get_ROMs_manifest_file_set(manifest)
+        log_info('Found {0} files ({1} new, {2} removed)'.format(
+            len(files_set), num_files_checked, len(old_files_set - files_set)))
+
+        # ~~~~~ Remove dead entries ~~~~~
+        # >> Done after the walk because the whole list of files is needed.
+        # >> ROMs found in the scanned files exist and do not need to be checked in the filesystem.
+        # >> Multidisc ROM filename is the set name, which does not exist. Check the set disks.
+        num_removed_roms = 0
+        log_info('Launcher ROM database contain {0} items'.format(len(roms)))
+        if num_roms > 0:
+            log_debug('Starting dead items scan')
+            i = 0
+            self.pDialog.create('Advanced Emulator Launcher',
+                                'Checking for dead entries...', "Path '{0}'".format(launcher_path))
+            for key in old_rom_ids:
+                log_debug('Searching {0}', roms[key]['filename'])
+                self.pDialog.update(i * 100 / num_roms)
+                i += 1
+                fileName = FileName(roms[key]['filename'])
+                if fileName.getPath() in files_set: continue
+                if roms[key]['disks']:
+                    disk_paths = [os.path.join(fileName.getDir(), disk) for disk in roms[key]['disks']]
+                    if any(disk_path in files_set for disk_path in disk_paths): continue
+                if not fileName.exists():
+                    log_debug('Not found')
+                    log_debug('Deleting from DB {0}', roms[key]['filename'])
+                    del roms[key]
+                    num_removed_roms += 1
+            self.pDialog.update(i * 100 / num_roms)
+            self.pDialog.close()
+            if num_removed_roms > 0:
+                kodi_notify('{0} dead ROMs removed successfully'.format(num_removed_roms))
+                log_info('{0} dead ROMs removed successfully'.format(num_removed_roms))
+            else:
+                log_info('No dead ROMs found')
+        else:
+            log_info('Launcher is empty. No dead ROM check.')
+
         log_info('***** ROM scanner finished. Report ******')
         log_info('Removed dead ROMs {0:6d}'.format(num_removed_roms))
         log_info('Files checked     {0:6d}'.format(num_files_checked))
         log_info('New added ROMs    {0:6d}'.format(num_new_roms))
+        net_cache_log_stats()
 
         if len(roms) == 0:
             kodi_dialog_OK('No ROMs found! Make sure launcher directory and file extensions are correct.')
@@ -6969,8 +7578,13 @@ class Main:
         #     log_info('No No-Intro DAT configured. No auditing ROMs.')
 
         # ~~~ Save ROMs XML file. Also save categories/launchers to update timestamp. ~~~
+        launcher['timestamp_launcher'] = time.time()
         fs_write_ROMs_JSON(ROMS_DIR, launcher['roms_base_noext'], roms, launcher)
+        fs_write_ROMs_manifest(ROMS_DIR, launcher['roms_base_noext'], manifest)
         fs_write_catfile(CATEGORIES_FILE_PATH, self.categories, self.launchers)
+
+        # ~~~ Update virtual categories with the ROMs of this launcher ~~~
+        if self.settings['scan_update_vcategories']: self._vcategory_update_after_scan()
         kodi_refresh_container()
 
     #
@@ -6994,7 +7608,7 @@ class Main:
         # ~~~~~ Scrape game metadata information ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # >> Test if NFO file exists
         NFO_file = FileName(ROM.getBase_noext() + '.nfo')
-        log_debug('Testing NFO file "{0}"'.format(NFO_file.getPath()))
+        log_debug('Testing NFO file "{0}"', NFO_file.getPath())
         found_NFO_file = True if NFO_file.exists() else False
 
         # >> Determine metadata action based on policy
@@ -7024,16 +7638,21 @@ class Main:
         else:
             log_error('Invalid scan_metadata_policy value = {0}'.format(scan_metadata_policy))
 
+        # >> Automatic scraping is done in the scraping pipeline if activated
+        pipeline_metadata   = self.scraper_pipeline is not None and self.settings['metadata_scraper_mode'] == 1
+        pipeline_assets     = self.scraper_pipeline is not None and self.settings['asset_scraper_mode'] == 1
+        pipeline_asset_jobs = []
+
         # >> Do metadata action based on policy
         if metadata_action == META_TITLE_ONLY:
             scraper_text = 'Formatting ROM name.'
             self.pDialog.update(self.progress_number, self.file_text, scraper_text)
-            romdata['m_name'] = text_format_ROM_title(ROM.getBase_noext(), scan_clean_tags)
+            romdata['m_name'] = rom_name_format_title(ROM.getBase_noext(), scan_clean_tags)
         elif metadata_action == META_NFO_FILE:
             nfo_file_path = FileName(ROM.getPath_noext() + ".nfo")
             scraper_text = 'Reading NFO file {0}'.format(nfo_file_path.getOriginalPath())
             self.pDialog.update(self.progress_number, self.file_text, scraper_text)
-            log_debug('Trying NFO file "{0}"'.format(nfo_file_path.getPath()))
+            log_debug('Trying NFO file "{0}"', nfo_file_path.getPath())
             if nfo_file_path.exists():
                 log_debug('NFO file found. Reading it')
                 nfo_dic = fs_load_NFO_file_scanner(nfo_file_path)
@@ -7045,15 +7664,19 @@ class Main:
                 romdata['m_plot']   = nfo_dic['plot']      # <plot>
             else:
                 log_debug('NFO file not found. Only cleaning ROM name.')
-                romdata['m_name'] = text_format_ROM_title(ROM.getBase_noext(), scan_clean_tags)
+                romdata['m_name'] = rom_name_format_title(ROM.getBase_noext(), scan_clean_tags)
+        elif metadata_action == META_SCRAPER and pipeline_metadata:
+            # >> Scraped in the pipeline. Use the ROM name until scraped metadata is merged.
+            log_debug('Metadata automatic scraping. Submitting to scraping pipeline.')
+            romdata['m_name'] = rom_name_format_title(ROM.getBase_noext(), scan_clean_tags)
         elif metadata_action == META_SCRAPER:
             scraper_text = 'Scraping metadata with {0}. Searching for matching games...'.format(self.scraper_metadata.name)
             self.pDialog.update(self.progress_number, self.file_text, scraper_text)
 
             # --- Do a search and get a list of games ---
-            rom_name_scraping = text_format_ROM_name_for_scraping(ROM.getBase_noext())
+            rom_name_scraping = rom_name_format_for_scraping(ROM.getBase_noext())
             results = self.scraper_metadata.get_search(rom_name_scraping, ROM.getBase_noext(), platform)
-            log_debug('Metadata scraper found {0} result/s'.format(len(results)))
+            log_debug('Metadata scraper found {0} result/s', len(results))
             if results:
                 # id="metadata_scraper_mode" values="Semi-automatic|Automatic"
                 if self.settings['metadata_scraper_mode'] == 0:
@@ -7086,24 +7709,25 @@ class Main:
                 # --- Put metadata into ROM dictionary ---
                 if scan_ignore_scrapped_title:
                     # Ignore scraped title
-                    romdata['m_name'] = text_format_ROM_title(ROM.getBase_noext(), scan_clean_tags)
-                    log_debug("User wants to ignore scraper name. Setting name to '{0}'".format(romdata['m_name']))
+                    romdata['m_name'] = rom_name_format_title(ROM.getBase_noext(), scan_clean_tags)
+                    log_debug("User wants to ignore scraper name. Setting name to '{0}'", romdata['m_name'])
                 else:
                     # Use scraped title
                     romdata['m_name'] = gamedata['title']
-                    log_debug('User wants scrapped name. Setting name to "{0}"'.format(romdata['m_name']))
+                    log_debug('User wants scrapped name. Setting name to "{0}"', romdata['m_name'])
                 romdata['m_year']   = gamedata['year']
                 romdata['m_genre']  = gamedata['genre']
                 romdata['m_studio'] = gamedata['studio']
                 romdata['m_plot']   = gamedata['plot']
             else:
                 log_verb('Metadata scraper found no games after searching. Only cleaning ROM name.')
-                romdata['m_name'] = text_format_ROM_title(ROM.getBase_noext(), scan_clean_tags)
+                romdata['m_name'] = rom_name_format_title(ROM.getBase_noext(), scan_clean_tags)
         else:
             log_error('Invalid metadata_action value = {0}'.format(metadata_action))
 
         # ~~~~~ Search for local artwork/assets ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        local_asset_list = assets_search_local_assets(launcher, ROM, self.enabled_asset_list)
+        local_asset_list = assets_search_local_assets(launcher, ROM, self.enabled_asset_list,
+                                                      self.asset_dir_index)
 
         # ~~~ Asset scraping ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         # settings.xml -> id="scan_asset_policy" default="0" values="Local Assets|Local Assets + Scrapers|Scrapers only"
@@ -7121,13 +7745,18 @@ class Main:
                 A = assets_get_info_scheme(asset_kind)
                 if not self.enabled_asset_list[i]:
                     romdata[A.key] = ''
-                    log_verb('Skipped {0} (dir not configured)'.format(A.name))
+                    log_verb('Skipped {0} (dir not configured)', A.name)
                     continue
                 if local_asset_list[i]:
-                    log_verb('Asset policy: local {0} FOUND | Scraper OFF'.format(A.name))
+                    log_verb('Asset policy: local {0} FOUND | Scraper OFF', A.name)
+                    romdata[A.key] = local_asset_list[i]
+                elif pipeline_assets:
+                    log_verb('Asset policy: local {0} NOT found | Scraper ON (pipeline)', A.name)
                     romdata[A.key] = local_asset_list[i]
+                    asset_path_noext = assets_get_path_noext_DIR(A, FileName(launcher[A.path_key]), ROM)
+                    pipeline_asset_jobs.append((asset_kind, asset_path_noext))
                 else:
-                    log_verb('Asset policy: local {0} NOT found | Scraper ON'.format(A.name))
+                    log_verb('Asset policy: local {0} NOT found | Scraper ON', A.name)
                     romdata[A.key] = self._roms_scrap_asset(asset_kind, local_asset_list[i], ROM, launcher)
 
         elif scan_asset_policy == 2:
@@ -7137,26 +7766,63 @@ class Main:
                 A = assets_get_info_scheme(asset_kind)
                 if not self.enabled_asset_list[i]:
                     romdata[A.key] = ''
-                    log_verb('Skipped {0} (dir not configured)'.format(A.name))
+                    log_verb('Skipped {0} (dir not configured)', A.name)
                     continue
-                log_verb('Asset policy: local {0} NOT found | Scraper ON'.format(A.name))
-                romdata[A.key] = self._roms_scrap_asset(asset_kind, local_asset_list[i], ROM, launcher)
-
-        log_verb('Set Title     file "{0}"'.format(romdata['s_title']))
-        log_verb('Set Snap      file "{0}"'.format(romdata['s_snap']))
-        log_verb('Set Fanart    file "{0}"'.format(romdata['s_fanart']))
-        log_verb('Set Banner    file "{0}"'.format(romdata['s_banner']))
-        log_verb('Set Clearlogo file "{0}"'.format(romdata['s_clearlogo']))
-        log_verb('Set Boxfront  file "{0}"'.format(romdata['s_boxfront']))
-        log_verb('Set Boxback   file "{0}"'.format(romdata['s_boxback']))
-        log_verb('Set Cartridge file "{0}"'.format(romdata['s_cartridge']))
-        log_verb('Set Flyer     file "{0}"'.format(romdata['s_flyer']))
-        log_verb('Set Map       file "{0}"'.format(romdata['s_map']))
-        log_verb('Set Manual    file "{0}"'.format(romdata['s_manual']))
-        log_verb('Set Trailer   file "{0}"'.format(romdata['s_trailer']))
+                if pipeline_assets:
+                    log_verb('Asset policy: local {0} NOT found | Scraper ON (pipeline)', A.name)
+                    romdata[A.key] = local_asset_list[i]
+                    asset_path_noext = assets_get_path_noext_DIR(A, FileName(launcher[A.path_key]), ROM)
+                    pipeline_asset_jobs.append((asset_kind, asset_path_noext))
+                else:
+                    log_verb('Asset policy: local {0} NOT found | Scraper ON', A.name)
+                    romdata[A.key] = self._roms_scrap_asset(asset_kind, local_asset_list[i], ROM, launcher)
+
+        # ~~~ Submit ROM to the scraping pipeline ~~~
+        # >> Local assets/ROM name are used until the scraping results are merged.
+        if (pipeline_metadata and metadata_action == META_SCRAPER) or pipeline_asset_jobs:
+            log_verb('Submitting ROM to the scraping pipeline')
+            from scrap_pipeline import ScraperJob
+            scrap_metadata = pipeline_metadata and metadata_action == META_SCRAPER
+            self.scraper_pipeline.submit(ScraperJob(romdata, ROM, platform, scrap_metadata, pipeline_asset_jobs))
+
+        if log_is_verb_enabled():
+            log_verb('Set Title     file "{0}"', romdata['s_title'])
+            log_verb('Set Snap      file "{0}"', romdata['s_snap'])
+            log_verb('Set Fanart    file "{0}"', romdata['s_fanart'])
+            log_verb('Set Banner    file "{0}"', romdata['s_banner'])
+            log_verb('Set Clearlogo file "{0}"', romdata['s_clearlogo'])
+            log_verb('Set Boxfront  file "{0}"', romdata['s_boxfront'])
+            log_verb('Set Boxback   file "{0}"', romdata['s_boxback'])
+            log_verb('Set Cartridge file "{0}"', romdata['s_cartridge'])
+            log_verb('Set Flyer     file "{0}"', romdata['s_flyer'])
+            log_verb('Set Map       file "{0}"', romdata['s_map'])
+            log_verb('Set Manual    file "{0}"', romdata['s_manual'])
+            log_verb('Set Trailer   file "{0}"', romdata['s_trailer'])
 
         return romdata
 
+    #
+    # Merges the results of finished scraping pipeline jobs into the ROM dictionaries.
+    # Only called from the main thread. Jobs are merged in the order they were submitted.
+    #
+    def _roms_merge_scraper_jobs(self, jobs):
+        for job in jobs:
+            romdata = job.romdata
+            log_debug('_roms_merge_scraper_jobs() Merging "{0}"', job.ROM.getBase())
+            if job.gamedata:
+                if not self.settings['scan_ignore_scrap_title']:
+                    romdata['m_name'] = job.gamedata['title']
+                romdata['m_year']   = job.gamedata['year']
+                romdata['m_genre']  = job.gamedata['genre']
+                romdata['m_studio'] = job.gamedata['studio']
+                romdata['m_plot']   = job.gamedata['plot']
+            for (asset_kind, asset_path_noext) in job.asset_jobs:
+                if asset_kind not in job.asset_results: continue
+                A = assets_get_info_scheme(asset_kind)
+                romdata[A.key] = job.asset_results[asset_kind]
+                # >> Recache only if local image is in the Kodi cache, this function takes care of that.
+                kodi_update_image_cache(romdata[A.key])
+
     #
     # Returns a valid filename of the downloaded scrapped image, filename of local image
     # or empty string if scraper finds nothing or download failed.
@@ -7187,7 +7853,7 @@ class Main:
             return ret_asset_path
 
         # --- Call scraper and get a list of games ---
-        rom_name_scraping = text_format_ROM_name_for_scraping(ROM.getBase_noext())
+        rom_name_scraping = rom_name_format_for_scraping(ROM.getBase_noext())
         results = scraper_obj.get_search(rom_name_scraping, ROM.getBase_noext(), platform)
         log_debug('{0} scraper found {1} result/s'.format(A.name, len(results)))
         if not results:
@@ -7268,6 +7934,7 @@ class Main:
             image_path = asset_path_noext.append(image_ext).getPath()
             log_verb('Downloading URL  "{0}"'.format(image_url))
             log_verb('Into local file  "{0}"'.format(image_path))
+            from net_IO import net_download_img
             try:
                 net_download_img(image_url, image_path)
             except socket.timeout:
@@ -7352,7 +8019,7 @@ class Main:
         # --- Put metadata into ROM dictionary ---
         # >> Ignore scraped title
         if scan_ignore_scrapped_title:
-            roms[romID]['m_name'] = text_format_ROM_title(ROM.getBase_noext(), scan_clean_tags)
+            roms[romID]['m_name'] = rom_name_format_title(ROM.getBase_noext(), scan_clean_tags)
             log_debug('User wants to ignore scraper name. Setting name to "{0}"'.format(roms[romID]['m_name']))
         # >> Use scraped title
         else:
@@ -7536,7 +8203,7 @@ class Main:
         if object_kind == KIND_ROM:
             scraper_obj_list  = []
             scraper_menu_list = []
-            for scrap_obj in scrapers_asset:
+            for scrap_obj in self._misc_import_scrapers().scrapers_asset:
                 if scrap_obj.supports_asset(asset_kind):
                     scraper_obj_list.append(scrap_obj)
                     scraper_menu_list.append('Scrape {0} from {1}'.format(AInfo.name, scrap_obj.name))
@@ -7720,6 +8387,7 @@ class Main:
 
                 # >> Prevent race conditions
                 kodi_busydialog_ON()
+                from net_IO import net_download_img
                 try:
                     net_download_img(image_url, image_local_path)
                 except socket.timeout:
@@ -7973,6 +8641,8 @@ class Main:
     #
     def _command_check_database(self):
         log_debug('_command_check_database() Beginning ....')
+        # >> Recreate the addon data directories in case the user deleted some of them.
+        self._misc_create_addon_dirs()
         pDialog = xbmcgui.DialogProgress()
         pDialog_canceled = False
 
@@ -7983,30 +8653,36 @@ class Main:
         pDialog.close()
 
         # >> Traverse all launchers. Load ROMs and check every ROMs.
+        # >> categories.xml is saved after every launcher. Queue the writes so the file is written
+        # >> only once when all launchers have been checked.
         pDialog.create('Advanced Emulator Launcher', 'Checking Launcher ROMs ...')
         num_launchers = len(self.launchers)
         processed_launchers = 0
-        for launcher_id in self.launchers:
-            log_debug('_command_edit_rom() Checking Launcher "{0}"'.format(self.launchers[launcher_id]['m_name']))
-            # >> Load ROMs
-            roms_base_noext = self.launchers[launcher_id]['roms_base_noext']
-            roms = fs_load_ROMs_JSON(ROMS_DIR, roms_base_noext)
-            for rom_id in roms:
-                # >> Get ROM object
-                rom = roms[rom_id]
-                self._misc_fix_rom_object(rom)
-            # >> Save ROMs
-            fs_write_ROMs_JSON(ROMS_DIR, roms_base_noext, roms, self.launchers[launcher_id])
+        fs_write_behind_begin()
+        try:
+            for launcher_id in self.launchers:
+                log_debug('_command_edit_rom() Checking Launcher "{0}"'.format(self.launchers[launcher_id]['m_name']))
+                # >> Load ROMs
+                roms_base_noext = self.launchers[launcher_id]['roms_base_noext']
+                roms = fs_load_ROMs_JSON(ROMS_DIR, roms_base_noext)
+                for rom_id in roms:
+                    # >> Get ROM object
+                    rom = roms[rom_id]
+                    self._misc_fix_rom_object(rom)
+                # >> Save ROMs
+                fs_write_ROMs_JSON(ROMS_DIR, roms_base_noext, roms, self.launchers[launcher_id])
             
-            # >> Also Save Categories/Launchers XML.
-            # >> This updates timestamps and forces regeneration of Virtual Launchers.
-            self.launchers[launcher_id]['timestamp_launcher'] = time.time()            
-            fs_write_catfile(CATEGORIES_FILE_PATH, self.categories, self.launchers)
-
-            # >> Update dialog
-            processed_launchers += 1
-            update_number = (float(processed_launchers) / float(num_launchers)) * 100 
-            pDialog.update(int(update_number))
+                # >> Also Save Categories/Launchers XML.
+                # >> This updates timestamps and forces regeneration of Virtual Launchers.
+                self.launchers[launcher_id]['timestamp_launcher'] = time.time()            
+                fs_write_catfile(CATEGORIES_FILE_PATH, self.categories, self.launchers)
+
+                # >> Update dialog
+                processed_launchers += 1
+                update_number = (float(processed_launchers) / float(num_launchers)) * 100 
+                pDialog.update(int(update_number))
+        finally:
+            fs_write_behind_flush()
         pDialog.update(100)
         pDialog.close()
 
@@ -8068,6 +8744,16 @@ class Main:
         kodi_notify('All databases checked')
         log_debug('_command_check_database() Exiting')
 
+    #
+    # Deletes all the web pages stored in the scraper HTTP cache
+    #
+    def _command_clear_scraper_cache(self):
+        if not kodi_dialog_yesno('Delete all the web pages downloaded by the scrapers?'): return
+        self._misc_import_scrapers()
+        from net_IO import net_cache_clear
+        net_cache_clear()
+        kodi_notify('Scraper cache cleared')
+
     #
     # ROM dictionary is edited by Python passing by assigment
     #
@@ -8109,6 +8795,9 @@ class Main:
 
         return '{0}?com={1}'.format(self.base_url, command)
 
+    def _misc_url_page(self, command, page, categoryID = None, launcherID = None):
+        return '{0}&page={1}'.format(self._misc_url(command, categoryID, launcherID), page)
+
     def _misc_url_search(self, command, categoryID, launcherID, search_type, search_string):
         return '{0}?com={1}&catID={2}&launID={3}&search_type={4}&search_string={5}'.format(
             self.base_url, command, categoryID, launcherID, search_type, search_string)
@@ -17,7 +17,7 @@
 
 # --- Python standard library ---
 from __future__ import unicode_literals
-import sys, random, urllib2
+import sys, os, time, random, hashlib, urllib2, urlparse, threading
 
 # --- AEL packages ---
 try:
@@ -28,6 +28,211 @@ except:
 # --- GLOBALS -----------------------------------------------------------------
 USER_AGENT = 'Mozilla/5.0 (Windows NT 6.1; WOW64) AppleWebKit/537.31 (KHTML, like Gecko) Chrome/26.0.1410.64 Safari/537.31';
 
+# --- Connections per host ----------------------------------------------------
+# >> The scraping pipeline downloads from several threads at the same time. Limit the number
+# >> of simultaneous connections to the same host so websites are not hammered.
+net_max_connections_per_host = 2
+net_host_semaphores          = {}
+net_host_lock                = threading.Lock()
+
+def net_set_max_connections_per_host(num_connections):
+    global net_max_connections_per_host
+    with net_host_lock:
+        net_max_connections_per_host = max(1, num_connections)
+        net_host_semaphores.clear()
+    log_debug('net_set_max_connections_per_host() Set to {0}'.format(num_connections))
+
+def net_get_host_semaphore(url):
+    host = urlparse.urlparse(url).netloc.lower()
+    with net_host_lock:
+        if host not in net_host_semaphores:
+            net_host_semaphores[host] = threading.BoundedSemaphore(net_max_connections_per_host)
+
+        return net_host_semaphores[host]
+
+# --- HTTP response cache -----------------------------------------------------
+# >> Scrapers download the same search and game pages again and again (rescanning a launcher,
+# >> scraping metadata and then assets, etc.). Pages read with net_get_URL_oneline() and
+# >> net_get_URL_original() are stored on disk, one file per URL, named after the SHA1 of the
+# >> normalised URL. File format is the page encoding in the first line and then the raw page bytes.
+# >>
+# >> Entry creation time is the file mtime, used for the TTL. Last access time is the file atime,
+# >> which is set explicitly on every hit (noatime mounts do not matter), used for the LRU
+# >> eviction when the cache grows bigger than the maximum size. There is no index file to
+# >> keep in sync, so the cache survives crashes and Kodi being killed.
+# >>
+# >> Websites serve error and "no results" pages with status 200. Scrapers call
+# >> net_cache_set_short_TTL() when a page cannot be parsed or has no results, so a transient
+# >> failure is not replayed from the cache until the TTL expires.
+# >>
+# >> The cache is disabled until net_cache_init() is called.
+net_cache_dir         = None
+net_cache_ttl         = 0
+net_cache_max_size    = 0
+net_cache_size        = -1
+net_cache_num_hits    = 0
+net_cache_num_misses  = 0
+net_cache_lock        = threading.Lock()
+NET_CACHE_FILE_EXT    = '.cache'
+NET_CACHE_SHORT_TTL   = 3600
+
+#
+# cache_dir is a filesystem path (use FileName.getPath()). ttl_days and max_size_MB must be
+# bigger than 0, otherwise the cache is disabled.
+#
+def net_cache_init(cache_dir, ttl_days, max_size_MB):
+    global net_cache_dir, net_cache_ttl, net_cache_max_size, net_cache_size
+
+    if ttl_days <= 0 or max_size_MB <= 0:
+        log_debug('net_cache_init() Cache disabled')
+        net_cache_dir = None
+        return
+    if not os.path.isdir(cache_dir): os.makedirs(cache_dir)
+    net_cache_dir      = cache_dir
+    net_cache_ttl      = ttl_days * 24 * 3600
+    net_cache_max_size = max_size_MB * 1024 * 1024
+    # >> Computed lazily the first time a page is stored.
+    net_cache_size     = -1
+    log_debug('net_cache_init() Cache dir "{0}"'.format(cache_dir))
+    log_debug('net_cache_init() TTL {0} days, max size {1} MB'.format(ttl_days, max_size_MB))
+
+#
+# Scheme and host are case insensitive, the fragment is never sent to the server and the order
+# of the query parameters does not matter. Returns the SHA1 hex digest of the normalised URL.
+#
+def net_cache_get_key(url):
+    (scheme, netloc, path, query, fragment) = urlparse.urlsplit(url)
+    scheme = scheme.lower()
+    netloc = netloc.lower()
+    if scheme == 'http'  and netloc.endswith(':80'):  netloc = netloc[:-3]
+    if scheme == 'https' and netloc.endswith(':443'): netloc = netloc[:-4]
+    if not path: path = '/'
+    query = '&'.join(sorted(query.split('&'))) if query else ''
+    norm_url = urlparse.urlunsplit((scheme, netloc, path, query, ''))
+
+    return hashlib.sha1(norm_url.encode('utf-8')).hexdigest()
+
+#
+# Returns a tuple (page_bytes, encoding) or None if URL not in cache or entry expired.
+#
+def net_cache_get(url):
+    global net_cache_num_hits, net_cache_num_misses
+
+    if net_cache_dir is None: return None
+    file_path = os.path.join(net_cache_dir, net_cache_get_key(url) + NET_CACHE_FILE_EXT)
+    try:
+        with net_cache_lock:
+            st = os.stat(file_path)
+            if time.time() - st.st_mtime > net_cache_ttl:
+                net_cache_num_misses += 1
+                return None
+            with open(file_path, 'rb') as f:
+                encoding   = f.readline().strip().decode('utf-8')
+                page_bytes = f.read()
+            # >> Update last access time for the LRU. Keep mtime (creation time) for the TTL.
+            os.utime(file_path, (time.time(), st.st_mtime))
+            net_cache_num_hits += 1
+    except (IOError, OSError):
+        with net_cache_lock: net_cache_num_misses += 1
+        return None
+    log_debug('net_cache_get() Cache hit "{0}"'.format(url))
+
+    return (page_bytes, encoding)
+
+def net_cache_put(url, page_bytes, encoding):
+    if net_cache_dir is None: return
+    file_path = os.path.join(net_cache_dir, net_cache_get_key(url) + NET_CACHE_FILE_EXT)
+    temp_path = file_path + '.tmp'
+    try:
+        with net_cache_lock:
+            if net_cache_size < 0: net_cache_compute_size()
+            with open(temp_path, 'wb') as f:
+                f.write(encoding.encode('utf-8') + b'\n')
+                f.write(page_bytes)
+            if os.path.isfile(file_path): _net_cache_remove(file_path)
+            os.rename(temp_path, file_path)
+            _net_cache_add_size(os.path.getsize(file_path))
+            if net_cache_size > net_cache_max_size: net_cache_evict()
+    except (IOError, OSError) as e:
+        log_error('net_cache_put() Exception writing cache file')
+        log_error('net_cache_put() {0}'.format(str(e)))
+
+#
+# The cache entry of url, if any, expires NET_CACHE_SHORT_TTL seconds from now. The TTL is
+# counted from the file mtime, so the mtime is moved back. Entries never get a longer TTL.
+#
+def net_cache_set_short_TTL(url):
+    if net_cache_dir is None: return
+    file_path = os.path.join(net_cache_dir, net_cache_get_key(url) + NET_CACHE_FILE_EXT)
+    try:
+        with net_cache_lock:
+            st = os.stat(file_path)
+            mtime = time.time() - net_cache_ttl + NET_CACHE_SHORT_TTL
+            if mtime < st.st_mtime: os.utime(file_path, (st.st_atime, mtime))
+    except OSError:
+        return
+    log_debug('net_cache_set_short_TTL() Short TTL "{0}"'.format(url))
+
+# >> net_cache_lock must be held when calling the following functions.
+def _net_cache_add_size(num_bytes):
+    global net_cache_size
+    net_cache_size += num_bytes
+
+def _net_cache_remove(file_path):
+    num_bytes = os.path.getsize(file_path)
+    os.remove(file_path)
+    _net_cache_add_size(-num_bytes)
+
+def _net_cache_list_entries():
+    entries = []
+    for name in os.listdir(net_cache_dir):
+        if not name.endswith(NET_CACHE_FILE_EXT): continue
+        file_path = os.path.join(net_cache_dir, name)
+        st = os.stat(file_path)
+        entries.append((st.st_atime, st.st_mtime, st.st_size, file_path))
+
+    return entries
+
+def net_cache_compute_size():
+    global net_cache_size
+    net_cache_size = sum(entry[2] for entry in _net_cache_list_entries())
+    log_debug('net_cache_compute_size() Cache size {0} bytes'.format(net_cache_size))
+
+#
+# Removes expired entries first. Then removes least recently used entries until the cache size
+# is 90% of the maximum size, so eviction does not happen every time a page is stored.
+#
+def net_cache_evict():
+    now = time.time()
+    entries = []
+    num_removed = 0
+    for (atime, mtime, size, file_path) in _net_cache_list_entries():
+        if now - mtime > net_cache_ttl:
+            _net_cache_remove(file_path)
+            num_removed += 1
+        else:
+            entries.append((atime, file_path))
+    entries.sort()
+    target_size = net_cache_max_size * 9 / 10
+    for (atime, file_path) in entries:
+        if net_cache_size <= target_size: break
+        _net_cache_remove(file_path)
+        num_removed += 1
+    log_debug('net_cache_evict() Removed {0} entries. Cache size {1} bytes'.format(num_removed, net_cache_size))
+
+def net_cache_clear():
+    if net_cache_dir is None: return
+    with net_cache_lock:
+        for entry in _net_cache_list_entries(): _net_cache_remove(entry[3])
+    log_info('net_cache_clear() Cache cleared')
+
+def net_cache_get_stats():
+    return {'hits' : net_cache_num_hits, 'misses' : net_cache_num_misses, 'size' : net_cache_size}
+
+def net_cache_log_stats():
+    if net_cache_dir is None: return
+    log_info('HTTP cache hits {0} | misses {1}'.format(net_cache_num_hits, net_cache_num_misses))
+
 # ---  -----------------------------------------------------------------
 def net_get_random_UserAgent():
     platform = random.choice(['Macintosh', 'Windows', 'X11'])
@@ -76,42 +281,58 @@ def net_download_img(img_url, file_path):
         req = urllib2.Request(img_url)
         req.add_unredirected_header('User-Agent', net_get_random_UserAgent())
 
+        with net_get_host_semaphore(img_url):
+            img_bytes = urllib2.urlopen(req).read()
         f = open(file_path, 'wb')
-        f.write(urllib2.urlopen(req).read())
+        f.write(img_bytes)
         f.close()
     except IOError as e:    
         log_error('(IOError) Exception in net_download_img()')
         log_error('(IOError) {0}'.format(str(e)))
 
-# User agent is fixed and defined in global var USER_AGENT
-# Returns a Unicode string.
 #
-def net_get_URL_oneline(url):
-    page_data = ''
+# Reads an URL and returns a tuple (page_bytes, encoding) or None if error.
+# Pages are read from the HTTP cache if available and stored in the cache after download.
+#
+def net_read_URL_cached(url, func_name):
+    cached = net_cache_get(url)
+    if cached: return cached
+
     req = urllib2.Request(url)
     req.add_unredirected_header('User-Agent', USER_AGENT)
-    log_debug('net_get_URL_oneline() Reading URL "{0}"'.format(req.get_full_url()))
-
     try:
-        # --- Open network connection (socket) ---
-        f = urllib2.urlopen(req)
-
-        # --- Read data from socket ---
-        encoding = f.headers['content-type'].split('charset=')[-1]
-        # >> Fix for wrong encodings...
-        if encoding == 'text/html': encoding = 'utf-8'
-        log_debug('net_get_URL_oneline() encoding = "{0}"'.format(encoding))
-        page_bytes = f.read()
-        f.close()
+        with net_get_host_semaphore(url):
+            # --- Open network connection (socket) ---
+            f = urllib2.urlopen(req)
+
+            # --- Read data from socket ---
+            encoding = f.headers['content-type'].split('charset=')[-1]
+            # >> Fix for wrong encodings...
+            if encoding == 'text/html': encoding = 'utf-8'
+            log_debug('{0}() encoding = "{1}"'.format(func_name, encoding))
+            page_bytes = f.read()
+            f.close()
     except IOError as e:    
-        log_error('(IOError) Exception in net_get_URL_oneline()')
+        log_error('(IOError) Exception in {0}()'.format(func_name))
         log_error('(IOError) {0}'.format(str(e)))
-        return page_data
+        return None
     except Exception as e:
-        log_error('(Error) Exception in net_get_URL_oneline()')
+        log_error('(Error) Exception in {0}()'.format(func_name))
         log_error('(Error) {0}'.format(str(e)))
-        return page_data
+        return None
+    net_cache_put(url, page_bytes, encoding)
+
+    return (page_bytes, encoding)
 
+# User agent is fixed and defined in global var USER_AGENT
+# Returns a Unicode string.
+#
+def net_get_URL_oneline(url):
+    page_data = ''
+    log_debug('net_get_URL_oneline() Reading URL "{0}"'.format(url))
+    page = net_read_URL_cached(url, 'net_get_URL_oneline')
+    if page is None: return page_data
+    (page_bytes, encoding) = page
 
     # --- Convert to Unicode ---
     num_bytes = len(page_bytes)
@@ -126,21 +347,10 @@ def net_get_URL_oneline(url):
 
 def net_get_URL_original(url):
     page_data = ''
-    req = urllib2.Request(url)
-    req.add_unredirected_header('User-Agent', USER_AGENT)
-    log_debug('net_get_URL_original() Reading URL "{0}"'.format(req.get_full_url()))
-
-    try:
-        f = urllib2.urlopen(req)
-        encoding = f.headers['content-type'].split('charset=')[-1]
-        if encoding == 'text/html': encoding = 'utf-8'
-        log_debug('net_get_URL_original() encoding = "{0}"'.format(encoding))
-        page_bytes = f.read()
-        f.close()
-    except IOError as e:    
-        log_error('(IOError) Exception in net_get_URL_original()')
-        log_error('(IOError) {0}'.format(str(e)))
-        return page_data
+    log_debug('net_get_URL_original() Reading URL "{0}"'.format(url))
+    page = net_read_URL_cached(url, 'net_get_URL_original')
+    if page is None: return page_data
+    (page_bytes, encoding) = page
 
     # --- Convert to Unicode ---
     num_bytes = len(page_bytes)
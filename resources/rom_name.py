@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# Advanced Emulator Launcher ROM name parser
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import re
+
+# --- AEL packages ---
+from utils import *
+from utils_kodi import *
+
+# -------------------------------------------------------------------------------------------------
+# No-Intro/Redump/TOSEC/Trurip ROM names are a title followed by tags in (), [] or {}, for example
+# "Final Fantasy VII (USA) (Disc 1)". The ROM base name is split into tokens once and the title,
+# tags, scraping name and multidisc information are obtained from the same tokens.
+#
+# The ROM scanner asks for the same name several times (ROM title, metadata scraper and every
+# asset scraper) so parsed names are cached. The cache is emptied when it is full. The scraping
+# pipeline threads also parse names. Dictionary access is atomic so no lock is needed.
+# -------------------------------------------------------------------------------------------------
+ROM_NAME_CACHE_SIZE = 10000
+ROM_NAME_TOKEN_RE   = re.compile(r'\[.+?\]|\(.+?\)|\{.+?\}|[^\[\(\{]+')
+ROM_NAME_DISC_RE    = re.compile(r'\(Disc ([0-9]+)(?: of [0-9]+)?\)')
+ROM_NAME_SCRAP_RE   = re.compile(r'[_\-:.]')
+
+rom_name_cache = {}
+
+class ROMName:
+    def __init__(self, base_noext):
+        self.base_noext    = base_noext
+        self.title         = ''  # Tags removed except [BIOS]
+        self.tags          = []  # ['(USA)', '[!]', ...]
+        self.tokens        = []  # Title and tags, without the Trurip multidisc '-' tokens
+        self.scraping_name = ''  # Search string for the scrapers
+        self.isMultiDisc   = False
+        self.disc_order    = 0   # Disc number if ROM belongs to a multidisc set
+        self.set_noext     = ''  # Name of the multidisc set (without extension)
+
+#
+# Returns a ROMName object. Do not modify it, it is shared with other callers.
+#
+def rom_name_parse(base_noext):
+    rom_name = rom_name_cache.get(base_noext)
+    if rom_name is not None: return rom_name
+
+    rom_name = ROMName(base_noext)
+    title_list = []
+    scraping_list = []
+    for token_raw in ROM_NAME_TOKEN_RE.findall(base_noext):
+        token = token_raw.strip()
+        if token_raw[0] == '[' or token_raw[0] == '(' or token_raw[0] == '{':
+            rom_name.tags.append(token)
+            if token == '[BIOS]': title_list.append(token)
+            if not rom_name.isMultiDisc:
+                matchObj = ROM_NAME_DISC_RE.match(token)
+                if matchObj:
+                    rom_name.isMultiDisc = True
+                    rom_name.disc_order  = int(matchObj.group(1))
+                    disc_index = len(rom_name.tokens)
+        else:
+            scraping_list.append(token_raw)
+            if not token: continue
+            title_list.append(token)
+            if token == '-': continue
+        rom_name.tokens.append(token)
+    rom_name.title = ' '.join(title_list)
+    rom_name.scraping_name = ROM_NAME_SCRAP_RE.sub('', ''.join(scraping_list)).strip()
+    if rom_name.isMultiDisc:
+        rom_name.set_noext = ' '.join(rom_name.tokens[:disc_index] + rom_name.tokens[disc_index+1:])
+
+    if len(rom_name_cache) >= ROM_NAME_CACHE_SIZE: rom_name_cache.clear()
+    rom_name_cache[base_noext] = rom_name
+
+    return rom_name
+
+#
+# Format ROM file name when scraping is disabled.
+# 1) Remove No-Intro/TOSEC tags (), [], {} at the end of the file
+#
+# title      -> Unicode string
+# clean_tags -> bool
+#
+# Returns a Unicode string.
+#
+def rom_name_format_title(title, clean_tags):
+    if not clean_tags: return title
+
+    return rom_name_parse(title).title
+
+#
+# This function is used to clean the ROM name to be used as search string for the scraper.
+#
+# 1) Cleans ROM tags: [BIOS], (Europe), (Rev A), ...
+# 2) Removes characters _-:.
+#
+def rom_name_format_for_scraping(title):
+    return rom_name_parse(title).scraping_name
+
+# -------------------------------------------------------------------------------------------------
+# Multidisc ROM support
+# -------------------------------------------------------------------------------------------------
+class MultiDiscInfo:
+    def __init__(self, ROM_FN):
+        self.ROM_FN      = ROM_FN
+        self.isMultiDisc = False
+        self.setName     = ''
+        self.discName    = ROM_FN.getBase()
+        self.extension   = ROM_FN.getExt()
+        self.order       = 0
+
+#
+# Redump multidisc ROMs have a (Disc 1) tag and TOSEC/Trurip ROMs a (Disc 1 of 2) tag. The set
+# name is the ROM name without the disc tag.
+#
+def rom_name_get_multidisc_info(ROM_FN):
+    MDSet = MultiDiscInfo(ROM_FN)
+    rom_name = rom_name_parse(ROM_FN.getBase_noext())
+    if rom_name.isMultiDisc:
+        MDSet.isMultiDisc = True
+        MDSet.setName = rom_name.set_noext + MDSet.extension
+        MDSet.order = rom_name.disc_order
+        log_debug('rom_name_get_multidisc_info() base_noext   "{0}"', rom_name.base_noext)
+        log_debug('rom_name_get_multidisc_info() tokens       {0}', rom_name.tokens)
+        log_debug('rom_name_get_multidisc_info() setName      "{0}"', MDSet.setName)
+        log_debug('rom_name_get_multidisc_info() discName     "{0}"', MDSet.discName)
+        log_debug('rom_name_get_multidisc_info() extension    "{0}"', MDSet.extension)
+        log_debug('rom_name_get_multidisc_info() order        {0}', MDSet.order)
+
+    return MDSet
@@ -54,11 +54,19 @@ class Scraper:
 # All scrapers (offline or online) must implement the abstract methods.
 # -------------------------------------------------------------------------------------------------
 class Scraper_Metadata(Scraper):
+    # Offline scrapers keep a database in memory shared by all the users of the object.
+    is_offline = False
+
     # Offline scrapers need to know plugin installation directory.
     # For offline scrapers just pass.
     def set_addon_dir(self, plugin_dir):
         raise NotImplementedError('Subclass must implement set_addon_dir() abstract method')
 
+    # Offline scrapers store pre-parsed databases in this directory.
+    # For online scrapers just pass.
+    def set_cache_dir(self, cache_dir):
+        raise NotImplementedError('Subclass must implement set_cache_dir() abstract method')
+
     # This is called after get_games_search() to get metadata of a particular ROM.
     # game is a dictionary from the dictionary list returned by get_game_search()
     # get_game_search() is usually common code for the online scrapers.
@@ -53,7 +53,6 @@ class asset_NULL(Scraper_Asset):
 # -------------------------------------------------------------------------------------------------
 class asset_TheGamesDB(Scraper_Asset, Scraper_TheGamesDB):
     def __init__(self):
-        Scraper_TheGamesDB.__init__(self)
         self.name = 'TheGamesDB'
         # >> Cache page data in get_images()
         self.get_images_cached_game_id_url = ''
@@ -179,7 +178,6 @@ class asset_TheGamesDB(Scraper_Asset, Scraper_TheGamesDB):
 # -------------------------------------------------------------------------------------------------
 class asset_GameFAQs(Scraper_Asset, Scraper_GameFAQs):
     def __init__(self):
-        Scraper_GameFAQs.__init__(self)
         self.name = 'GameFAQs'
         self.get_images_cached_game_id_url = ''
         self.get_images_cached_page_data   = ''
@@ -332,6 +330,7 @@ class asset_GameFAQs(Scraper_Asset, Scraper_GameFAQs):
                     image_url = boxart[0]
                     image_ext = text_get_image_URL_extension(image_url)
                     return (image_url, image_ext)
+        net_cache_set_short_TTL(image_url)
 
         return ('', '')
 
@@ -340,7 +339,6 @@ class asset_GameFAQs(Scraper_Asset, Scraper_GameFAQs):
 # -------------------------------------------------------------------------------------------------
 class asset_MobyGames(Scraper_Asset, Scraper_MobyGames):
     def __init__(self):
-        Scraper_MobyGames.__init__(self)
         self.name = 'MobyGames'
         self.get_images_cached_game_id_url = ''
         self.get_images_cached_page_data   = ''
@@ -488,6 +486,7 @@ class asset_MobyGames(Scraper_Asset, Scraper_MobyGames):
         # log_debug('Screenshots rlist = ' + unicode(rlist))
         art_URL = ''
         if len(rlist) > 0: art_URL = 'http://www.mobygames.com' + rlist[0][3]
+        else:              net_cache_set_short_TTL(art_page_URL)
         log_debug('asset_MobyGames::get_shot_image_URL() art_URL = {0}'.format(art_URL))
 
         return art_URL
@@ -513,6 +512,7 @@ class asset_MobyGames(Scraper_Asset, Scraper_MobyGames):
         # log_debug('Cover rlist = ' + unicode(rlist))
         art_URL = ''
         if len(rlist) > 0: art_URL = 'http://www.mobygames.com' + rlist[0][2]
+        else:              net_cache_set_short_TTL(art_page_URL)
         log_debug('asset_MobyGames::get_cover_image_URL() art_URL = {0}'.format(art_URL))
 
         return art_URL
@@ -541,7 +541,6 @@ class asset_MobyGames(Scraper_Asset, Scraper_MobyGames):
 # -------------------------------------------------------------------------------------------------
 class asset_ArcadeDB(Scraper_Asset, Scraper_ArcadeDB):
     def __init__(self):
-        Scraper_ArcadeDB.__init__(self)
         self.name = 'Arcade Database'
         self.get_images_cached_game_id_url   = ''
         self.get_images_cached_page_data = ''
@@ -17,7 +17,8 @@
 
 # --- Python standard library ---
 from __future__ import unicode_literals
-import sys, urllib, urllib2, re
+import sys, urllib, urllib2, re, threading
+from collections import OrderedDict
 
 # --- AEL modules ---
 from scrap import *
@@ -25,38 +26,52 @@ from scrap_info import *
 from net_IO import *
 from utils import *
 
+# -----------------------------------------------------------------------------
+# Search results cache
+# -----------------------------------------------------------------------------
+# >> When scanning ROMs get_search() is called once by the metadata scraper and then once
+# >> per asset kind by the asset scraper, with the same arguments. Metadata and asset scrapers
+# >> are different objects, so the parsed list of games is cached here, shared by all scrapers.
+# >> Key is the tuple (site, search_string, rom_base_noext, platform). Least recently used
+# >> searches are evicted when the cache is full. Thread safe (scraping pipeline).
+class ScraperSearchCache:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.cache    = OrderedDict()
+        self.lock     = threading.Lock()
+
+    def set_capacity(self, capacity):
+        with self.lock:
+            self.capacity = max(1, capacity)
+            while len(self.cache) > self.capacity: self.cache.popitem(last = False)
+
+    # Returns a copy of the cached list of games or None if cache miss.
+    def get(self, key):
+        with self.lock:
+            if key not in self.cache:
+                log_debug('ScraperSearchCache::get Cache MISS {0}'.format(key[0]))
+                return None
+            game_list = self.cache.pop(key)
+            self.cache[key] = game_list
+        log_debug('ScraperSearchCache::get Cache HIT {0}'.format(key[0]))
+
+        return [dict(game) for game in game_list]
+
+    def put(self, key, game_list):
+        with self.lock:
+            self.cache.pop(key, None)
+            self.cache[key] = [dict(game) for game in game_list]
+            while len(self.cache) > self.capacity: self.cache.popitem(last = False)
+
+    def reset(self):
+        with self.lock: self.cache.clear()
+
+scraper_search_cache = ScraperSearchCache(32)
+
 # -----------------------------------------------------------------------------
 # TheGamesDB scraper common code
 # ----------------------------------------------------------------------------- 
 class Scraper_TheGamesDB():
-    def __init__(self):
-        self.reset_cache()
-
-    def check_cache(self, search_string, rom_base_noext, platform):
-        if self.get_search_cached_search_string  == search_string and \
-           self.get_search_cached_rom_base_noext == rom_base_noext and \
-           self.get_search_cached_platform       == platform:
-           log_debug('Scraper_TheGamesDB::check_cache Cache HIT.')
-           return True
-        log_debug('Scraper_TheGamesDB::check_cache Cache MISS. Updating cache.')
-
-        return False
-
-    def update_cache(self, search_string, rom_base_noext, platform, page_data):
-        self.get_search_cached_search_string  = search_string
-        self.get_search_cached_rom_base_noext = rom_base_noext
-        self.get_search_cached_platform       = platform
-        self.get_search_cached_page_data      = page_data
-
-    def reset_cache(self):
-        self.get_search_cached_search_string  = ''
-        self.get_search_cached_rom_base_noext = ''
-        self.get_search_cached_platform       = ''
-        self.get_search_cached_page_data      = ''
-
-    def get_cached_pagedata(self):
-        return self.get_search_cached_page_data
-
     # Executes a search and returns a list of games found.
     def get_search(self, search_string, rom_base_noext, platform):
         scraper_platform = AEL_platform_to_TheGamesDB(platform)
@@ -66,19 +81,16 @@ class Scraper_TheGamesDB():
             log_debug('Scraper_TheGamesDB::get_search AEL platform        "{0}"'.format(platform))
             log_debug('Scraper_TheGamesDB::get_search TheGamesDB platform "{0}"'.format(scraper_platform))
 
-        # >> Check if URL page data is in cache. If so it's a cache hit.
-        # >> If cache miss, then update cache.
+        # >> Check if search results are in cache. If so it's a cache hit.
+        cache_key = ('TheGamesDB', search_string, rom_base_noext, platform)
+        game_list = scraper_search_cache.get(cache_key)
+        if game_list is not None: return game_list
+
         # >> quote_plus() will convert the spaces into '+'.
         scraper_platform = scraper_platform.replace('-', ' ')
         url = 'http://thegamesdb.net/api/GetGamesList.php?' + \
               'name=' + urllib.quote_plus(search_string) + '&platform=' + urllib.quote_plus(scraper_platform)
-        if self.check_cache(search_string, rom_base_noext, platform):
-            page_data = self.get_cached_pagedata()
-        else:
-            page_data = net_get_URL_oneline(url)
-            # >> If nothing is returned maybe a timeout happened. In this case, reset the cache.
-            if page_data: self.update_cache(search_string, rom_base_noext, platform, page_data)
-            else:         self.reset_cache()
+        page_data = net_get_URL_oneline(url)
 
         # --- Parse list of games ---
         # <Data>
@@ -103,6 +115,9 @@ class Scraper_TheGamesDB():
             game_list.append(game)
         # >> Order list based on score
         game_list.sort(key = lambda result: result['order'], reverse = True)
+        # >> If nothing is returned maybe a timeout happened. In this case, do not cache.
+        if page_data: scraper_search_cache.put(cache_key, game_list)
+        if not game_list: net_cache_set_short_TTL(url)
 
         return game_list
 
@@ -110,34 +125,6 @@ class Scraper_TheGamesDB():
 # GameFAQs online metadata scraper
 # ----------------------------------------------------------------------------- 
 class Scraper_GameFAQs():
-    def __init__(self):
-        self.reset_cache()
-
-    def check_cache(self, search_string, rom_base_noext, platform):
-        if self.get_search_cached_search_string  == search_string and \
-           self.get_search_cached_rom_base_noext == rom_base_noext and \
-           self.get_search_cached_platform       == platform:
-           log_debug('Scraper_GameFAQs::check_cache Cache HIT.')
-           return True
-        log_debug('Scraper_GameFAQs::check_cache Cache MISS. Updating cache.')
-
-        return False
-
-    def update_cache(self, search_string, rom_base_noext, platform, page_data):
-        self.get_search_cached_search_string  = search_string
-        self.get_search_cached_rom_base_noext = rom_base_noext
-        self.get_search_cached_platform       = platform
-        self.get_search_cached_page_data      = page_data
-
-    def reset_cache(self):
-        self.get_search_cached_search_string  = ''
-        self.get_search_cached_rom_base_noext = ''
-        self.get_search_cached_platform       = ''
-        self.get_search_cached_page_data      = ''
-
-    def get_cached_pagedata(self):
-        return self.get_search_cached_page_data
-
     # Executes a search and returns a list of games found.
     def get_search(self, search_string, rom_base_noext, platform):
         scraper_platform = AEL_platform_to_GameFAQs(platform)
@@ -147,19 +134,17 @@ class Scraper_GameFAQs():
             log_debug('Scraper_GameFAQs::get_search AEL platform       "{0}"'.format(platform))
             log_debug('Scraper_GameFAQs::get_search GameFAQs platform  "{0}"'.format(scraper_platform))
 
+        cache_key = ('GameFAQs', search_string, rom_base_noext, platform)
+        game_list = scraper_search_cache.get(cache_key)
+        if game_list is not None: return game_list
+
         # Example: 'street fighter', 'Nintendo SNES'
         # http://www.gamefaqs.com/search?platform=63&game=street+fighter
         search_string = search_string.replace(' ', '+')
         url = 'http://www.gamefaqs.com/search/index.html?' + \
               'platform={0}'.format(scraper_platform) + \
               '&game=' + search_string + ''
-        if self.check_cache(search_string, rom_base_noext, platform):
-            page_data = self.get_cached_pagedata()
-        else:
-            page_data = net_get_URL_oneline(url)
-            # >> If nothing is returned maybe a timeout happened. In this case, reset the cache.
-            if page_data: self.update_cache(search_string, rom_base_noext, platform, page_data)
-            else:         self.reset_cache()
+        page_data = net_get_URL_oneline(url)
 
         # --- Old Parse list of games ---
         gets = re.findall('<td class="rtitle">(.*?)<a href="(.*?)"(.*?)class="sevent_(.*?)">(.*?)</a></td>', page_data)
@@ -180,6 +165,8 @@ class Scraper_GameFAQs():
             if title.lower().find(search_string.lower()) != -1: game['order'] += 1
             game_list.append(game)
         game_list.sort(key = lambda result: result['order'], reverse = True)
+        if page_data: scraper_search_cache.put(cache_key, game_list)
+        if not game_list: net_cache_set_short_TTL(url)
 
         return game_list
 
@@ -188,34 +175,6 @@ class Scraper_GameFAQs():
 # MobyGames makes it difficult to extract information. Maybe a grammar parser will be needed.
 # -------------------------------------------------------------------------------------------------
 class Scraper_MobyGames():
-    def __init__(self):
-        self.reset_cache()
-
-    def check_cache(self, search_string, rom_base_noext, platform):
-        if self.get_search_cached_search_string  == search_string and \
-           self.get_search_cached_rom_base_noext == rom_base_noext and \
-           self.get_search_cached_platform       == platform:
-           log_debug('Scraper_MobyGames::check_cache Cache HIT.')
-           return True
-        log_debug('Scraper_MobyGames::check_cache Cache MISS. Updating cache.')
-
-        return False
-
-    def update_cache(self, search_string, rom_base_noext, platform, page_data):
-        self.get_search_cached_search_string  = search_string
-        self.get_search_cached_rom_base_noext = rom_base_noext
-        self.get_search_cached_platform       = platform
-        self.get_search_cached_page_data      = page_data
-
-    def reset_cache(self):
-        self.get_search_cached_search_string  = ''
-        self.get_search_cached_rom_base_noext = ''
-        self.get_search_cached_platform       = ''
-        self.get_search_cached_page_data      = ''
-
-    def get_cached_pagedata(self):
-        return self.get_search_cached_page_data
-
     # --- Search with no platform -----------------------------------------------------------------
     # http://www.mobygames.com/search/quick?q=super+mario+world
     #
@@ -279,6 +238,10 @@ class Scraper_MobyGames():
             log_debug('Scraper_MobyGames::get_search AEL platform       "{0}"'.format(platform))
             log_debug('Scraper_MobyGames::get_search MobyGames platform "{0}"'.format(scraper_platform))
 
+        cache_key = ('MobyGames', search_string, rom_base_noext, platform)
+        game_list = scraper_search_cache.get(cache_key)
+        if game_list is not None: return game_list
+
         # --- Search for games and get search page data ---
         # >> NOTE Search result page is a little bit different if platform used or not!!!
         # >> Findall returns a list of tuples. Tuples elements are the groups
@@ -291,13 +254,7 @@ class Scraper_MobyGames():
         else:
             log_debug('Scraper_MobyGames::get_search Search using platform')
             url = 'http://www.mobygames.com/search/quick?q={0}&p={1}'.format(str_mobygames, scraper_platform)
-        if self.check_cache(search_string, rom_base_noext, platform):
-            page_data = self.get_cached_pagedata()
-        else:
-            page_data = net_get_URL_oneline(url)
-            # >> If nothing is returned maybe a timeout happened. In this case, reset the cache.
-            if page_data: self.update_cache(search_string, rom_base_noext, platform, page_data)
-            else:         self.reset_cache()
+        page_data = net_get_URL_oneline(url)
 
         # --- Extract information from page data ---
         game_list = []        
@@ -333,6 +290,8 @@ class Scraper_MobyGames():
                 game['display_name'] = game_name + ' / {0}'.format(platform)
                 game['game_name']    = game_name # Additional MobyGames scraper field
                 game_list.append(game)
+        if page_data: scraper_search_cache.put(cache_key, game_list)
+        if not game_list: net_cache_set_short_TTL(url)
 
         return game_list
 
@@ -340,12 +299,6 @@ class Scraper_MobyGames():
 # Arcade Database (for MAME) http://adb.arcadeitalia.net/
 # ----------------------------------------------------------------------------- 
 class Scraper_ArcadeDB():
-    def __init__(self):
-        self.get_search_cached_search_string  = ''
-        self.get_search_cached_rom_base_noext = ''
-        self.get_search_cached_platform       = ''
-        self.get_search_cached_page_data      = ''
-
     def get_search(self, search_string, rom_base_noext, platform):
         if DEBUG_SCRAPERS:
             log_debug('Scraper_ArcadeDB::get_search search_string      "{0}"'.format(search_string))
@@ -353,6 +306,10 @@ class Scraper_ArcadeDB():
             log_debug('Scraper_ArcadeDB::get_search AEL platform       "{0}"'.format(platform))
 
         # >> MAME always uses rom_base_noext and ignores search_string.
+        cache_key = ('ArcadeDB', '', rom_base_noext, platform)
+        game_list = scraper_search_cache.get(cache_key)
+        if game_list is not None: return game_list
+
         # >> Example game search: http://adb.arcadeitalia.net/dettaglio_mame.php?game_name=dino
         url = 'http://adb.arcadeitalia.net/dettaglio_mame.php?lang=en&game_name={0}'.format(rom_base_noext)
         page_data = net_get_URL_oneline(url)
@@ -371,11 +328,15 @@ class Scraper_ArcadeDB():
             # >> Example URL: http://adb.arcadeitalia.net/dettaglio_mame.php?game_name=dino&lang=en
             # >> <div id="game_description" class="invisibile">Cadillacs and Dinosaurs (World 930201)</div>
             m_title = re.findall('<div id="game_description" class="invisibile">(.+?)</div>', page_data)
-            if not m_title: return game_list
+            if not m_title:
+                net_cache_set_short_TTL(url)
+                return game_list
             game = {}
             game['display_name'] = m_title[0]
             game['id']           = url
             game['mame_name']    = rom_base_noext
             game_list.append(game)
+        if page_data: scraper_search_cache.put(cache_key, game_list)
+        if not game_list: net_cache_set_short_TTL(url)
 
         return game_list
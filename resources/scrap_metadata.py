@@ -33,21 +33,64 @@ class metadata_NULL(Scraper_Metadata):
     def set_addon_dir(self, plugin_dir):
         pass
 
+    def set_cache_dir(self, cache_dir):
+        pass
+
     def get_search(self, search_string, rom_base_noext, platform):
         return {}
     
     def get_metadata(self, game):
         return {}
 
+# -----------------------------------------------------------------------------
+# Trigram inverted index of the offline database game names.
+# A name contains the search string only if it contains all the trigrams of the search string,
+# so candidates are the intersection of the trigram posting sets, starting with the smallest one.
+# Candidates are then checked with a plain substring search (no regular expressions).
+# -----------------------------------------------------------------------------
+class OfflineTrigramIndex:
+    def __init__(self, games):
+        self.names    = {}
+        self.trigrams = {}
+        for key in games:
+            name_lower = games[key]['name'].lower()
+            self.names[key] = name_lower
+            for trigram in self._get_trigrams(name_lower):
+                if trigram in self.trigrams: self.trigrams[trigram].add(key)
+                else:                        self.trigrams[trigram] = set([key])
+
+    @staticmethod
+    def _get_trigrams(text):
+        return set([text[i:i+3] for i in range(len(text) - 2)])
+
+    # Returns the list of keys whose lowercase name contains text_lower.
+    def search(self, text_lower):
+        trigrams = self._get_trigrams(text_lower)
+        if trigrams:
+            postings = sorted([self.trigrams.get(t, set()) for t in trigrams], key = len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates: break
+                candidates.intersection_update(posting)
+        else:
+            # >> Search strings shorter than 3 characters check all the names.
+            candidates = self.names.iterkeys()
+
+        return [key for key in candidates if text_lower in self.names[key]]
+
 # -----------------------------------------------------------------------------
 # Offline scraper using XML files for MAME and No-Intro ROMs.
 # -----------------------------------------------------------------------------
 class metadata_Offline(Scraper_Metadata):
+    is_offline = True
+
     # Offline XML data will be cached here (from disk)
     games = {}
+    search_index = None
     cached_xml_path = ''
     cached_platform = ''
     addon_dir = ''
+    cache_dir = ''
 
     def __init__(self):
         self.name = 'AEL/GameDBInfo Offline'
@@ -55,6 +98,10 @@ class metadata_Offline(Scraper_Metadata):
     def set_addon_dir(self, plugin_dir):
         self.addon_dir = plugin_dir
         log_debug('metadata_Offline::set_addon_dir() self.addon_dir = {0}'.format(self.addon_dir))
+
+    def set_cache_dir(self, cache_dir):
+        self.cache_dir = cache_dir
+        log_debug('metadata_Offline::set_cache_dir() self.cache_dir = {0}'.format(self.cache_dir))
         
     # Load XML information for this scraper and keep it cached in memory.
     # For offline scrapers.
@@ -72,6 +119,7 @@ class metadata_Offline(Scraper_Metadata):
             log_debug('metadata_Offline::initialise_scraper Platform {0} not found'.format(platform))
             log_debug('metadata_Offline::initialise_scraper Defaulting to Unknown')
             self.games = {}
+            self.search_index = None
             self.cached_xml_path = ''
             self.cached_platform = 'Unknown'
             return
@@ -79,12 +127,17 @@ class metadata_Offline(Scraper_Metadata):
         # Load XML database and keep it in memory for subsequent calls
         xml_path = os.path.join(self.addon_dir, xml_file)
         log_debug('metadata_Offline::initialise_scraper Loading XML {0}'.format(xml_path))
-        self.games = fs_load_GameInfo_XML(xml_path)
+        if self.cache_dir: self.games = fs_load_GameInfo_XML_cached(xml_path, self.cache_dir)
+        else:              self.games = fs_load_GameInfo_XML(xml_path)
         if not self.games:
             self.games = {}
+            self.search_index = None
             self.cached_xml_path = ''
             self.cached_platform = 'Unknown'
             return
+        # >> MAME search is always an exact match. No-Intro fuzzy search uses the trigram index.
+        if platform == 'MAME': self.search_index = None
+        else:                  self.search_index = OfflineTrigramIndex(self.games)
         self.cached_xml_path = xml_path
         self.cached_platform = platform
         log_debug('metadata_Offline::initialise_scraper cached_xml_path = {0}'.format(self.cached_xml_path))
@@ -128,30 +181,19 @@ class metadata_Offline(Scraper_Metadata):
             # --- If nothing found, do a fuzzy search ---
             log_verb("metadata_Offline::get_search Mode No-Intro -> Fuzzy search '{0}'".format(search_string))
             search_string_lower = search_string.lower()
-            regexp = '.*{0}.*'.format(search_string_lower)
-            try:
-                # >> Sometimes this produces: raise error, v # invalid expression
-                p = re.compile(regexp)
-            except:
-                log_info('metadata_Offline::get_search Exception in re.compile(regexp)')
-                log_info('metadata_Offline::get_search regexp = "{0}"'.format(regexp))
-                return results_ret
-
             game_list = []
-            for key in self.games:
-                this_game_name       = self.games[key]['name']
-                this_game_name_lower = this_game_name.lower()
-                match = p.match(this_game_name_lower)
-                if match:
-                    game = {'id'           : self.games[key]['name'], 
-                            'display_name' : self.games[key]['name'],
-                            'order': 1 }
-                    # If there is an exact match of the No-Intro name put that game first.
-                    if search_string == this_game_name: game['order'] += 1
-                    if rom_base_noext == this_game_name: game['order'] += 1
-                    # Append to list
-                    game_list.append(game)
-            game_list.sort(key = lambda result: result['order'], reverse = True)
+            for key in self.search_index.search(search_string_lower):
+                this_game_name = self.games[key]['name']
+                game = {'id'           : this_game_name, 
+                        'display_name' : this_game_name,
+                        'order': 1 }
+                # If there is an exact match of the No-Intro name put that game first.
+                if search_string == this_game_name: game['order'] += 1
+                if rom_base_noext == this_game_name: game['order'] += 1
+                # Append to list
+                game_list.append(game)
+            # >> Same score: shorter names (closer to the search string) first.
+            game_list.sort(key = lambda result: (-result['order'], len(result['id']), result['id']))
             results_ret = game_list
 
         return results_ret
@@ -191,11 +233,13 @@ class metadata_Offline(Scraper_Metadata):
 class metadata_TheGamesDB(Scraper_Metadata, Scraper_TheGamesDB):
     def __init__(self):
         self.name = 'TheGamesDB'
-        Scraper_TheGamesDB.__init__(self)
 
     def set_addon_dir(self, plugin_dir):
         pass
 
+    def set_cache_dir(self, cache_dir):
+        pass
+
     # Call common code in parent class
     def get_search(self, search_string, rom_base_noext, platform):
         return Scraper_TheGamesDB.get_search(self, search_string, rom_base_noext, platform)
@@ -224,6 +268,7 @@ class metadata_TheGamesDB(Scraper_Metadata, Scraper_TheGamesDB):
             
         game_plot = ''.join(re.findall('<Overview>(.*?)</Overview>', page_data))
         gamedata['plot'] = text_unescape_and_untag_HTML(game_plot) if game_plot else ''
+        if not gamedata['title']: net_cache_set_short_TTL(game_id_url)
 
         return gamedata
 
@@ -233,11 +278,13 @@ class metadata_TheGamesDB(Scraper_Metadata, Scraper_TheGamesDB):
 class metadata_GameFAQs(Scraper_Metadata, Scraper_GameFAQs):
     def __init__(self):
         self.name = 'GameFAQs'
-        Scraper_GameFAQs.__init__(self)
 
     def set_addon_dir(self, plugin_dir):
         pass
 
+    def set_cache_dir(self, cache_dir):
+        pass
+
     # >> Call common code in parent class
     def get_search(self, search_string, rom_base_noext, platform):
         return Scraper_GameFAQs.get_search(self, search_string, rom_base_noext, platform)
@@ -273,6 +320,9 @@ class metadata_GameFAQs(Scraper_Metadata, Scraper_GameFAQs):
 
         game_plot = re.findall('Description</h2></div><div class="body game_desc"><div class="desc">(.*?)</div>', page_data)
         if game_plot: gamedata['plot'] = text_unescape_and_untag_HTML(game_plot[0])
+        # >> Title comes from the search results. If nothing else was found the page was not parsed.
+        if not (gamedata['genre'] or gamedata['year'] or gamedata['studio'] or gamedata['plot']):
+            net_cache_set_short_TTL(game_id_url)
             
         return gamedata
 
@@ -282,11 +332,13 @@ class metadata_GameFAQs(Scraper_Metadata, Scraper_GameFAQs):
 class metadata_MobyGames(Scraper_Metadata, Scraper_MobyGames):
     def __init__(self):
         self.name = 'MobyGames'
-        Scraper_MobyGames.__init__(self)
 
     def set_addon_dir(self, plugin_dir):
         pass
 
+    def set_cache_dir(self, cache_dir):
+        pass
+
     # Call common code in parent class
     def get_search(self, search_string, rom_base_noext, platform):
         return Scraper_MobyGames.get_search(self, search_string, rom_base_noext, platform)
@@ -335,6 +387,9 @@ class metadata_MobyGames(Scraper_Metadata, Scraper_MobyGames):
 
         game_description = re.findall('<h2>Description</h2>(.*?)<div class="sideBarLinks">', page_data)
         if game_description: gamedata['plot'] = text_unescape_and_untag_HTML(game_description[0])
+        # >> Title comes from the search results. If nothing else was found the page was not parsed.
+        if not (gamedata['genre'] or gamedata['year'] or gamedata['studio'] or gamedata['plot']):
+            net_cache_set_short_TTL(game_id_url)
         
         return gamedata
 
@@ -344,11 +399,13 @@ class metadata_MobyGames(Scraper_Metadata, Scraper_MobyGames):
 class metadata_ArcadeDB(Scraper_Metadata, Scraper_ArcadeDB):
     def __init__(self):
         self.name = 'Arcade Database'
-        Scraper_ArcadeDB.__init__(self)
 
     def set_addon_dir(self, plugin_dir):
         pass
 
+    def set_cache_dir(self, cache_dir):
+        pass
+
     # Call common code in parent class
     def get_search(self, search_string, rom_base_noext, platform):
         return Scraper_ArcadeDB.get_search(self, search_string, rom_base_noext, platform)
@@ -389,5 +446,6 @@ class metadata_ArcadeDB(Scraper_Metadata, Scraper_ArcadeDB):
         # <div id="history_detail" class="extra_info_detail"><div class="history_title"></div>Aliens © 1990 Konami........&amp;id=63&amp;o=2</div>
         fa_plot = re.findall('<div id="history_detail" class="extra_info_detail"><div class=\'history_title\'></div>(.*?)</div>', page_data)
         if fa_plot: gamedata['plot'] = text_unescape_and_untag_HTML(fa_plot[0])
+        if not gamedata['title']: net_cache_set_short_TTL(game_id_url)
 
         return gamedata
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#
+# Advanced Emulator Launcher scraping pipeline
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import os, copy, threading, Queue, collections
+
+# --- AEL modules ---
+from utils import *
+from net_IO import *
+from assets import *
+from rom_name import *
+
+# -------------------------------------------------------------------------------------------------
+# Scraping pipeline used by the ROM scanner in automatic scraping mode.
+#
+# Scraping is dominated by network latency. A bounded pool of worker threads scrapes several ROMs
+# at the same time. Every ROM job goes through the stages search -> metadata -> image list ->
+# resolve -> download. The number of simultaneous connections to a given host is limited in
+# net_IO.py so websites are not hammered.
+#
+# Worker threads never touch the ROMs dictionary or Kodi GUI. Results are stored in the job and
+# merged into the ROMs dictionary by the main thread, in the same order the jobs were submitted,
+# using get_finished_jobs(). This makes the result of a scan independent of thread scheduling.
+#
+# Each worker has its own copy of the metadata and asset scrapers because scrapers cache the last
+# page downloaded in the object. The offline metadata scraper is the exception: it keeps a big XML
+# database in memory, so all workers share it and access it with a lock.
+# -------------------------------------------------------------------------------------------------
+class ScraperJob:
+    # romdata      -> ROM dictionary. Only modified by the main thread when merging.
+    # ROM          -> FileName object
+    # asset_jobs   -> list of (asset_kind, asset_path_noext) tuples. asset_path_noext is a FileName.
+    def __init__(self, romdata, ROM, platform, scrap_metadata, asset_jobs):
+        self.romdata        = romdata
+        self.ROM            = ROM
+        self.platform       = platform
+        self.scrap_metadata = scrap_metadata
+        self.asset_jobs     = asset_jobs
+
+        # --- Results filled by the worker thread ---
+        self.gamedata       = None
+        self.asset_results  = {}
+        self.finished       = threading.Event()
+
+class ScraperPipeline:
+    def __init__(self, scraper_metadata, scraper_asset, num_workers):
+        self.scraper_metadata = scraper_metadata
+        self.metadata_lock    = threading.Lock()
+        self.scraper_asset    = scraper_asset
+        self.num_workers      = num_workers
+        # >> Bound the number of submitted jobs so memory does not grow with the number of ROMs.
+        self.job_queue        = Queue.Queue(2 * num_workers)
+        self.pending_jobs     = collections.deque()
+        self.stop_event       = threading.Event()
+        self.workers          = []
+        log_verb('ScraperPipeline() Starting {0} workers'.format(num_workers))
+        for i in range(num_workers):
+            if scraper_metadata.is_offline: worker_metadata = scraper_metadata
+            else:                           worker_metadata = copy.copy(scraper_metadata)
+            worker = threading.Thread(target = self._worker,
+                                      args = (worker_metadata, copy.copy(scraper_asset)))
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+
+    # Blocks if there are too many jobs waiting for a worker.
+    def submit(self, job):
+        self.pending_jobs.append(job)
+        self.job_queue.put(job)
+
+    def num_pending_jobs(self):
+        return len(self.pending_jobs)
+
+    # Returns the list of finished jobs in submission order. Stops at the first unfinished job.
+    # If timeout is not None, wait at most timeout seconds for the oldest pending job.
+    def get_finished_jobs(self, timeout = None):
+        if timeout is not None and self.pending_jobs:
+            self.pending_jobs[0].finished.wait(timeout)
+        finished_jobs = []
+        while self.pending_jobs and self.pending_jobs[0].finished.is_set():
+            finished_jobs.append(self.pending_jobs.popleft())
+
+        return finished_jobs
+
+    # Workers finish the stage they are in and discard pending jobs.
+    def stop(self):
+        log_verb('ScraperPipeline::stop() Stopping workers')
+        self.stop_event.set()
+        self.close()
+
+    def close(self):
+        for worker in self.workers: self.job_queue.put(None)
+        for worker in self.workers: worker.join()
+        self.workers = []
+
+    # ---------------------------------------------------------------------------------------------
+    # Worker threads
+    # ---------------------------------------------------------------------------------------------
+    def _worker(self, scraper_metadata, scraper_asset):
+        while True:
+            job = self.job_queue.get()
+            if job is None: break
+            if not self.stop_event.is_set():
+                try:
+                    self._process_job(job, scraper_metadata, scraper_asset)
+                except Exception as e:
+                    log_error('ScraperPipeline::_worker() Exception scraping "{0}"'.format(job.ROM.getBase()))
+                    log_error('ScraperPipeline::_worker() {0}'.format(unicode(e)))
+            job.finished.set()
+
+    def _process_job(self, job, scraper_metadata, scraper_asset):
+        rom_base_noext    = job.ROM.getBase_noext()
+        rom_name_scraping = rom_name_format_for_scraping(rom_base_noext)
+        if job.scrap_metadata:
+            if scraper_metadata.is_offline:
+                with self.metadata_lock:
+                    job.gamedata = self._stage_metadata(scraper_metadata, rom_name_scraping,
+                                                        rom_base_noext, job.platform)
+            else:
+                job.gamedata = self._stage_metadata(scraper_metadata, rom_name_scraping,
+                                                    rom_base_noext, job.platform)
+
+        asset_jobs = [x for x in job.asset_jobs if scraper_asset.supports_asset(x[0])]
+        if not asset_jobs: return
+        results = self._stage_search(scraper_asset, rom_name_scraping, rom_base_noext, job.platform)
+        if not results: return
+        for (asset_kind, asset_path_noext) in asset_jobs:
+            if self.stop_event.is_set(): return
+            image_list = self._stage_image_list(scraper_asset, results[0], asset_kind)
+            if not image_list: continue
+            (image_url, image_ext) = self._stage_resolve(scraper_asset, image_list[0])
+            if not image_url: continue
+            image_path = self._stage_download(image_url, asset_path_noext, image_ext)
+            if image_path: job.asset_results[asset_kind] = image_path
+
+    def _stage_metadata(self, scraper_metadata, rom_name_scraping, rom_base_noext, platform):
+        results = scraper_metadata.get_search(rom_name_scraping, rom_base_noext, platform)
+        log_debug('ScraperPipeline::_stage_metadata() Found {0} result/s'.format(len(results)))
+        if not results: return None
+
+        return scraper_metadata.get_metadata(results[0])
+
+    def _stage_search(self, scraper_asset, rom_name_scraping, rom_base_noext, platform):
+        results = scraper_asset.get_search(rom_name_scraping, rom_base_noext, platform)
+        log_debug('ScraperPipeline::_stage_search() Found {0} result/s'.format(len(results)))
+
+        return results
+
+    def _stage_image_list(self, scraper_asset, game, asset_kind):
+        image_list = scraper_asset.get_images(game, asset_kind)
+        log_debug('ScraperPipeline::_stage_image_list() Returned {0} images'.format(len(image_list)))
+
+        return image_list
+
+    def _stage_resolve(self, scraper_asset, image_dic):
+        return scraper_asset.resolve_image_URL(image_dic)
+
+    # Returns the path of the downloaded image or '' if download failed.
+    def _stage_download(self, image_url, asset_path_noext, image_ext):
+        image_path = asset_path_noext.pjoin().append(image_ext).getPath()
+        log_verb('ScraperPipeline::_stage_download() Downloading URL "{0}"'.format(image_url))
+        log_verb('ScraperPipeline::_stage_download() Into local file "{0}"'.format(image_path))
+        net_download_img(image_url, image_path)
+        if not os.path.isfile(image_path): return ''
+
+        return image_path
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# Advanced Emulator Launcher background service
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import os, json, marshal, socket, threading, SocketServer
+from collections import OrderedDict
+
+# --- Kodi stuff ---
+import xbmc, xbmcaddon
+
+# --- Modules/packages in this plugin ---
+from utils import *
+from utils_kodi import *
+from disk_IO import *
+from service_IO import *
+
+# --- Addon object (used to access settings) ---
+__addon_obj__     = xbmcaddon.Addon()
+__addon_id__      = __addon_obj__.getAddonInfo('id').decode('utf-8')
+PLUGIN_DATA_DIR   = FileName('special://profile/addon_data').join(__addon_id__)
+
+# --- Number of launchers whose ROMs are kept in memory ---
+SERVICE_ROMS_CACHE_SIZE = 8
+
+# -------------------------------------------------------------------------------------------------
+# Databases kept in memory. Every entry is validated with the stat() of the file it was loaded
+# from. AEL writes files atomically with a rename, so the inode changes even if the size and
+# mtime of the new file are the same. Loading is done with the lock held, so when several
+# requests for the same file arrive at the same time the file is loaded only once.
+# Databases are stored already marshaled. This is what is sent to the plugin and takes less
+# memory than the dictionaries.
+# -------------------------------------------------------------------------------------------------
+class AELServiceCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries     = OrderedDict()
+        self.lock        = threading.Lock()
+
+    # Returns the marshaled reply of key, calling loader() if file_path changed or the key is
+    # not cached.
+    def get(self, key, file_path, loader):
+        with self.lock:
+            try:
+                st = os.stat(file_path)
+                stat_key = (file_path, st.st_ino, st.st_size, st.st_mtime, st.st_ctime)
+            except OSError:
+                stat_key = (file_path, None, None, None, None)
+            if key in self.entries:
+                entry = self.entries.pop(key)
+                if entry[0] == stat_key:
+                    self.entries[key] = entry
+                    return entry[1]
+                log_debug('AELServiceCache::get() Reloading "{0}"'.format(file_path))
+            reply = marshal.dumps((True, loader()))
+            self.entries[key] = (stat_key, reply)
+            while len(self.entries) > self.max_entries: self.entries.popitem(last = False)
+
+            return reply
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+class AELServiceRequestHandler(SocketServer.BaseRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(service_recv_message(self.request))
+            reply = self.server.ael_service.process_request(request[0], request[1])
+            service_send_message(self.request, reply)
+        except Exception as e:
+            log_error('AELServiceRequestHandler::handle() Exception {0}'.format(unicode(e)))
+
+class AELServiceServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    allow_reuse_address = True
+    daemon_threads      = True
+
+# -------------------------------------------------------------------------------------------------
+# The service is a Kodi Monitor. The socket server runs in its own thread and is started or
+# stopped when the user changes the service settings.
+# -------------------------------------------------------------------------------------------------
+class AELService(xbmc.Monitor):
+    def __init__(self):
+        xbmc.Monitor.__init__(self)
+        self.server        = None
+        self.server_thread = None
+        self.server_port   = 0
+        self.data_dir      = os.path.join(PLUGIN_DATA_DIR.getPath(), '')
+        self.cat_cache     = AELServiceCache(1)
+        self.fav_cache     = AELServiceCache(1)
+        self.roms_cache    = AELServiceCache(SERVICE_ROMS_CACHE_SIZE)
+
+    def run(self):
+        log_info('AELService::run() Service started')
+        self._apply_settings()
+        while not self.abortRequested():
+            if self.waitForAbort(10): break
+        self._stop_server()
+        log_info('AELService::run() Service stopped')
+
+    def onSettingsChanged(self):
+        self._apply_settings()
+
+    def _apply_settings(self):
+        set_log_level(int(__addon_obj__.getSetting('log_level')))
+        fs_set_ROMs_storage(int(__addon_obj__.getSetting('roms_storage')))
+        service_enabled = True if __addon_obj__.getSetting('service_enabled') == 'true' else False
+        service_port    = int(__addon_obj__.getSetting('service_port'))
+        if service_enabled and self.server and self.server_port == service_port: return
+        self._stop_server()
+        if service_enabled: self._start_server(service_port)
+
+    def _start_server(self, port):
+        try:
+            self.server = AELServiceServer((SERVICE_HOST, port), AELServiceRequestHandler)
+        except socket.error as e:
+            log_error('AELService::_start_server() Cannot listen on port {0}'.format(port))
+            log_error('AELService::_start_server() {0}'.format(unicode(e)))
+            self.server = None
+            return
+        self.server.ael_service = self
+        self.server_port = port
+        self.server_thread = threading.Thread(target = self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        log_info('AELService::_start_server() Listening on {0}:{1}'.format(SERVICE_HOST, port))
+
+    def _stop_server(self):
+        if not self.server: return
+        log_info('AELService::_stop_server() Stopping server')
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+        self.server        = None
+        self.server_thread = None
+        self.server_port   = 0
+        self.cat_cache.clear()
+        self.fav_cache.clear()
+        self.roms_cache.clear()
+
+    # ---------------------------------------------------------------------------------------------
+    # Requests. Called from the server threads. Returns the marshaled tuple (status, data).
+    # Only files inside the addon data directory are served.
+    # ---------------------------------------------------------------------------------------------
+    def process_request(self, command, args):
+        log_debug('AELService::process_request() Command "{0}"'.format(command))
+        path = os.path.abspath(os.path.join(*args))
+        if not path.startswith(self.data_dir):
+            log_warning('AELService::process_request() Rejected path "{0}"'.format(path))
+            return marshal.dumps((False, None))
+
+        if command == 'load_catfile':
+            categories_file = FileName(args[0])
+            reply = self.cat_cache.get(args[0], args[0], lambda: fs_load_catfile(categories_file))
+        elif command == 'load_Favourites':
+            fav_file = FileName(args[0])
+            reply = self.fav_cache.get(args[0], args[0], lambda: fs_load_Favourites_JSON(fav_file))
+        elif command == 'load_ROMs':
+            roms_dir = FileName(args[0])
+            roms_base_noext = args[1]
+            backend = fs_find_ROMs_storage(roms_dir, roms_base_noext)
+            if backend is None: return marshal.dumps((True, {}))
+            roms_file_path = fs_get_ROMs_storage_file_path(roms_dir, roms_base_noext, backend).getPath()
+            reply = self.roms_cache.get((args[0], roms_base_noext), roms_file_path,
+                                       lambda: fs_load_ROMs_storage(roms_dir, roms_base_noext, backend))
+        else:
+            log_warning('AELService::process_request() Unknown command "{0}"'.format(command))
+            return marshal.dumps((False, None))
+
+        return reply
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Advanced Emulator Launcher background service client and protocol
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import gc
+import json
+import marshal
+import socket
+import struct
+
+# --- AEL modules ---
+# >> This module is imported by disk_IO.py and must only depend on utils_kodi.py.
+from utils_kodi import *
+
+# -------------------------------------------------------------------------------------------------
+# The AEL service (resources/service.py) runs in the background while Kodi is running and keeps
+# the parsed databases in memory. The plugin asks the service for the databases through a TCP
+# socket bound to localhost, which works on all Kodi platforms. If the service is not running the
+# plugin reads the databases from disk as usual.
+#
+# Every message is a 4 bytes little endian length followed by the payload.
+#   Request  -> JSON list [command, [arg, arg, ...]]
+#   Response -> marshal tuple (status, data). status is True if data is valid.
+# The service never unmarshals data coming from the socket. The plugin and the service run in
+# the same Kodi Python interpreter so marshal is safe and much faster than JSON for big dictionaries.
+# -------------------------------------------------------------------------------------------------
+SERVICE_HOST         = '127.0.0.1'
+SERVICE_PORT_DEFAULT = 45671
+SERVICE_TIMEOUT      = 10.0
+SERVICE_MSG_HEADER   = struct.Struct(b'<I')
+SERVICE_MSG_MAX_SIZE = 256 * 1024 * 1024
+
+# >> 0 if the client is disabled. Set with service_set_client_port() when the plugin starts.
+service_client_port = 0
+
+def service_send_message(sock, data):
+    sock.sendall(SERVICE_MSG_HEADER.pack(len(data)) + data)
+
+def service_recv_bytes(sock, size):
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk: raise EOFError('Connection closed')
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b''.join(chunks)
+
+def service_recv_message(sock):
+    (size,) = SERVICE_MSG_HEADER.unpack(service_recv_bytes(sock, SERVICE_MSG_HEADER.size))
+    if size > SERVICE_MSG_MAX_SIZE: raise ValueError('Message too big ({0} bytes)'.format(size))
+
+    return service_recv_bytes(sock, size)
+
+# -------------------------------------------------------------------------------------------------
+# Client
+# -------------------------------------------------------------------------------------------------
+def service_set_client_port(port):
+    global service_client_port
+
+    service_client_port = port
+    log_debug('service_set_client_port() Port {0}'.format(port))
+
+#
+# Sends a request to the service. Returns the data or None if the service is not running or
+# the request failed. After a connection error the client is disabled, so a plugin invocation
+# does not wait for a service that is not there more than once.
+#
+def service_request(command, args):
+    global service_client_port
+
+    if not service_client_port: return None
+    try:
+        sock = socket.create_connection((SERVICE_HOST, service_client_port), SERVICE_TIMEOUT)
+        try:
+            service_send_message(sock, json.dumps([command, args]))
+            reply = service_recv_message(sock)
+        finally:
+            sock.close()
+        # >> Disabling the garbage collector makes unmarshaling big dictionaries much faster.
+        gc.disable()
+        try:
+            (status, data) = marshal.loads(reply)
+        finally:
+            gc.enable()
+    except (socket.error, socket.timeout, EOFError, ValueError, TypeError, struct.error) as e:
+        log_verb('service_request() Service not available ({0}). Using disk.'.format(unicode(e)))
+        service_client_port = 0
+        return None
+    if not status:
+        log_verb('service_request() Service failed command "{0}". Using disk.'.format(command))
+        return None
+    log_debug('service_request() Command "{0}" served by service'.format(command))
+
+    return data
+
+def service_load_catfile(categories_file_path):
+    return service_request('load_catfile', [categories_file_path])
+
+def service_load_ROMs(roms_dir_path, roms_base_noext):
+    return service_request('load_ROMs', [roms_dir_path, roms_base_noext])
+
+def service_load_Favourites(fav_file_path):
+    return service_request('load_Favourites', [fav_file_path])
@@ -0,0 +1,179 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Benchmark the ROM name parser
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- INSTRUCTIONS --------------------------------------------------------------------------------
+# Reads the game names of one or more No-Intro/Redump DATs (Logiqx XML format) and, for every
+# name, computes the ROM title, the scraping search string and the multidisc information like
+# the ROM scanner does. The old regular expression functions (copied below) are timed against
+# rom_name.py without cache (first scan) and with cache (names already parsed). The script also
+# prints the names where the old and new results differ.
+#
+# Usage: benchmark_ROM_names.py [DAT file] [DAT file] ...
+# If no DAT is given the GameDBInfo XML files of the offline scraper are used.
+# -------------------------------------------------------------------------------------------------
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import sys, os, re, io, glob, time
+
+# --- Import AEL stuff ---
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import *
+import rom_name
+from rom_name import *
+
+# --- Configuration -------------------------------------------------------------------------------
+DAT_FILE_LIST = [x.decode('utf-8') for x in sys.argv[1:]]
+if not DAT_FILE_LIST:
+    DAT_FILE_LIST = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'data', 'GameDBInfo', '*.xml')))
+ROM_EXTENSION = '.zip'
+
+# --- Functions -----------------------------------------------------------------------------------
+game_name_p = re.compile(r'<(?:game|machine) name="([^"]+)"')
+
+def load_DAT_names(dat_file_list):
+    names = []
+    for dat_file in dat_file_list:
+        with io.open(dat_file, 'rt', encoding = 'utf-8', errors = 'replace') as file:
+            for line in file:
+                m = game_name_p.search(line)
+                if m: names.append(text_unescape_XML(m.group(1)))
+
+    return names
+
+# >> ROM name functions in utils.py before rom_name.py was added.
+def old_format_ROM_name_for_scraping(title):
+    title = re.sub('\[.*?\]', '', title)
+    title = re.sub('\(.*?\)', '', title)
+    title = re.sub('\{.*?\}', '', title)
+    title = title.replace('_', '')
+    title = title.replace('-', '')
+    title = title.replace(':', '')
+    title = title.replace('.', '')
+    title = title.strip()
+
+    return title
+
+def old_format_ROM_title(title, clean_tags):
+    if not clean_tags: return title
+    reg_exp = '\[.+?\]\s?|\(.+?\)\s?|\{.+?\}|[^\[\(\{]+'
+    tokens = re.findall(reg_exp, title)
+    str_list = []
+    for token in tokens:
+        stripped_token = token.strip()
+        if (stripped_token[0] == '[' or stripped_token[0] == '(' or stripped_token[0] == '{') and \
+           stripped_token != '[BIOS]':
+            continue
+        str_list.append(stripped_token)
+
+    return ' '.join(str_list)
+
+def old_get_ROM_basename_tokens(basename_str):
+    reg_exp = '\[.+?\]|\(.+?\)|\{.+?\}|[^\[\(\{]+'
+    tokens_raw = re.findall(reg_exp, basename_str)
+    tokens_strip = list()
+    for token in tokens_raw: tokens_strip.append(token.strip())
+    tokens_clean = list()
+    for token in tokens_strip:
+        if token: tokens_clean.append(token)
+    tokens = list()
+    for token in tokens_clean:
+        if token == '-': continue
+        tokens.append(token)
+
+    return tokens
+
+def old_get_multidisc_info(ROM_FN):
+    MDSet = MultiDiscInfo(ROM_FN)
+    tokens = old_get_ROM_basename_tokens(ROM_FN.getBase_noext())
+    MultDiscFound = False
+    for index, token in enumerate(tokens):
+        matchObj = re.match(r'\(Disc ([0-9]+)\)', token)
+        if matchObj:
+            tokens_idx = range(0, len(tokens))
+            tokens_idx.remove(index)
+            tokens_mdisc = [tokens[x] for x in tokens_idx]
+            MultDiscFound = True
+            break
+        matchObj = re.match(r'\(Disc ([0-9]+) of ([0-9]+)\)', token)
+        if matchObj:
+            tokens_idx = range(0, len(tokens))
+            tokens_idx.remove(index)
+            tokens_mdisc = [tokens[x] for x in tokens_idx]
+            MultDiscFound = True
+            break
+    if MultDiscFound:
+        MDSet.isMultiDisc = True
+        MDSet.setName = ' '.join(tokens_mdisc) + MDSet.extension
+        MDSet.order = int(matchObj.group(1))
+
+    return MDSet
+
+# >> The scanner computes the title, scraping string and multidisc information of every file.
+def process_old(ROM_list):
+    results = []
+    for ROM in ROM_list:
+        base_noext = ROM.getBase_noext()
+        MDSet = old_get_multidisc_info(ROM)
+        results.append((old_format_ROM_title(base_noext, True), old_format_ROM_name_for_scraping(base_noext),
+                        MDSet.isMultiDisc, MDSet.setName, MDSet.order))
+
+    return results
+
+def process_new(ROM_list):
+    results = []
+    for ROM in ROM_list:
+        base_noext = ROM.getBase_noext()
+        MDSet = rom_name_get_multidisc_info(ROM)
+        results.append((rom_name_format_title(base_noext, True), rom_name_format_for_scraping(base_noext),
+                        MDSet.isMultiDisc, MDSet.setName, MDSet.order))
+
+    return results
+
+# --- Main ----------------------------------------------------------------------------------------
+names = load_DAT_names(DAT_FILE_LIST)
+if not names:
+    print('No game names found in the DAT files.')
+    sys.exit(1)
+# >> Make sure the whole DAT fits in the cache so the second pass only has cache hits.
+rom_name.ROM_NAME_CACHE_SIZE = max(rom_name.ROM_NAME_CACHE_SIZE, len(names))
+ROM_list = [FileName('/roms/' + name + ROM_EXTENSION) for name in names]
+print('{0} names in {1} DAT file/s ({2} multidisc)'.format(
+    len(names), len(DAT_FILE_LIST), sum(1 for x in names if '(Disc ' in x)))
+
+t_start = time.time()
+old_results = process_old(ROM_list)
+t_old = time.time() - t_start
+rom_name.rom_name_cache.clear()
+t_start = time.time()
+new_results = process_new(ROM_list)
+t_cold = time.time() - t_start
+t_start = time.time()
+process_new(ROM_list)
+t_warm = time.time() - t_start
+
+print('Old regular expressions  {0:7.3f} s  {1:8.0f} names/s'.format(t_old, len(names) / t_old))
+print('rom_name.py (no cache)   {0:7.3f} s  {1:8.0f} names/s'.format(t_cold, len(names) / t_cold))
+print('rom_name.py (cached)     {0:7.3f} s  {1:8.0f} names/s'.format(t_warm, len(names) / t_warm))
+num_diff = 0
+for (name, old_result, new_result) in zip(names, old_results, new_results):
+    if old_result == new_result: continue
+    num_diff += 1
+    print('Different "{0}"'.format(name))
+    print('   old {0}'.format(old_result))
+    print('   new {0}'.format(new_result))
+print('{0} names with different results'.format(num_diff))
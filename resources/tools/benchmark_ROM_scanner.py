@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Benchmark the ROM scanner duplicate and multidisc checks
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- INSTRUCTIONS --------------------------------------------------------------------------------
+# Creates a synthetic ROM tree in a temporary directory, scans it with the list and generator
+# file walkers and times the old linear duplicate/multidisc checks against the ROMScannerIndex used by the ROM scanner. All the
+# files are already in the ROMs database (rescan case), which is the worst case for the
+# linear search. The linear search is only timed for a sample of files and extrapolated.
+# -------------------------------------------------------------------------------------------------
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import sys, os, time, shutil, tempfile
+
+# --- Import AEL stuff ---
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import *
+
+# --- Configuration -------------------------------------------------------------------------------
+NUM_FILES         = 50000
+FILES_PER_DIR     = 1000
+NUM_LINEAR_SAMPLE = 200
+
+# --- Functions -----------------------------------------------------------------------------------
+def build_synthetic_tree(root_dir):
+    for i in range(NUM_FILES):
+        sub_dir = os.path.join(root_dir, 'dir_{0:03d}'.format(i / FILES_PER_DIR))
+        if not os.path.exists(sub_dir): os.makedirs(sub_dir)
+        if i % 10 == 0: base = 'Game {0:05d} (Europe) (Disc {1})'.format(i / 2, i % 2 + 1)
+        else:           base = 'Game {0:05d} (USA)'.format(i)
+        open(os.path.join(sub_dir, base + '.zip'), 'w').close()
+
+def build_ROMs(files):
+    roms = {}
+    for f_path in files:
+        rom_id = misc_generate_random_SID()
+        roms[rom_id] = {'id' : rom_id, 'filename' : f_path}
+
+    return roms
+
+def linear_check(roms, f_path, setName):
+    for rom_id, rom_dic in roms.iteritems():
+        if FileName(rom_dic['filename']).getBase() == setName: break
+    repeatedROM = False
+    for rom_id in roms:
+        if roms[rom_id]['filename'] == f_path: repeatedROM = True
+
+    return repeatedROM
+
+def indexed_check(roms_idx, f_path, setName):
+    roms_idx.get_multidisc_romID(os.path.join(os.path.dirname(f_path), setName))
+
+    return roms_idx.has_filename(f_path)
+
+# --- Main ----------------------------------------------------------------------------------------
+root_dir = tempfile.mkdtemp(prefix = 'AEL_scanner_')
+try:
+    print('Creating {0} files in {1}...'.format(NUM_FILES, root_dir))
+    build_synthetic_tree(root_dir)
+
+    t_start = time.time()
+    files = FileName(root_dir).recursiveScanFilesInPath('*.*')
+    t_scan = time.time() - t_start
+    print('Scanned {0} files in {1:.3f} s (list)'.format(len(files), t_scan))
+    t_start = time.time()
+    num_files = 0
+    for ROM in FileName(root_dir).iterScanFilesInPath(set(['.zip'])): num_files += 1
+    t_scan = time.time() - t_start
+    print('Scanned {0} files in {1:.3f} s (generator)'.format(num_files, t_scan))
+    roms = build_ROMs(files)
+    setNames = [FileName(f_path).getBase() for f_path in files]
+
+    # --- Old linear search (sampled) ---
+    t_start = time.time()
+    for i in range(NUM_LINEAR_SAMPLE):
+        linear_check(roms, files[i], setNames[i])
+    t_linear = (time.time() - t_start) * len(files) / NUM_LINEAR_SAMPLE
+    print('Linear search  {0:10.3f} s (extrapolated from {1} files)'.format(t_linear, NUM_LINEAR_SAMPLE))
+
+    # --- Hash index (includes index creation) ---
+    t_start = time.time()
+    roms_idx = ROMScannerIndex(roms)
+    for i in range(len(files)):
+        indexed_check(roms_idx, files[i], setNames[i])
+    t_indexed = time.time() - t_start
+    print('Indexed search {0:10.3f} s'.format(t_indexed))
+    print('Speedup        {0:10.1f}x'.format(t_linear / t_indexed))
+finally:
+    shutil.rmtree(root_dir)
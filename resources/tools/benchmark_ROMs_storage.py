@@ -0,0 +1,99 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Benchmark the launcher ROMs storage backends
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- INSTRUCTIONS --------------------------------------------------------------------------------
+# Creates a synthetic launcher with many ROMs in a temporary directory and times, for every
+# backend, writing and loading the whole database, loading only the fields used to render the
+# ROMs list and editing a single ROM the way _command_edit_rom() does (load the ROM, change it
+# and save it).
+# -------------------------------------------------------------------------------------------------
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import sys, os, time, shutil, tempfile
+
+# --- Import AEL stuff ---
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from disk_IO import *
+
+# --- Configuration -------------------------------------------------------------------------------
+NUM_ROMS  = 30000
+NUM_EDITS = 5
+RENDER_FIELDS = ['id', 'm_name', 'm_year', 'm_genre', 'm_studio', 'm_nplayers', 'm_esrb', 'm_rating',
+                 'm_plot', 'disks', 'finished', 'nointro_status',
+                 's_title', 's_snap', 's_fanart', 's_banner', 's_clearlogo', 's_boxfront', 's_boxback',
+                 's_cartridge', 's_flyer', 's_map', 's_trailer']
+
+# --- Functions -----------------------------------------------------------------------------------
+def build_ROMs():
+    roms = {}
+    for i in range(NUM_ROMS):
+        rom = fs_new_rom()
+        rom['id']       = misc_generate_random_SID()
+        rom['m_name']   = 'Game {0:05d}'.format(i)
+        rom['m_year']   = unicode(1980 + i % 30)
+        rom['m_genre']  = 'Genre {0}'.format(i % 20)
+        rom['m_studio'] = 'Studio {0}'.format(i % 200)
+        rom['m_plot']   = 'Plot of game {0}. '.format(i) * 10
+        rom['filename'] = '/home/user/ROMs/Game {0:05d} (USA).zip'.format(i)
+        rom['s_title']  = '/home/user/assets/titles/Game {0:05d} (USA).png'.format(i)
+        rom['s_snap']   = '/home/user/assets/snaps/Game {0:05d} (USA).png'.format(i)
+        roms[rom['id']] = rom
+
+    return roms
+
+def benchmark_backend(backend, roms_dir, roms, launcher, edit_IDs):
+    fs_set_ROMs_storage(backend)
+
+    t_start = time.time()
+    fs_write_ROMs_JSON(roms_dir, 'launcher', roms, launcher)
+    t_write = time.time() - t_start
+
+    t_start = time.time()
+    fs_load_ROMs_fields(roms_dir, 'launcher', RENDER_FIELDS)
+    t_render = time.time() - t_start
+
+    t_start = time.time()
+    roms_loaded = fs_load_ROMs_JSON(roms_dir, 'launcher')
+    t_load = time.time() - t_start
+    if roms_loaded != roms: print('ERROR loaded ROMs differ from written ROMs')
+
+    t_start = time.time()
+    for romID in edit_IDs:
+        roms_edit = fs_load_ROM(roms_dir, 'launcher', romID)
+        roms_edit[romID]['finished'] = True
+        fs_write_ROM(roms_dir, 'launcher', roms_edit, romID, launcher)
+    t_edit = (time.time() - t_start) / len(edit_IDs)
+
+    return (t_write, t_load, t_render, t_edit)
+
+# --- Main ----------------------------------------------------------------------------------------
+roms_dir = FileName(tempfile.mkdtemp(prefix = 'AEL_storage_'))
+try:
+    roms     = build_ROMs()
+    launcher = fs_new_launcher()
+    edit_IDs = roms.keys()[:NUM_EDITS]
+    print('{0} ROMs, {1} single ROM edits'.format(NUM_ROMS, NUM_EDITS))
+    print('{0:<8} {1:>10} {2:>10} {3:>12} {4:>10}'.format('Backend', 'Write (s)', 'Load (s)',
+                                                          'Render (s)', 'Edit (ms)'))
+    for backend in ROMS_STORAGE_LIST:
+        (t_write, t_load, t_render, t_edit) = benchmark_backend(backend, roms_dir, roms, launcher, edit_IDs)
+        print('{0:<8} {1:>10.3f} {2:>10.3f} {3:>12.3f} {4:>10.1f}'.format(
+            ROMS_STORAGE_NAME[backend], t_write, t_load, t_render, 1000 * t_edit))
+        for romID in edit_IDs: roms[romID]['finished'] = True
+finally:
+    shutil.rmtree(roms_dir.getPath())
@@ -0,0 +1,65 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Benchmark the offline scraper fuzzy search
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- INSTRUCTIONS --------------------------------------------------------------------------------
+# Loads a GameDBInfo XML database and searches the first words of every game name, like the
+# ROM scanner does when there is no exact No-Intro match. Compares the old regular expression
+# scan of all the names with the trigram index used by metadata_Offline and checks that both
+# return the same games.
+# -------------------------------------------------------------------------------------------------
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import sys, os, re, time
+
+# --- Import AEL stuff ---
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrap import *
+
+# --- Configuration -------------------------------------------------------------------------------
+XML_FILE  = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'GameDBInfo',
+                                         'Nintendo Entertainment System.xml'))
+NUM_WORDS = 2
+
+# --- Functions -----------------------------------------------------------------------------------
+def regexp_search(games, search_string_lower):
+    p = re.compile('.*{0}.*'.format(re.escape(search_string_lower)))
+
+    return [key for key in games if p.match(games[key]['name'].lower())]
+
+# --- Main ----------------------------------------------------------------------------------------
+games = fs_load_GameInfo_XML(XML_FILE)
+searches = [' '.join(games[key]['name'].lower().split(' ')[:NUM_WORDS]) for key in games]
+print('Database {0} games, {1} searches'.format(len(games), len(searches)))
+
+t_start = time.time()
+regexp_results = [regexp_search(games, s) for s in searches]
+t_regexp = time.time() - t_start
+print('Regexp scan    {0:10.3f} s'.format(t_regexp))
+
+t_start = time.time()
+index = OfflineTrigramIndex(games)
+t_build = time.time() - t_start
+t_start = time.time()
+index_results = [index.search(s) for s in searches]
+t_index = time.time() - t_start
+print('Trigram index  {0:10.3f} s (index built in {1:.3f} s)'.format(t_index, t_build))
+print('Speedup        {0:10.1f}x'.format(t_regexp / (t_index + t_build)))
+
+for i in range(len(searches)):
+    if sorted(regexp_results[i]) != sorted(index_results[i]):
+        print('ERROR results differ for "{0}"'.format(searches[i]))
@@ -0,0 +1,231 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Benchmark the plugin startup time
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- INSTRUCTIONS --------------------------------------------------------------------------------
+# Creates a fake Kodi profile in a temporary directory with a category, a launcher with ROMs and
+# some Favourites, and then runs the plugin outside Kodi for several commands. Every plugin call
+# runs in a new Python process, like Kodi does, with minimal fake Kodi modules. Settings have the
+# default values in resources/settings.xml.
+#
+# For every command the script prints the median time to import main.py and to run
+# Main.run_plugin(), the number of getSetting() calls, the number of filesystem exists() calls
+# and the modules imported on demand that were loaded.
+#
+# With --importtime the modules imported by every command are printed with their import time,
+# like the Python 3 -X importtime option (times in microseconds, nested imports are indented).
+#
+# Usage: benchmark_startup.py [--importtime] [number of runs]
+# -------------------------------------------------------------------------------------------------
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import sys, os, re, io, time, json, types, shutil, tempfile, subprocess, __builtin__
+
+# --- Configuration -------------------------------------------------------------------------------
+IMPORT_TIME   = '--importtime' in sys.argv
+NUM_RUNS      = int(sys.argv[-1]) if len(sys.argv) > 1 and sys.argv[-1].isdigit() else 10
+NUM_ROMS      = 5000
+ADDON_ID      = 'plugin.program.advanced.emulator.launcher'
+RESOURCES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SETTINGS_FILE = os.path.join(RESOURCES_DIR, 'settings.xml')
+COMMAND_LIST  = [
+    ['Addon root',        ''],
+    ['SHOW_LAUNCHERS',    'com=SHOW_LAUNCHERS&catID=C1'],
+    ['SHOW_ROMS',         'com=SHOW_ROMS&catID=C1&launID=L1'],
+    ['SHOW_FAVOURITES',   'com=SHOW_FAVOURITES'],
+    ['LAUNCH_ROM',        'com=LAUNCH_ROM&catID=C1&launID=L1&romID=R00001'],
+]
+# >> Modules main.py imports only in the commands that need them.
+LAZY_MODULE_LIST = ['scrap', 'scrap_info', 'scrap_pipeline', 'net_IO', 'subprocess_hack']
+
+# --- Functions -----------------------------------------------------------------------------------
+# >> Any attribute of a fake Kodi module or object not defined below is a function that does
+# >> nothing, so the plugin code runs without a Kodi GUI.
+class FakeKodiObject(object):
+    def __init__(self, *args, **kwargs): pass
+    def __call__(self, *args, **kwargs): return FakeKodiObject()
+    def __getattr__(self, name): return FakeKodiObject()
+    def __nonzero__(self): return False
+    def __int__(self): return 0
+
+class FakeKodiModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith('__'): raise AttributeError(name)
+        return FakeKodiObject()
+
+def install_fake_Kodi_modules(profile_dir, stats):
+    # >> settings.xml is not valid XML (labels have < and >), like Kodi parse it line by line.
+    default_settings = {}
+    with io.open(SETTINGS_FILE, 'rt', encoding = 'utf-8-sig') as file:
+        for line in file:
+            id_m = re.search(r'<setting .*\bid="([^"]+)"', line)
+            default_m = re.search(r'\bdefault="([^"]*)"', line)
+            if id_m and default_m: default_settings[id_m.group(1)] = default_m.group(1)
+
+    class FakeAddon(FakeKodiObject):
+        def getAddonInfo(self, key):
+            info = {'id' : ADDON_ID, 'name' : 'Advanced Emulator Launcher', 'version' : '0.0.0',
+                    'author' : 'Benchmark', 'profile' : 'special://profile/addon_data/' + ADDON_ID,
+                    'type' : 'xbmc.python.pluginsource', 'path' : RESOURCES_DIR}
+            return info[key].encode('utf-8')
+
+        def getSetting(self, key):
+            stats['getSetting'] += 1
+            return default_settings[key].encode('utf-8')
+
+    def translatePath(path):
+        path = path.replace('special://profile', os.path.join(profile_dir, 'userdata'))
+        path = path.replace('special://home', os.path.join(profile_dir, 'home'))
+        return path
+
+    xbmc        = FakeKodiModule(b'xbmc')
+    xbmc.log    = lambda *args, **kwargs : None
+    xbmc.translatePath = translatePath
+    xbmc.Monitor = FakeKodiObject
+    xbmc.Player  = FakeKodiObject
+    xbmcaddon   = FakeKodiModule(b'xbmcaddon')
+    xbmcaddon.Addon = FakeAddon
+    xbmcgui     = FakeKodiModule(b'xbmcgui')
+    xbmcgui.ListItem           = FakeKodiObject
+    xbmcgui.Dialog             = FakeKodiObject
+    xbmcgui.DialogProgress     = FakeKodiObject
+    xbmcgui.Window             = FakeKodiObject
+    xbmcgui.WindowXMLDialog    = FakeKodiObject
+    xbmcgui.ControlImage       = FakeKodiObject
+    xbmcgui.ControlButton      = FakeKodiObject
+    xbmcplugin  = FakeKodiModule(b'xbmcplugin')
+    sys.modules['xbmc']       = xbmc
+    sys.modules['xbmcaddon']  = xbmcaddon
+    sys.modules['xbmcgui']    = xbmcgui
+    sys.modules['xbmcplugin'] = xbmcplugin
+    sys.path.insert(0, RESOURCES_DIR)
+
+#
+# Times every module not imported yet. Only the first import of a module takes time, the rest
+# just look into sys.modules. Entries are [level, name, self time, cumulative time] and are
+# added when the import finishes, so nested imports come before the module importing them.
+#
+def install_import_profiler(import_list):
+    builtin_import = __builtin__.__import__
+    stack = []
+    def profiling_import(name, *args, **kwargs):
+        if name in sys.modules: return builtin_import(name, *args, **kwargs)
+        entry = [len(stack), name, 0.0]
+        stack.append(entry)
+        t_start = time.time()
+        try:
+            return builtin_import(name, *args, **kwargs)
+        finally:
+            cumulative = time.time() - t_start
+            stack.pop()
+            if stack: stack[-1][2] += cumulative
+            # >> Relative imports (from . import module) have an empty name.
+            import_list.append([entry[0], name or '.', cumulative - entry[2], cumulative])
+    __builtin__.__import__ = profiling_import
+
+#
+# Counts the exists() calls and imports main.py. Returns the run_plugin() and import times.
+#
+def run_child(profile_dir, query):
+    stats = {'getSetting' : 0, 'exists' : 0, 'imports' : []}
+    install_fake_Kodi_modules(profile_dir, stats)
+    install_import_profiler(stats['imports'])
+    os_path_exists = os.path.exists
+    def counting_exists(path):
+        stats['exists'] += 1
+        return os_path_exists(path)
+    os.path.exists = counting_exists
+
+    t_start = time.time()
+    import main
+    stats['import'] = time.time() - t_start
+    sys.argv = ['plugin://{0}/'.format(ADDON_ID), '1', '?' + query]
+    t_start = time.time()
+    main.Main().run_plugin()
+    stats['run_plugin'] = time.time() - t_start
+    stats['lazy_modules'] = [module for module in LAZY_MODULE_LIST if module in sys.modules]
+    sys.stdout.write(json.dumps(stats) + '\n')
+
+def build_profile(profile_dir):
+    install_fake_Kodi_modules(profile_dir, {'getSetting' : 0})
+    import disk_IO
+
+    plugin_data_dir = disk_IO.FileName(os.path.join(profile_dir, 'userdata', 'addon_data', ADDON_ID))
+    roms_dir = plugin_data_dir.pjoin('db_ROMs')
+    rom_dir = os.path.join(profile_dir, 'roms')
+    roms_dir.makedirs()
+    os.makedirs(rom_dir)
+    category = disk_IO.fs_new_category()
+    category['id'] = 'C1'
+    category['m_name'] = 'Benchmark'
+    launcher = disk_IO.fs_new_launcher()
+    launcher.update({'id' : 'L1', 'm_name' : 'Benchmark', 'categoryID' : 'C1', 'platform' : 'Nintendo SNES',
+                     'application' : '/bin/true', 'args' : '"$rom$"', 'rompath' : rom_dir,
+                     'romext' : 'zip', 'roms_base_noext' : 'benchmark_L1', 'timestamp_launcher' : 1.0})
+    roms = {}
+    for i in range(NUM_ROMS):
+        rom = disk_IO.fs_new_rom()
+        rom['id'] = 'R{0:05d}'.format(i)
+        rom['m_name'] = 'Game {0:05d}'.format(i)
+        rom['filename'] = os.path.join(rom_dir, 'Game {0:05d} (USA).zip'.format(i))
+        roms[rom['id']] = rom
+    open(roms['R00001']['filename'], 'w').close()
+    disk_IO.fs_write_catfile(plugin_data_dir.pjoin('categories.xml'), {'C1' : category}, {'L1' : launcher})
+    disk_IO.fs_write_ROMs_JSON(roms_dir, 'benchmark_L1', roms, launcher)
+    favourites = {}
+    for rom_id in sorted(roms)[0:50]: favourites[rom_id] = disk_IO.fs_get_Favourite_from_ROM(roms[rom_id], launcher)
+    disk_IO.fs_write_Favourites_JSON(plugin_data_dir.pjoin('favourites.json'), favourites)
+
+def median(values): return sorted(values)[len(values) / 2]
+
+def print_import_time(import_list):
+    print('import time: self [us] | cumulative | imported package')
+    for (level, name, t_self, t_cumulative) in import_list:
+        print('import time: {0:>9} | {1:>10} | {2}{3}'.format(
+            int(t_self * 1000000), int(t_cumulative * 1000000), '  ' * level, name))
+
+# --- Main ----------------------------------------------------------------------------------------
+if len(sys.argv) >= 4 and sys.argv[1] == '--child':
+    run_child(sys.argv[2].decode('utf-8'), sys.argv[3].decode('utf-8'))
+    sys.exit(0)
+
+profile_dir = tempfile.mkdtemp(prefix = 'AEL_startup_')
+try:
+    print('Creating fake Kodi profile in {0} ({1} ROMs)...'.format(profile_dir, NUM_ROMS))
+    build_profile(profile_dir)
+    print('{0} runs per command'.format(NUM_RUNS))
+    print('{0:<18} {1:>10} {2:>10} {3:>10} {4:>7} {5:>9} {6}'.format(
+        'Command', 'Import ms', 'Run ms', 'Total ms', 'Exists', 'Settings', 'Lazy modules'))
+    import_lists = []
+    for (name, query) in COMMAND_LIST:
+        runs = []
+        for i in range(NUM_RUNS):
+            output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child',
+                                              profile_dir.encode('utf-8'), query.encode('utf-8')])
+            runs.append(json.loads(output.strip().split(b'\n')[-1]))
+        t_import = median([run['import'] for run in runs]) * 1000
+        t_run    = median([run['run_plugin'] for run in runs]) * 1000
+        t_total  = median([run['import'] + run['run_plugin'] for run in runs]) * 1000
+        print('{0:<18} {1:>10.1f} {2:>10.1f} {3:>10.1f} {4:>7} {5:>9} {6}'.format(
+            name, t_import, t_run, t_total, runs[-1]['exists'], runs[-1]['getSetting'],
+            ', '.join(runs[-1]['lazy_modules']) or '-'))
+        import_lists.append([name, runs[-1]['imports']])
+    if IMPORT_TIME:
+        for (name, import_list) in import_lists:
+            print('\n--- {0} ---'.format(name))
+            print_import_time(import_list)
+finally:
+    shutil.rmtree(profile_dir)
@@ -0,0 +1,54 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Build the offline scraper GameDBInfo indices and benchmark XML vs index loading
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- INSTRUCTIONS --------------------------------------------------------------------------------
+# The offline scraper builds the indices automatically the first time a platform is scraped.
+# This script builds the indices of all the GameDBInfo XML files in advance, for example to
+# copy them into Kodi's addon_data/plugin.program.advanced.emulator.launcher/db_GameDBInfo/
+# directory. The indices must be built with the same Python version Kodi uses.
+#
+# Usage: build_GameDBInfo_index.py [output_dir]
+# -------------------------------------------------------------------------------------------------
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import sys, os, time
+
+# --- Import AEL stuff ---
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from disk_IO import *
+
+# --- Configuration -------------------------------------------------------------------------------
+GAMEDBINFO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'GameDBInfo'))
+OUTPUT_DIR     = sys.argv[1] if len(sys.argv) > 1 else 'db_GameDBInfo'
+
+# --- Main ----------------------------------------------------------------------------------------
+print('{0:<45} {1:>7} {2:>10} {3:>10}'.format('XML file', 'Games', 'XML (s)', 'Index (s)'))
+for xml_name in sorted(os.listdir(GAMEDBINFO_DIR)):
+    if not xml_name.endswith('.xml'): continue
+    xml_file   = os.path.join(GAMEDBINFO_DIR, xml_name)
+    index_file = fs_get_GameInfo_index_path(xml_file, OUTPUT_DIR)
+
+    t_start = time.time()
+    games = fs_build_GameInfo_index(xml_file, index_file)
+    t_xml = time.time() - t_start
+
+    t_start = time.time()
+    games_idx = fs_load_GameInfo_index(xml_file, index_file)
+    t_index = time.time() - t_start
+    if games_idx != games: print('ERROR index of "{0}" differs from XML'.format(xml_name))
+    print('{0:<45} {1:>7} {2:>10.3f} {3:>10.3f}'.format(xml_name, len(games), t_xml, t_index))
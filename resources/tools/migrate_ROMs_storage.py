@@ -0,0 +1,67 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Convert the launcher ROMs databases between storage backends
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- INSTRUCTIONS --------------------------------------------------------------------------------
+# AEL converts a launcher to the storage backend selected in the settings the next time the
+# launcher ROMs are saved. This script converts all the launchers at once. Run it with Kodi
+# closed and change the setting "Launcher ROMs database format" afterwards.
+#
+# Usage: migrate_ROMs_storage.py roms_dir json|sqlite|columns
+#
+# roms_dir is Kodi's addon_data/plugin.program.advanced.emulator.launcher/db_ROMs/ directory.
+# -------------------------------------------------------------------------------------------------
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import sys, os, time
+
+# --- Import AEL stuff ---
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from disk_IO import *
+
+# --- Configuration -------------------------------------------------------------------------------
+BACKEND_DIC = {'json' : ROMS_STORAGE_JSON, 'sqlite' : ROMS_STORAGE_SQLITE, 'columns' : ROMS_STORAGE_COLUMNS}
+if len(sys.argv) != 3 or sys.argv[2] not in BACKEND_DIC:
+    print('Usage: migrate_ROMs_storage.py roms_dir json|sqlite|columns')
+    sys.exit(1)
+ROMS_DIR = FileName(sys.argv[1].decode('utf-8'))
+BACKEND  = BACKEND_DIC[sys.argv[2]]
+
+# --- Main ----------------------------------------------------------------------------------------
+# >> Every launcher with ROMs has an info XML file.
+fs_set_ROMs_storage(BACKEND)
+for xml_name in sorted(os.listdir(ROMS_DIR.getPath())):
+    if not xml_name.endswith('.xml'): continue
+    roms_base_noext = xml_name[:-4]
+    old_backend_list = [b for b in ROMS_STORAGE_LIST if b != BACKEND and
+                        fs_get_ROMs_storage_file_path(ROMS_DIR, roms_base_noext, b).exists()]
+    if not old_backend_list:
+        print('{0:<60} nothing to convert'.format(roms_base_noext))
+        continue
+
+    t_start = time.time()
+    old_backend = old_backend_list[0]
+    roms = fs_load_ROMs_storage(ROMS_DIR, roms_base_noext, old_backend)
+    fs_write_ROMs_storage(ROMS_DIR, roms_base_noext, roms, BACKEND)
+    roms_new = fs_load_ROMs_storage(ROMS_DIR, roms_base_noext, BACKEND)
+    # >> Only delete the old database if the new one has exactly the same ROMs.
+    if roms_new != roms:
+        print('{0:<60} ERROR converted database differs, keeping old file'.format(roms_base_noext))
+        continue
+    for old_backend in old_backend_list:
+        fs_get_ROMs_storage_file_path(ROMS_DIR, roms_base_noext, old_backend).unlink()
+    print('{0:<60} {1:>6} ROMs {2:8.3f} s'.format(roms_base_noext, len(roms), time.time() - t_start))
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Summarise the AEL loading/rendering times found in a Kodi log
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- INSTRUCTIONS --------------------------------------------------------------------------------
+# Set the AEL log level to DEBUG, browse the categories, launchers, Favourites, virtual launchers,
+# etc., you want to time and run this script with the Kodi log. Every AEL renderer logs the
+# "Loading seconds" and "Rendering seconds" lines. For every renderer the script prints the
+# number of times it was called, the average and maximum loading and rendering time and the
+# average number of rows.
+#
+# Usage: report_render_times.py [kodi.log]
+# -------------------------------------------------------------------------------------------------
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+import sys, os, re, io
+
+# --- Configuration -------------------------------------------------------------------------------
+LOG_FILE = sys.argv[1] if len(sys.argv) > 1 else os.path.expanduser('~/.kodi/temp/kodi.log')
+
+# --- Functions -----------------------------------------------------------------------------------
+loading_p   = re.compile(r'AEL DEBUG: (\w+)\(\) Loading seconds +([-0-9.e]+)')
+rendering_p = re.compile(r'AEL DEBUG: (\w+)\(\) Rendering seconds +([-0-9.e]+) \((\d+) rows\)')
+
+def parse_log(log_file):
+    stats = {}
+    with io.open(log_file, 'rt', encoding = 'utf-8', errors = 'replace') as file:
+        for line in file:
+            m = loading_p.search(line)
+            if m:
+                stats.setdefault(m.group(1), {'loading' : [], 'rendering' : [], 'rows' : []})
+                stats[m.group(1)]['loading'].append(float(m.group(2)))
+                continue
+            m = rendering_p.search(line)
+            if m:
+                stats.setdefault(m.group(1), {'loading' : [], 'rendering' : [], 'rows' : []})
+                stats[m.group(1)]['rendering'].append(float(m.group(2)))
+                stats[m.group(1)]['rows'].append(int(m.group(3)))
+
+    return stats
+
+def average(values): return sum(values) / len(values) if values else 0.0
+
+# --- Main ----------------------------------------------------------------------------------------
+stats = parse_log(LOG_FILE)
+if not stats:
+    print('No AEL render times found in {0}. Is the AEL log level set to DEBUG?'.format(LOG_FILE))
+    sys.exit(1)
+print('{0:<38} {1:>5} {2:>9} {3:>9} {4:>9} {5:>9} {6:>8}'.format(
+    'Renderer', 'Calls', 'Load avg', 'Load max', 'Rend avg', 'Rend max', 'Rows'))
+for func_name in sorted(stats):
+    s = stats[func_name]
+    print('{0:<38} {1:>5} {2:>9.3f} {3:>9.3f} {4:>9.3f} {5:>9.3f} {6:>8.0f}'.format(
+        func_name, len(s['rendering']),
+        average(s['loading']), max(s['loading'] or [0.0]),
+        average(s['rendering']), max(s['rendering'] or [0.0]), average(s['rows'])))
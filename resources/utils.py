@@ -20,7 +20,17 @@
 
 # --- Python standard library ---
 from __future__ import unicode_literals
-import sys, os, shutil, time, random, hashlib, urlparse, re, string, fnmatch
+import sys, os, shutil, time, random, hashlib, urlparse, re, string, fnmatch, threading, Queue
+
+# >> scandir() is in the standard library since Python 3.5. Use the backport if installed.
+# >> If not available fall back to os.listdir() + os.path.isdir().
+try:
+    from os import scandir as _scandir
+except ImportError:
+    try:
+        from scandir import scandir as _scandir
+    except ImportError:
+        _scandir = None
 
 # --- Kodi modules ---
 # >> FileName class uses xbmc.translatePath()
@@ -153,160 +163,34 @@ def text_dump_str_to_file(filename, full_string):
     file_obj.close()
 
 # -------------------------------------------------------------------------------------------------
-# ROM name cleaning and formatting
+# ROM scanner index
 # -------------------------------------------------------------------------------------------------
 #
-# This function is used to clean the ROM name to be used as search string for the scraper.
+# Hash index of the launcher ROMs used by the ROM scanner. Checking if a file is already in the
+# ROMs dictionary or if a multidisc set already exists was done traversing the whole ROMs
+# dictionary for every scanned file, which is O(files x ROMs) and takes ages with big
+# collections. The index is built once per scan and updated when ROMs are added.
 #
-# 1) Cleans ROM tags: [BIOS], (Europe), (Rev A), ...
-# 2) Substitutes some characters by spaces
+# filename_idx -> dictionary { rom['filename'] : romID }
 #
-def text_format_ROM_name_for_scraping(title):
-    title = re.sub('\[.*?\]', '', title)
-    title = re.sub('\(.*?\)', '', title)
-    title = re.sub('\{.*?\}', '', title)
-    
-    title = title.replace('_', '')
-    title = title.replace('-', '')
-    title = title.replace(':', '')
-    title = title.replace('.', '')
-    title = title.strip()
+# The filename of a multidisc set ROM is the set name in the directory of the disks, so sets
+# are also found in filename_idx.
+#
+class ROMScannerIndex:
+    def __init__(self, roms):
+        self.filename_idx = {}
+        for rom_id, rom in roms.iteritems(): self.add_ROM(rom_id, rom)
 
-    return title
+    def add_ROM(self, rom_id, rom):
+        self.filename_idx[rom['filename']] = rom_id
 
-#
-# Format ROM file name when scraping is disabled.
-# 1) Remove No-Intro/TOSEC tags (), [], {} at the end of the file
-#
-# title      -> Unicode string
-# clean_tags -> bool
-#
-# Returns a Unicode string.
-#
-def text_format_ROM_title(title, clean_tags):
-    #
-    # Regexp to decompose a string in tokens
-    #
-    if clean_tags:
-        reg_exp = '\[.+?\]\s?|\(.+?\)\s?|\{.+?\}|[^\[\(\{]+'
-        tokens = re.findall(reg_exp, title)
-        str_list = []
-        for token in tokens:
-            stripped_token = token.strip()
-            if (stripped_token[0] == '[' or stripped_token[0] == '(' or stripped_token[0] == '{') and \
-               stripped_token != '[BIOS]':
-                continue
-            str_list.append(stripped_token)
-        cleaned_title = ' '.join(str_list)
-    else:
-        cleaned_title = title
-
-    # if format_title:
-    #     if (title.startswith("The ")): new_title = title.replace("The ","", 1)+", The"
-    #     if (title.startswith("A ")): new_title = title.replace("A ","", 1)+", A"
-    #     if (title.startswith("An ")): new_title = title.replace("An ","", 1)+", An"
-    # else:
-    #     if (title.endswith(", The")): new_title = "The "+"".join(title.rsplit(", The", 1))
-    #     if (title.endswith(", A")): new_title = "A "+"".join(title.rsplit(", A", 1))
-    #     if (title.endswith(", An")): new_title = "An "+"".join(title.rsplit(", An", 1))
-
-    return cleaned_title
+    def has_filename(self, filename):
+        return filename in self.filename_idx
 
-# -------------------------------------------------------------------------------------------------
-# Multidisc ROM support
-# -------------------------------------------------------------------------------------------------
-def text_get_ROM_basename_tokens(basename_str):
-    DEBUG_TOKEN_PARSER = False
-
-    # --- Parse ROM base_noext/basename_str into tokens ---
-    reg_exp = '\[.+?\]|\(.+?\)|\{.+?\}|[^\[\(\{]+'
-    tokens_raw = re.findall(reg_exp, basename_str)
-    if DEBUG_TOKEN_PARSER:
-        log_debug('text_get_ROM_basename_tokens() tokens_raw   {0}'.format(tokens_raw))
-
-    # >> Strip tokens
-    tokens_strip = list()
-    for token in tokens_raw: tokens_strip.append(token.strip())
-    if DEBUG_TOKEN_PARSER:
-        log_debug('text_get_ROM_basename_tokens() tokens_strip {0}'.format(tokens_strip))
-
-    # >> Remove empty tokens ''
-    tokens_clean = list()
-    for token in tokens_strip: 
-        if token: tokens_clean.append(token)
-    if DEBUG_TOKEN_PARSER:        
-        log_debug('text_get_ROM_basename_tokens() tokens_clean {0}'.format(tokens_clean))
-
-    # >> Remove '-' tokens from Trurip multidisc names
-    tokens = list()
-    for token in tokens_clean:
-        if token == '-': continue
-        tokens.append(token)
-    if DEBUG_TOKEN_PARSER:
-        log_debug('text_get_ROM_basename_tokens() tokens       {0}'.format(tokens))
-
-    return tokens
-
-class MultiDiscInfo:
-    def __init__(self, ROM_FN):
-        self.ROM_FN      = ROM_FN
-        self.isMultiDisc = False
-        self.setName     = ''
-        self.discName    = ROM_FN.getBase()
-        self.extension   = ROM_FN.getExt()
-        self.order       = 0
-
-def text_get_multidisc_info(ROM_FN):
-    MDSet = MultiDiscInfo(ROM_FN)
-    
-    # --- Parse ROM base_noext into tokens ---
-    tokens = text_get_ROM_basename_tokens(ROM_FN.getBase_noext())
-
-    # --- Check if ROM belongs to a multidisc set and get set name and order ---
-    # Algortihm:
-    # 1) Iterate list of tokens
-    # 2) If a token marks a multidisk ROM extract set order
-    # 3) Define the set basename by removing the multidisk token
-    MultDiscFound = False
-    for index, token in enumerate(tokens):
-        # --- Redump ---
-        matchObj = re.match(r'\(Disc ([0-9]+)\)', token)
-        if matchObj:
-            log_debug('text_get_multidisc_info() ### Matched Redump multidisc ROM ###')
-            tokens_idx = range(0, len(tokens))
-            tokens_idx.remove(index)
-            tokens_nodisc_idx = list(tokens_idx)
-            tokens_mdisc = [tokens[x] for x in tokens_nodisc_idx]
-            MultDiscFound = True
-            break
-
-        # --- TOSEC/Trurip ---
-        matchObj = re.match(r'\(Disc ([0-9]+) of ([0-9]+)\)', token)
-        if matchObj:
-            log_debug('text_get_multidisc_info() ### Matched TOSEC/Trurip multidisc ROM ###')
-            tokens_idx = range(0, len(tokens))
-            tokens_idx.remove(index)
-            tokens_nodisc_idx = list(tokens_idx)
-            # log_debug('text_get_multidisc_info() tokens_idx         = {0}'.format(tokens_idx))
-            # log_debug('text_get_multidisc_info() index              = {0}'.format(index))
-            # log_debug('text_get_multidisc_info() tokens_nodisc_idx  = {0}'.format(tokens_nodisc_idx))
-            tokens_mdisc = [tokens[x] for x in tokens_nodisc_idx]
-            MultDiscFound = True
-            break
-
-    if MultDiscFound:
-        MDSet.isMultiDisc = True
-        MDSet.setName = ' '.join(tokens_mdisc) + MDSet.extension
-        MDSet.order = int(matchObj.group(1))
-        log_debug('text_get_multidisc_info() base_noext   "{0}"'.format(ROM_FN.getBase_noext()))
-        log_debug('text_get_multidisc_info() tokens       {0}'.format(tokens))
-        log_debug('text_get_multidisc_info() tokens_mdisc {0}'.format(tokens_mdisc))
-        log_debug('text_get_multidisc_info() setName      "{0}"'.format(MDSet.setName))
-        log_debug('text_get_multidisc_info() discName     "{0}"'.format(MDSet.discName))
-        log_debug('text_get_multidisc_info() extension    "{0}"'.format(MDSet.extension))
-        log_debug('text_get_multidisc_info() order        {0}'.format(MDSet.order))
-
-    return MDSet
+    # Returns the romID of the multidisc set or None if the set is not in the ROMs.
+    # set_filename is the set name joined with the directory of the disk being scanned.
+    def get_multidisc_romID(self, set_filename):
+        return self.filename_idx.get(set_filename, None)
 
 # -------------------------------------------------------------------------------------------------
 # URLs
@@ -352,6 +236,89 @@ def misc_look_for_file(rootPath, filename_noext, file_exts):
 
     return None
 
+#
+# Lists a directory and yields (entry_name, entry_path, is_dir) tuples. scandir() knows if an entry
+# is a directory without calling stat() for every entry in most platforms.
+# Symbolic links to directories are skipped, like os.walk() does.
+# If the directory cannot be listed nothing is yielded.
+#
+def misc_iter_dir(dir_path):
+    try:
+        if _scandir:
+            for entry in _scandir(dir_path):
+                entry_is_dir = entry.is_dir()
+                if entry_is_dir and entry.is_symlink(): continue
+                yield (entry.name, entry.path, entry_is_dir)
+        else:
+            for entry_name in os.listdir(dir_path):
+                entry_path = os.path.join(dir_path, entry_name)
+                entry_is_dir = os.path.isdir(entry_path)
+                if entry_is_dir and os.path.islink(entry_path): continue
+                yield (entry_name, entry_path, entry_is_dir)
+    except OSError:
+        log_warning('misc_iter_dir() Cannot list "{0}"'.format(dir_path))
+
+#
+# Checks which files in file_path_list exist. Files are grouped by directory and every directory is
+# checked by one of num_workers threads, so the latency of network shares is paid in parallel.
+# Directories with many files to check are listed once instead of calling os.path.exists() for
+# every file. If a directory cannot be listed its files are checked one by one. If progress_cb is
+# not None it is called as progress_cb(num_dirs_done, num_dirs) from the calling thread while
+# waiting for the workers.
+#
+# file_path_list -> list of Unicode paths (use FileName.getPath())
+# Returns the set of paths in file_path_list that exist.
+#
+MISC_LIST_DIR_MIN_FILES = 4
+
+def misc_check_files_exist(file_path_list, num_workers = 8, progress_cb = None):
+    # --- Group files by directory ---
+    dir_files = {}
+    for file_path in file_path_list:
+        dir_files.setdefault(os.path.dirname(file_path), []).append(file_path)
+    dir_queue = Queue.Queue()
+    for dir_path in dir_files: dir_queue.put(dir_path)
+
+    existing_files = set()
+    num_dirs_done = [0]
+    lock = threading.Lock()
+    def worker():
+        while True:
+            try:
+                dir_path = dir_queue.get_nowait()
+            except Queue.Empty:
+                return
+            file_list = dir_files[dir_path]
+            dir_names = None
+            if len(file_list) >= MISC_LIST_DIR_MIN_FILES:
+                # >> Directory may be unreadable or a network share temporarily unavailable.
+                try:
+                    dir_names = set(os.path.normcase(name) for name in os.listdir(dir_path))
+                except OSError:
+                    log_warning('misc_check_files_exist() Cannot list "{0}"'.format(dir_path))
+            if dir_names is not None:
+                found_files = [f for f in file_list if os.path.normcase(os.path.basename(f)) in dir_names]
+            else:
+                found_files = [f for f in file_list if os.path.exists(f)]
+            with lock:
+                existing_files.update(found_files)
+                num_dirs_done[0] += 1
+
+    workers = []
+    for i in range(min(num_workers, len(dir_files))):
+        worker_thread = threading.Thread(target = worker)
+        worker_thread.daemon = True
+        worker_thread.start()
+        workers.append(worker_thread)
+    for worker_thread in workers:
+        while worker_thread.is_alive():
+            worker_thread.join(0.25)
+            if progress_cb: progress_cb(num_dirs_done[0], len(dir_files))
+    log_debug('misc_check_files_exist() {0} files in {1} dirs, {2} exist'.format(
+        len(file_path_list), len(dir_files), len(existing_files)))
+
+    return existing_files
+
 #
 # Generates a random an unique MD5 hash and returns a string with the hash
 #
@@ -500,6 +467,27 @@ class FileName:
 
         return files
 
+    #
+    # Generator version of scanFilesInPath()/recursiveScanFilesInPath(). Yields FileName objects
+    # as they are found so callers can process files before the whole tree has been walked.
+    # Only the pending directories are kept in memory. Files in a directory are yielded in
+    # alphabetical order.
+    #
+    # ext_set   -> set of extensions with dot, set(['.zip', '.7z']). None yields all files.
+    # recursive -> bool
+    #
+    def iterScanFilesInPath(self, ext_set = None, recursive = True):
+        dir_stack = [self.path]
+        while dir_stack:
+            dir_path = dir_stack.pop()
+            subdirs = []
+            for (entry_name, entry_path, entry_is_dir) in sorted(misc_iter_dir(dir_path)):
+                if entry_is_dir:
+                    if recursive: subdirs.append(entry_path)
+                elif ext_set is None or os.path.splitext(entry_name)[1] in ext_set:
+                    yield FileName(entry_path)
+            dir_stack.extend(reversed(subdirs))
+
     # ---------------------------------------------------------------------------------------------
     # Filesystem functions
     # ---------------------------------------------------------------------------------------------
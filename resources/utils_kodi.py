@@ -50,10 +50,23 @@ def set_log_level(level):
 
     current_log_level = level
 
+#
+# Use log_is_debug_enabled()/log_is_verb_enabled() to skip building expensive log messages in
+# hot loops.
+#
+def log_is_debug_enabled(): return current_log_level >= LOG_DEBUG
+
+def log_is_verb_enabled(): return current_log_level >= LOG_VERB
+
 # For Unicode stuff in Kodi log see http://forum.kodi.tv/showthread.php?tid=144677
 #
-def log_debug(str_text):
+# If args are given str_text is a format string and it is only formatted if the message is
+# logged, for example log_debug('Set {0} file "{1}"', asset_name, file_path). This saves the
+# format() calls of the messages that are not logged.
+#
+def log_debug(str_text, *args):
     if current_log_level >= LOG_DEBUG:
+        if args: str_text = str_text.format(*args)
         # if it is str we assume it's "utf-8" encoded.
         # will fail if called with other encodings (latin, etc).
         if isinstance(str_text, str): str_text = str_text.decode('utf-8')
@@ -62,26 +75,30 @@ def log_debug(str_text):
         log_text = u'AEL DEBUG: ' + str_text
         xbmc.log(log_text.encode('utf-8'), level=xbmc.LOGERROR)
 
-def log_verb(str_text):
+def log_verb(str_text, *args):
     if current_log_level >= LOG_VERB:
+        if args: str_text = str_text.format(*args)
         if isinstance(str_text, str): str_text = str_text.decode('utf-8')
         log_text = u'AEL VERB : ' + str_text
         xbmc.log(log_text.encode('utf-8'), level=xbmc.LOGERROR)
 
-def log_info(str_text):
+def log_info(str_text, *args):
     if current_log_level >= LOG_INFO:
+        if args: str_text = str_text.format(*args)
         if isinstance(str_text, str): str_text = str_text.decode('utf-8')
         log_text = u'AEL INFO : ' + str_text
         xbmc.log(log_text.encode('utf-8'), level=xbmc.LOGERROR)
 
-def log_warning(str_text):
+def log_warning(str_text, *args):
     if current_log_level >= LOG_WARNING:
+        if args: str_text = str_text.format(*args)
         if isinstance(str_text, str): str_text = str_text.decode('utf-8')
         log_text = u'AEL WARN : ' + str_text
         xbmc.log(log_text.encode('utf-8'), level=xbmc.LOGERROR)
 
-def log_error(str_text):
+def log_error(str_text, *args):
     if current_log_level >= LOG_ERROR:
+        if args: str_text = str_text.format(*args)
         if isinstance(str_text, str): str_text = str_text.decode('utf-8')
         log_text = u'AEL ERROR: ' + str_text
         xbmc.log(log_text.encode('utf-8'), level=xbmc.LOGERROR)
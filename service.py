@@ -0,0 +1,30 @@
+﻿# -*- coding: utf-8 -*-
+#
+# Advanced Emulator Launcher service script file
+#
+
+# Copyright (c) 2016-2017 Wintermute0110 <wintermute0110@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# --- Python standard library ---
+from __future__ import unicode_literals
+
+# --- Modules/packages in this plugin ---
+import resources.service
+
+# -------------------------------------------------------------------------------------------------
+# main()
+# -------------------------------------------------------------------------------------------------
+# Kodi runs this script when the user logs in. The service does nothing unless it is enabled
+# in the addon settings. See resources/service.py.
+#
+service = resources.service.AELService()
+service.run()